@@ -4,6 +4,11 @@ from ..models.account import Account
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
-    list_display = ('get_full_number', 'name', 'account_type', 'is_active')
+    list_display = ('full_number', 'name', 'account_type', 'is_active')
     list_filter = ('account_type', 'is_active', 'account_group__account_class')
-    search_fields = ('name', 'number')
\ No newline at end of file
+    # Le type de compte est affiché dans la liste : le charger avec les comptes (explicite,
+    # pour ne pas dépendre de la détection automatique de l'admin)
+    list_select_related = ('account_type',)
+    # '^' : recherche par préfixe sur l'index du numéro complet (ex: "401")
+    search_fields = ('^full_number', 'name')
+    ordering = ('full_number',)
\ No newline at end of file
@@ -3,11 +3,13 @@ from django import forms
 from django.http import JsonResponse
 from django.urls import path
 from accounts.models.account_class import AccountClass
+from accounts.rules import CLASS_RULES, class_rule
+from accounts.services.reference_services import get_class_reference
 
 class AccountClassForm(forms.ModelForm):
     # Remplacer le champ number par un ChoiceField
     number = forms.ChoiceField(
-        choices=[(i, str(i)) for i in range(1, 9)],  # Crée des choix de 1 à 8
+        choices=[(rule.number, str(rule.number)) for rule in CLASS_RULES if rule],  # Classes 1 à 8
         label="Numéro",
         help_text="Entrez un chiffre entre 1 et 8 conformément au plan comptable OHADA.",
     )
@@ -19,7 +21,7 @@ class AccountClassForm(forms.ModelForm):
     def clean_number(self):
         # Convertir la chaîne en entier
         number = int(self.cleaned_data.get('number', 0))
-        if number < 1 or number > 8:
+        if class_rule(number) is None:
             raise forms.ValidationError("Le numéro de classe doit être compris entre 1 et 8.")
         return number
     
@@ -27,36 +29,8 @@ class AccountClassForm(forms.ModelForm):
         # Récupérer l'instance mais ne pas encore sauvegarder
         instance = super().save(commit=False)
         
-        # Définir automatiquement la position dans le bilan en fonction du numéro selon le plan comptable OHADA
-        number = instance.number
-        
-        # 1 : Passif (Comptes de ressources durables)
-        if number == 1:
-            instance.position_bilan = "Passif"
-        
-        # 2 et 3 : Actif (Comptes d'actif immobilisé et Comptes de stocks)
-        elif number == 2 or number == 3:
-            instance.position_bilan = "Actif"
-        
-        # 4 : Peut être Actif ou Passif, mais Passif par défaut (Comptes de tiers)
-        elif number == 4:
-            instance.position_bilan = "Passif"
-        
-        # 5 : Peut être Actif ou Passif, mais Actif par défaut (Comptes de trésorerie)
-        elif number == 5:
-            instance.position_bilan = "Actif"
-        
-        # 6 : Charges (Comptes de charges des activités ordinaires)
-        elif number == 6:
-            instance.position_bilan = "Charges"
-        
-        # 7 : Produits (Comptes de produits des activités ordinaires)
-        elif number == 7:
-            instance.position_bilan = "Produits"
-        
-        # 8 : Peut être Charges ou Produits, mais Charges par défaut (Autres charges et produits)
-        elif number == 8:
-            instance.position_bilan = "Charges"
+        # Position dans le bilan selon le plan comptable OHADA
+        instance.position_bilan = class_rule(instance.number).position
         
         # Définir actif à True par défaut
         instance.actif = True
@@ -91,49 +65,11 @@ class AccountClassAdmin(admin.ModelAdmin):
     
     def get_class_info(self, request, number):
         """Renvoie les informations de classe basées sur le numéro selon le plan comptable OHADA"""
-        try:
-            number = int(number)
-            if 1 <= number <= 8:
-                # Position dans le bilan selon le numéro
-                position = ""
-                
-                # 1 : Passif (Comptes de ressources durables)
-                if number == 1:
-                    position = "Passif"
-                
-                # 2 et 3 : Actif (Comptes d'actif immobilisé et Comptes de stocks)
-                elif number == 2 or number == 3:
-                    position = "Actif"
-                
-                # 4 : Peut être Actif ou Passif, mais Passif par défaut (Comptes de tiers)
-                elif number == 4:
-                    position = "Passif"
-                
-                # 5 : Peut être Actif ou Passif, mais Actif par défaut (Comptes de trésorerie)
-                elif number == 5:
-                    position = "Actif"
-                
-                # 6 : Charges (Comptes de charges des activités ordinaires)
-                elif number == 6:
-                    position = "Charges"
-                
-                # 7 : Produits (Comptes de produits des activités ordinaires)
-                elif number == 7:
-                    position = "Produits"
-                
-                # 8 : Peut être Charges ou Produits, mais Charges par défaut (Autres charges et produits)
-                elif number == 8:
-                    position = "Charges"
-                    
-                return JsonResponse({
-                    'name': AccountClass.NOMS_CLASSES.get(number, ""),
-                    'description': AccountClass.DESCRIPTIONS_CLASSES.get(number, ""),
-                    'position': position
-                })
-        except (ValueError, TypeError):
-            pass
-            
-        return JsonResponse({'error': 'Numéro de classe invalide'}, status=400)
+        # Lecture dans le référentiel précompilé : ni calcul ni requête
+        reference = get_class_reference(number)
+        if reference is None:
+            return JsonResponse({'error': 'Numéro de classe invalide'}, status=400)
+        return JsonResponse(reference)
     
     def get_fieldsets(self, request, obj=None):
         fieldsets = [
@@ -209,10 +145,10 @@ class AccountClassAdmin(admin.ModelAdmin):
                     const number = document.getElementById('id_number').value;
                     if (!number) return;
                     
-                    // Appeler l'API pour obtenir les informations
-                    fetch(`/admin/accounts/accountclass/get_class_info/${number}/`)
-                        .then(response => response.json())
+                    // Lire les informations dans le référentiel OHADA chargé une fois par session
+                    OhadaReference.getClass(number)
                         .then(data => {
+                            if (!data) return;
                             // Mettre à jour les champs de prévisualisation
                             document.getElementById('preview_name').textContent = data.name;
                             document.getElementById('preview_description').textContent = data.description;
@@ -5,6 +5,8 @@ from django.urls import path
 from django.utils.html import format_html
 from accounts.models.account_group import AccountGroup
 from accounts.models.account_class import AccountClass
+from accounts.rules import group_choices_for_class
+from accounts.services.reference_services import get_group_options, get_group_reference
 
 class AccountGroupForm(forms.ModelForm):
     # Ne pas définir le champ number ici du tout
@@ -28,34 +30,23 @@ class AccountGroupForm(forms.ModelForm):
             widget=forms.Select(attrs={'class': 'select-number'})
         )
         
-        # Déterminer la classe sélectionnée
-        selected_class = None
+        # Déterminer la classe sélectionnée (la clé primaire d'une classe est son numéro)
+        class_number = None
         
         # Cas POST : filtrer selon classe soumise
         if 'account_class' in self.data:
             try:
-                class_id = int(self.data.get('account_class'))
-                selected_class = AccountClass.objects.get(pk=class_id)
-            except (ValueError, TypeError, AccountClass.DoesNotExist):
+                class_number = int(self.data.get('account_class'))
+            except (ValueError, TypeError):
                 pass
         
         # Cas édition (instance)
-        elif self.instance.pk and self.instance.account_class:
-            selected_class = self.instance.account_class
+        elif self.instance.pk and self.instance.account_class_id:
+            class_number = self.instance.account_class_id
         
-        # Si nous avons une classe, limiter les options du numéro
-        if selected_class:
-            class_number = selected_class.number
-            choices = [('', '---------')]
-            
-            # Générer uniquement les options pour cette classe
-            for i in range(0, 10):
-                number = class_number * 10 + i
-                if number in AccountGroup.NOMS_GROUPES:
-                    choices.append((str(number), f"{number} - {AccountGroup.NOMS_GROUPES[number]}"))
-            
-            # Mettre à jour les choix du champ numéro
-            self.fields['number'].choices = choices
+        # Limiter les options du numéro aux groupes OHADA de la classe (choix précompilés)
+        if class_number is not None:
+            self.fields['number'].choices = [('', '---------'), *group_choices_for_class(class_number)]
     
     def clean(self):
         cleaned_data = super().clean()
@@ -83,6 +74,8 @@ class AccountGroupAdmin(admin.ModelAdmin):
     
     list_display = ('number', 'get_original_name', 'get_class_name', 'actif', 'date_creation')
     list_filter = ('account_class', 'actif')
+    # La classe est affichée dans la liste : la charger avec les groupes
+    list_select_related = ('account_class',)
     search_fields = ('name', 'number')
     readonly_fields = ('name', 'description', 'date_creation')
     
@@ -106,36 +99,18 @@ class AccountGroupAdmin(admin.ModelAdmin):
 
     def get_group_options(self, request, class_id):
         """Renvoie les options de groupe disponibles pour une classe donnée"""
-        try:
-            account_class = AccountClass.objects.get(pk=class_id)
-            class_number = account_class.number
-            
-            options = []
-            for i in range(0, 10):
-                number = class_number * 10 + i
-                if number in AccountGroup.NOMS_GROUPES:
-                    options.append({
-                        'value': str(number),
-                        'label': f"{number} - {AccountGroup.NOMS_GROUPES[number]}"
-                    })
-            
-            return JsonResponse({'options': options})
-        except (ValueError, TypeError, AccountClass.DoesNotExist):
+        # La clé primaire d'une classe est son numéro : aucune requête n'est nécessaire
+        options = get_group_options(class_id)
+        if not options:
             return JsonResponse({'error': 'Classe invalide'}, status=400)
+        return JsonResponse({'options': options})
     
     def get_group_info(self, request, number):
         """Renvoie les informations d'un groupe de comptes basé sur son numéro"""
-        try:
-            number = int(number)
-            if 10 <= number <= 89:
-                return JsonResponse({
-                    'name': AccountGroup.NOMS_GROUPES.get(number, ""),
-                    'description': AccountGroup.DESCRIPTIONS_GROUPES.get(number, "")
-                })
-        except (ValueError, TypeError):
-            pass
-            
-        return JsonResponse({'error': 'Numéro de groupe invalide'}, status=400)
+        reference = get_group_reference(number)
+        if reference is None:
+            return JsonResponse({'error': 'Numéro de groupe invalide'}, status=400)
+        return JsonResponse({'name': reference['name'], 'description': reference['description']})
     
     def get_fieldsets(self, request, obj=None):
         fieldsets = [
@@ -1,5 +1,6 @@
 from django import forms
 from accounts.models.account import Account
+from accounts.services.chart_services import account_type_choices, get_chart_tree, group_choices
 
 class AccountForm(forms.ModelForm):
     class Meta:
@@ -13,6 +14,13 @@ class AccountForm(forms.ModelForm):
             'name': forms.TextInput(attrs={'class': 'form-control'}),
         }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Les listes de choix sont construites depuis le cache du plan comptable
+        tree = get_chart_tree()
+        self.fields['account_group'].choices = [('', '---------')] + group_choices(tree)
+        self.fields['account_type'].choices = [('', '---------')] + account_type_choices(tree)
+    
     def clean(self):
         cleaned_data = super().clean()
         account_group = cleaned_data.get('account_group')
@@ -25,5 +33,11 @@ class AccountForm(forms.ModelForm):
                 raise forms.ValidationError(
                     "Le numéro de compte complet ne peut pas dépasser 8 chiffres."
                 )
+            # L'unicité (société, groupe, numéro) n'est pas vérifiée par le formulaire : la société n'en fait pas partie
+            duplicates = Account.objects.filter(
+                company_id=self.instance.company_id, account_group=account_group, number=number
+            ).exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise forms.ValidationError(f"Le compte {full_number} existe déjà.")
         
         return cleaned_data
@@ -0,0 +1,52 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from accounts.services.chart_import_services import import_chart, read_chart_file
+from core.models import Company
+
+class Command(BaseCommand):
+    help = 'Importe (ou met à jour) des comptes du plan comptable depuis un fichier CSV ou JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Fichier CSV (en-tête : full_number, name, account_type[, description, is_active]) ou JSON",
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Valide le fichier sans rien enregistrer",
+        )
+        parser.add_argument(
+            '--company',
+            help="Identifiant (slug) de la société (défaut : société par défaut)",
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(slug=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Société inconnue : {options['company']}")
+
+        started = time.perf_counter()
+        try:
+            report = import_chart(
+                read_chart_file(options['path']), dry_run=options['dry_run'], company=company
+            )
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Lecture du fichier impossible : {exc}")
+
+        for error in report.errors:
+            self.stderr.write(str(error))
+
+        elapsed = time.perf_counter() - started
+        if options['dry_run']:
+            self.stdout.write(f"Validation terminée : {len(report.errors)} erreur(s).")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{report.created} compte(s) créé(s), {report.updated} mis à jour, "
+                f"{len(report.errors)} ligne(s) rejetée(s) en {elapsed:.1f} s."
+            ))
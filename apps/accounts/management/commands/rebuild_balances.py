@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from accounts.models.account import Account
+from transactions.services.balance_services import rebuild_balances
+
+class Command(BaseCommand):
+    help = 'Recalcule les soldes matérialisés par compte et par période à partir des écritures'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help="Nombre de comptes recalculés par transaction (défaut : 500)",
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        account_ids = list(Account.objects.order_by('pk').values_list('pk', flat=True))
+        balances_created = 0
+        
+        # Chaque lot de comptes est recalculé dans sa propre transaction
+        for start in range(0, len(account_ids), chunk_size):
+            chunk = account_ids[start:start + chunk_size]
+            balances_created += rebuild_balances(chunk)
+            self.stdout.write(f"{min(start + chunk_size, len(account_ids))}/{len(account_ids)} comptes traités")
+        
+        self.stdout.write(self.style.SUCCESS(f"{balances_created} soldes recalculés."))
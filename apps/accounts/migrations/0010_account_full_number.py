@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2025-05-02 09:14
+
+from django.db import migrations, models
+
+
+def backfill_full_number(apps, schema_editor):
+    Account = apps.get_model('accounts', 'Account')
+    accounts = list(Account.objects.select_related('account_group'))
+    for account in accounts:
+        account.full_number = f"{account.account_group.number}{account.number}"
+    Account.objects.bulk_update(accounts, ['full_number'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_alter_accounttype_description'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='account',
+            options={'ordering': ['full_number'], 'verbose_name': 'Compte', 'verbose_name_plural': 'Comptes'},
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='full_number',
+            field=models.CharField(editable=False, max_length=8, null=True),
+        ),
+        migrations.RunPython(backfill_full_number, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='account',
+            name='full_number',
+            field=models.CharField(editable=False, help_text='Numéro complet du compte (groupe + numéro), maintenu automatiquement.', max_length=8, unique=True, verbose_name='Numéro complet'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2025-05-20 10:02
+
+from django.db import migrations, models
+
+from core.utils import normalize_search
+
+
+def backfill_search_name(apps, schema_editor):
+    Account = apps.get_model('accounts', 'Account')
+    accounts = list(Account.objects.only('pk', 'name'))
+    for account in accounts:
+        account.search_name = normalize_search(account.name)
+    Account.objects.bulk_update(accounts, ['search_name'], batch_size=1000)
+
+
+def create_trigram_index(apps, schema_editor):
+    # Recherche « contient » indexée sous PostgreSQL (pg_trgm) ; sans équivalent sous SQLite
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS accounts_account_search_name_trgm "
+        "ON accounts_account USING gin (search_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS accounts_account_search_name_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_account_full_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Nom sans accents ni majuscules, maintenu automatiquement pour la recherche.', max_length=150, verbose_name='Nom de recherche'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:00
+
+import core.tenancy
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0011_account_search_name'),
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='account',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='account',
+            name='company',
+            field=models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société'),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='full_number',
+            field=models.CharField(editable=False, help_text='Numéro complet du compte (groupe + numéro), maintenu automatiquement.', max_length=8, verbose_name='Numéro complet'),
+        ),
+        migrations.AlterField(
+            model_name='account',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, help_text='Nom sans accents ni majuscules, maintenu automatiquement pour la recherche.', max_length=150, verbose_name='Nom de recherche'),
+        ),
+        migrations.AddIndex(
+            model_name='account',
+            index=models.Index(fields=['company', 'search_name'], name='account_company_search_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(fields=('company', 'full_number'), name='account_company_full_number_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(fields=('company', 'account_group', 'number'), name='account_company_number_uniq'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:10
+
+import django.db.models.manager
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_account_company'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='account',
+            options={'base_manager_name': 'all_companies', 'ordering': ['full_number'], 'verbose_name': 'Compte', 'verbose_name_plural': 'Comptes'},
+        ),
+        migrations.AlterModelManagers(
+            name='account',
+            managers=[
+                ('objects', django.db.models.manager.Manager()),
+                ('all_companies', django.db.models.manager.Manager()),
+            ],
+        ),
+    ]
@@ -1,24 +1,174 @@
 from django.db import models
-from .account_group import AccountGroup
+from django.db.models import F, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+from core.models import TenantManager, TenantModel
+from core.utils import normalize_search, prefix_upper_bound
+from .account_group import AccountGroup, invalidate_chart_tree
 from .account_type import AccountType
 
-class Account(models.Model):
+
+def build_full_number(group_number, number):
+    """Construit le numéro complet d'un compte (ex: 40 + "1100" -> "401100")"""
+    full_number = f"{group_number}{number}"
+    if len(full_number) > 8:
+        raise ValueError("Le numéro de compte ne peut pas dépasser 8 chiffres au total")
+    return full_number
+
+
+def ancestor_numbers(full_number):
+    """
+    Numéros complets des niveaux supérieurs, du groupe au parent direct
+    (ex: "401100" -> ["40", "401", "4011", "40110"]).
+    """
+    return [full_number[:length] for length in range(2, len(full_number))]
+
+
+class AccountQuerySet(models.QuerySet):
+    """
+    QuerySet des comptes qui maintient le numéro complet dénormalisé (full_number)
+    et le nom de recherche lors des créations et mises à jour en masse, et
+    invalide le cache du plan comptable lorsqu'elles modifient des lignes.
+
+    Le numéro complet sert de chemin matérialisé dans l'arbre classe -> groupe
+    -> comptes et sous-comptes : les comptes sous un nœud sont ceux dont le
+    numéro commence par le sien, lus en un seul intervalle indexé.
+    """
+
+    def with_prefix(self, prefix):
+        """Comptes dont le numéro complet commence par le préfixe (ex: "401")"""
+        if not prefix.isdigit():
+            return self.filter(full_number__startswith=prefix)
+        # Un intervalle (et non LIKE 'x%') est servi par l'index sur toutes les bases
+        upper_bound = prefix_upper_bound(prefix)
+        queryset = self.filter(full_number__gte=prefix)
+        return queryset if upper_bound is None else queryset.filter(full_number__lt=upper_bound)
+
+    def subtree(self, node):
+        """Comptes sous un nœud du plan : classe, groupe, compte (compris) ou préfixe de numéro"""
+        return self.with_prefix(node if isinstance(node, str) else node.get_full_number())
+
+    def ancestors_of(self, account):
+        """Comptes dont le numéro complet est un préfixe de celui du compte, du plus général au plus précis"""
+        return self.filter(full_number__in=ancestor_numbers(account.get_full_number())).order_by('full_number')
+
+    def sync_full_numbers(self):
+        """Recalcule full_number à partir du groupe en une seule requête UPDATE"""
+        return super().update(full_number=self._full_number_expression())
+
+    def update(self, **kwargs):
+        # Le nom de recherche suit le nom lorsqu'il est fourni comme valeur
+        if isinstance(kwargs.get('name'), str) and 'search_name' not in kwargs:
+            kwargs['search_name'] = normalize_search(kwargs['name'])
+        # Le numéro complet dépend du numéro et du groupe : on le recalcule dans la même requête
+        if 'full_number' not in kwargs and {'number', 'account_group', 'account_group_id'} & kwargs.keys():
+            kwargs['full_number'] = self._full_number_expression(
+                number=kwargs.get('number'),
+                account_group=kwargs.get('account_group', kwargs.get('account_group_id')),
+            )
+        rows = super().update(**kwargs)
+        if rows:
+            invalidate_chart_tree()
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        # Numéros des groupes non chargés : une seule requête pour tout le lot
+        uncached = {obj.account_group_id for obj in objs if not self.model.account_group.is_cached(obj)}
+        group_numbers = dict(
+            AccountGroup.objects.filter(pk__in=uncached).values_list('pk', 'number')
+        ) if uncached else {}
+        for obj in objs:
+            if self.model.account_group.is_cached(obj):
+                group_number = obj.account_group.number
+            else:
+                group_number = group_numbers[obj.account_group_id]
+            # build_full_number valide la limite des 8 chiffres, comme save()
+            obj.full_number = build_full_number(group_number, obj.number)
+            obj.search_name = normalize_search(obj.name)
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            invalidate_chart_tree()
+        return created
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        fields = list(fields)
+        if 'name' in fields and 'search_name' not in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.search_name = normalize_search(obj.name)
+            fields.append('search_name')
+        if 'full_number' not in fields and {'number', 'account_group'} & set(fields):
+            objs = list(objs)
+            group_numbers = dict(
+                AccountGroup.objects.filter(
+                    pk__in={obj.account_group_id for obj in objs}
+                ).values_list('pk', 'number')
+            )
+            for obj in objs:
+                obj.full_number = build_full_number(group_numbers[obj.account_group_id], obj.number)
+            fields.append('full_number')
+        rows = super().bulk_update(objs, fields, batch_size=batch_size)
+        if rows:
+            invalidate_chart_tree()
+        return rows
+
+    def _full_number_expression(self, number=None, account_group=None):
+        if account_group is None:
+            group_number = Subquery(
+                AccountGroup.objects.filter(pk=OuterRef('account_group_id')).values('number')[:1]
+            )
+        elif isinstance(account_group, AccountGroup):
+            group_number = Value(account_group.number)
+        else:
+            group_number = Subquery(AccountGroup.objects.filter(pk=account_group).values('number')[:1])
+        return Concat(
+            Cast(group_number, output_field=models.CharField()),
+            F('number') if number is None else Value(number),
+            output_field=models.CharField(),
+        )
+
+
+class Account(TenantModel):
     """
-    Compte comptable
+    Compte comptable (propre à une société)
     """
     account_group = models.ForeignKey(AccountGroup, on_delete=models.CASCADE, related_name='accounts')
     number = models.CharField(max_length=10)
+    full_number = models.CharField(
+        max_length=8,
+        editable=False,
+        verbose_name="Numéro complet",
+        help_text="Numéro complet du compte (groupe + numéro), maintenu automatiquement."
+    )
     name = models.CharField(max_length=150)
+    search_name = models.CharField(
+        max_length=150,
+        blank=True,
+        editable=False,
+        verbose_name="Nom de recherche",
+        help_text="Nom sans accents ni majuscules, maintenu automatiquement pour la recherche."
+    )
     description = models.TextField(blank=True)
     account_type = models.ForeignKey(AccountType, on_delete=models.PROTECT)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    objects = TenantManager.from_queryset(AccountQuerySet)()
+    # Toutes sociétés confondues : opérations sur les groupes communs (renumérotation)
+    all_companies = models.Manager.from_queryset(AccountQuerySet)()
+
     class Meta:
         app_label = 'accounts'
-        ordering = ['number']
-        unique_together = [['account_group', 'number']]
+        base_manager_name = 'all_companies'
+        ordering = ['full_number']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'full_number'], name='account_company_full_number_uniq'),
+            models.UniqueConstraint(fields=['company', 'account_group', 'number'], name='account_company_number_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['company', 'search_name'], name='account_company_search_idx'),
+        ]
         verbose_name = "Compte"
         verbose_name_plural = "Comptes"
     
@@ -27,11 +177,33 @@ class Account(models.Model):
     
     def get_full_number(self):
         """Retourne le numéro complet du compte (ex: 101200)"""
-        return f"{self.account_group.get_full_number()}{self.number}"
+        if self.full_number:
+            return self.full_number
+        return build_full_number(self.account_group.get_full_number(), self.number)
     
+    @property
+    def level(self):
+        """Niveau dans le plan : 2 pour un groupe, un de plus par chiffre (ex: "401100" -> 6)"""
+        return len(self.get_full_number())
+
+    def get_ancestors(self):
+        """Comptes de niveau supérieur (ex: 4011 pour 401100), en une requête"""
+        return Account.objects.filter(company_id=self.company_id).ancestors_of(self)
+
+    def get_descendants(self):
+        """Sous-comptes (ex: 401100 pour 4011), en une requête sur un intervalle"""
+        return Account.objects.filter(company_id=self.company_id).subtree(self).exclude(pk=self.pk)
+
     def save(self, *args, **kwargs):
-        # Validation pour s'assurer que le numéro ne dépasse pas 8 chiffres au total
-        full_number = f"{self.account_group.get_full_number()}{self.number}"
-        if len(full_number) > 8:
-            raise ValueError("Le numéro de compte ne peut pas dépasser 8 chiffres au total")
+        # Recalculer le numéro complet (la validation des 8 chiffres est faite par build_full_number)
+        self.full_number = build_full_number(self.account_group.get_full_number(), self.number)
+        self.search_name = normalize_search(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'number', 'account_group'} & update_fields:
+                update_fields.add('full_number')
+            if 'name' in update_fields:
+                update_fields.add('search_name')
+            kwargs['update_fields'] = update_fields
         super().save(*args, **kwargs)
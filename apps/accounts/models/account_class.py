@@ -3,6 +3,17 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+class AccountClassQuerySet(models.QuerySet):
+    """QuerySet des classes qui applique aux créations en lot les règles de save()"""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.clean()
+            obj.derive_fields()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class AccountClass(models.Model):
     """
     Classe de compte (1-8) selon le plan comptable général.
@@ -31,7 +42,26 @@ class AccountClass(models.Model):
         7: "Regroupe les comptes de ventes, subventions d'exploitation et autres produits.",
         8: "Regroupe les comptes de charges et produits hors activités ordinaires."
     }
+
+    # Position par défaut dans le bilan (4, 5 et 8 peuvent changer selon le solde)
+    POSITIONS_CLASSES = {
+        1: "Passif",
+        2: "Actif",
+        3: "Actif",
+        4: "Passif",
+        5: "Actif",
+        6: "Charges",
+        7: "Produits",
+        8: "Charges"
+    }
     
+    # Classes dont la position dépend du solde de chaque compte : (solde débiteur, solde créditeur)
+    POSITIONS_SELON_SOLDE = {
+        4: ("Actif", "Passif"),
+        5: ("Actif", "Passif"),
+        8: ("Charges", "Produits"),
+    }
+
     POSITION_CHOICES = [
         ("Actif", "Actif"),
         ("Passif", "Passif"),
@@ -81,6 +111,8 @@ class AccountClass(models.Model):
     )
 
 
+    objects = AccountClassQuerySet.as_manager()
+
     class Meta:
         app_label = 'accounts'
         ordering = ['number']
@@ -89,42 +121,21 @@ class AccountClass(models.Model):
     
     def __str__(self):
         return f"{self.number} - {self.name}"
+
+    def get_full_number(self):
+        """Retourne le numéro complet de la classe (ex: 4), qui préfixe celui de ses groupes et comptes"""
+        return str(self.number)
     
-    def save(self, *args, **kwargs):
-        # Automatiquement définir le nom et la description en fonction du numéro
+    def derive_fields(self):
+        """Renseigne le nom, la description et la position au bilan à partir du numéro (sans requête)"""
         if self.number in self.NOMS_CLASSES:
             self.name = self.NOMS_CLASSES[self.number]
             self.description = self.DESCRIPTIONS_CLASSES[self.number]
-        
-        # Déterminer automatiquement la position dans le bilan selon le plan comptable OHADA
-        # 1 : Passif (Comptes de ressources durables)
-        if self.number == 1:
-            self.position_bilan = "Passif"
-        
-        # 2 et 3 : Actif (Comptes d'actif immobilisé et Comptes de stocks)
-        elif self.number == 2 or self.number == 3:
-            self.position_bilan = "Actif"
-        
-        # 4 : Peut être Actif ou Passif, mais Passif par défaut (Comptes de tiers)
-        elif self.number == 4:
-            self.position_bilan = "Passif"
-        
-        # 5 : Peut être Actif ou Passif, mais Actif par défaut (Comptes de trésorerie)
-        elif self.number == 5:
-            self.position_bilan = "Actif"
-        
-        # 6 : Charges (Comptes de charges des activités ordinaires)
-        elif self.number == 6:
-            self.position_bilan = "Charges"
-        
-        # 7 : Produits (Comptes de produits des activités ordinaires)
-        elif self.number == 7:
-            self.position_bilan = "Produits"
-        
-        # 8 : Peut être Charges ou Produits, mais Charges par défaut (Autres charges et produits)
-        elif self.number == 8:
-            self.position_bilan = "Charges"
-                
+        # Position par défaut dans le bilan selon le plan comptable OHADA (table POSITIONS_CLASSES)
+        self.position_bilan = self.POSITIONS_CLASSES.get(self.number, self.position_bilan)
+
+    def save(self, *args, **kwargs):
+        self.derive_fields()
         super().save(*args, **kwargs)
     
     
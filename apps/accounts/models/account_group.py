@@ -4,6 +4,66 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .account_class import AccountClass
 
+
+class AccountGroupQuerySet(models.QuerySet):
+    """
+    QuerySet des groupes qui applique aux opérations en lot les règles de save()
+    (nom et description OHADA, cohérence avec la classe), répercute les
+    renumérotations sur les comptes et invalide le cache du plan comptable,
+    comme les signaux post_save que ces opérations n'envoient pas.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        # La clé primaire d'une classe est son numéro : la validation ne fait aucune requête
+        for obj in objs:
+            obj.derive_fields()
+            obj.clean()
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            invalidate_chart_tree()
+        return created
+
+    def update(self, **kwargs):
+        if 'number' not in kwargs:
+            rows = super().update(**kwargs)
+            if rows:
+                invalidate_chart_tree()
+            return rows
+        number = kwargs['number']
+        if isinstance(number, int):
+            account_class = kwargs.get('account_class', kwargs.get('account_class_id'))
+            if account_class is not None:
+                mismatch = getattr(account_class, 'pk', account_class) != number // 10
+            else:
+                # Une seule requête pour vérifier la classe de tous les groupes renumérotés
+                mismatch = self.exclude(account_class_id=number // 10).exists()
+            if mismatch:
+                raise ValidationError({
+                    'number': f"Le numéro de groupe doit commencer par {number // 10} pour la classe sélectionnée."
+                })
+            if number in self.model.NOMS_GROUPES:
+                kwargs.setdefault('name', self.model.NOMS_GROUPES[number])
+                kwargs.setdefault('description', self.model.DESCRIPTIONS_GROUPES.get(number, ""))
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        # Le numéro complet des comptes commence par le numéro du groupe : les
+        # groupes sont communs, les comptes de toutes les sociétés sont recalculés
+        account_model = self.model._meta.get_field('accounts').related_model
+        account_model._base_manager.filter(account_group__in=pks).sync_full_numbers()
+        if rows:
+            # Version partagée par toutes les sociétés : chaque arbre sera reconstruit
+            invalidate_chart_tree()
+        return rows
+
+
+def invalidate_chart_tree():
+    # Import différé : chart_services importe les modèles
+    from ..services.chart_services import invalidate_chart_tree
+
+    invalidate_chart_tree()
+
+
 class AccountGroup(models.Model):
     """
     Groupe de comptes (niveau 2 du plan comptable OHADA).
@@ -249,6 +309,8 @@ class AccountGroup(models.Model):
         verbose_name="Date de création",
         auto_now_add=True
     )
+
+    objects = AccountGroupQuerySet.as_manager()
     
     class Meta:
         app_label = 'accounts'
@@ -258,36 +320,56 @@ class AccountGroup(models.Model):
         verbose_name_plural = "Groupes de comptes"
     
     def __str__(self):
-        return f"{self.account_class.number}{self.number} - {self.name}"
+        # Le numéro du groupe contient déjà le chiffre de la classe : aucune requête sur la classe
+        return f"{self.get_full_number()} - {self.name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Mémoriser le numéro chargé pour détecter une renumérotation
+        instance._loaded_number = instance.__dict__.get('number')
+        return instance
+
+    def get_full_number(self):
+        """Retourne le numéro complet du groupe (ex: 40), qui préfixe celui de ses comptes"""
+        return str(self.number)
     
+    def derive_fields(self):
+        """Renseigne le nom et la description OHADA à partir du numéro (sans requête)"""
+        if self.number in self.NOMS_GROUPES:
+            self.name = self.NOMS_GROUPES[self.number]
+            self.description = self.DESCRIPTIONS_GROUPES.get(self.number, "")
+
     def clean(self):
         # Vérifier que le numéro de groupe est cohérent avec la classe sélectionnée
-        if self.account_class and self.number:
+        # (la clé primaire d'une classe est son numéro : aucune requête)
+        if self.account_class_id and self.number:
             # Obtenir le premier chiffre du numéro de groupe
             first_digit = self.number // 10
             
             # Vérifier que le premier chiffre correspond à la classe
-            if first_digit != self.account_class.number:
+            if first_digit != self.account_class_id:
                 raise ValidationError({
-                    'number': f"Le numéro de groupe doit commencer par {self.account_class.number} pour la classe sélectionnée."
-                })
-            
-            # Vérifier que le deuxième chiffre est entre 0 et 9
-            second_digit = self.number % 10
-            if second_digit < 0 or second_digit > 9:
-                raise ValidationError({
-                    'number': "Le deuxième chiffre du numéro de groupe doit être entre 0 et 9."
+                    'number': f"Le numéro de groupe doit commencer par {self.account_class_id} pour la classe sélectionnée."
                 })
         
         super().clean()
     
     def save(self, *args, **kwargs):
         # Définir automatiquement le nom et la description en fonction du numéro
-        if self.number in self.NOMS_GROUPES:
-            self.name = self.NOMS_GROUPES[self.number]
-            self.description = self.DESCRIPTIONS_GROUPES.get(self.number, "")
+        self.derive_fields()
         
         # Vérifier la cohérence avec la classe avant sauvegarde
         self.clean()
+
+        renumbered = self.pk is not None and getattr(self, '_loaded_number', self.number) != self.number
         
         super().save(*args, **kwargs)
+
+        # Répercuter la renumérotation sur le numéro complet des comptes du groupe,
+        # dans toutes les sociétés (self.accounts est limité à la société courante)
+        if renumbered:
+            self._meta.get_field('accounts').related_model._base_manager.filter(
+                account_group=self
+            ).sync_full_numbers()
+        self._loaded_number = self.number
@@ -0,0 +1,130 @@
+"""
+Règles OHADA des classes et groupes, compilées une fois à l'import.
+
+Les tables des modèles (AccountClass.NOMS_CLASSES, POSITIONS_CLASSES,
+AccountGroup.NOMS_GROUPES, ...) restent la source ; elles sont compilées ici
+en tuples immuables indexés par le numéro : CLASS_RULES[4], GROUP_RULES[41].
+Formulaires, admin et services y lisent en O(1) la position au bilan, les
+groupes valides d'une classe, le type de compte par défaut et le sens normal
+du solde, sans chaînes de conditions ni reconstruction à chaque requête.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from .models.account_class import AccountClass
+from .models.account_group import AccountGroup
+from .models.account_type import AccountType
+
+DEBIT = 'D'
+CREDIT = 'C'
+
+# Type de compte et sens normal du solde par défaut de chaque classe
+CLASS_DEFAULTS = {
+    1: (AccountType.CP, CREDIT),
+    2: (AccountType.AC, DEBIT),
+    3: (AccountType.AC, DEBIT),
+    4: (AccountType.PA, CREDIT),
+    5: (AccountType.AC, DEBIT),
+    6: (AccountType.CH, DEBIT),
+    7: (AccountType.PR, CREDIT),
+    8: (AccountType.CH, DEBIT),
+}
+
+# Groupes qui s'écartent du défaut de leur classe
+GROUP_DEFAULTS = {
+    # Dettes financières et provisions pour risques
+    16: (AccountType.PA, CREDIT),
+    17: (AccountType.PA, CREDIT),
+    18: (AccountType.PA, CREDIT),
+    19: (AccountType.PA, CREDIT),
+    # Amortissements et dépréciations : comptes d'actif à solde créditeur
+    28: (AccountType.AC, CREDIT),
+    29: (AccountType.AC, CREDIT),
+    39: (AccountType.AC, CREDIT),
+    49: (AccountType.AC, CREDIT),
+    59: (AccountType.AC, CREDIT),
+    # Créances de tiers
+    41: (AccountType.AC, DEBIT),
+    45: (AccountType.AC, DEBIT),
+    46: (AccountType.AC, DEBIT),
+    47: (AccountType.AC, DEBIT),
+    48: (AccountType.AC, DEBIT),
+    # Produits hors activités ordinaires
+    82: (AccountType.PR, CREDIT),
+    84: (AccountType.PR, CREDIT),
+    86: (AccountType.PR, CREDIT),
+    88: (AccountType.PR, CREDIT),
+}
+
+
+class ClassRule(NamedTuple):
+    number: int
+    name: str
+    description: str
+    position: str
+    # (position si solde débiteur, position si solde créditeur), ou None si la position est fixe
+    positions_selon_solde: Optional[Tuple[str, str]]
+    account_type: str
+    normal_balance: str
+    groups: Tuple[int, ...]
+
+
+class GroupRule(NamedTuple):
+    number: int
+    class_number: int
+    name: str
+    description: str
+    account_type: str
+    normal_balance: str
+
+    @property
+    def label(self):
+        return f"{self.number} - {self.name}"
+
+
+def _compile():
+    groups = [None] * 90
+    for number, name in AccountGroup.NOMS_GROUPES.items():
+        account_type, normal_balance = GROUP_DEFAULTS.get(number, CLASS_DEFAULTS[number // 10])
+        groups[number] = GroupRule(
+            number, number // 10, name, AccountGroup.DESCRIPTIONS_GROUPES.get(number, ""),
+            account_type, normal_balance,
+        )
+    classes = [None] * 9
+    for number, name in AccountClass.NOMS_CLASSES.items():
+        account_type, normal_balance = CLASS_DEFAULTS[number]
+        classes[number] = ClassRule(
+            number, name, AccountClass.DESCRIPTIONS_CLASSES.get(number, ""),
+            AccountClass.POSITIONS_CLASSES[number], AccountClass.POSITIONS_SELON_SOLDE.get(number),
+            account_type, normal_balance,
+            tuple(group for group in range(number * 10, number * 10 + 10) if groups[group] is not None),
+        )
+    return tuple(classes), tuple(groups)
+
+
+# Indexés par numéro ; None pour un numéro hors du plan OHADA
+CLASS_RULES, GROUP_RULES = _compile()
+
+# Classes dont la position au bilan dépend du solde de chaque compte (4, 5 et 8)
+DUAL_POSITION_CLASSES = tuple(rule for rule in CLASS_RULES if rule and rule.positions_selon_solde)
+
+# Choix (valeur, libellé) des groupes de chaque classe, pour les formulaires
+GROUP_CHOICES = tuple(
+    tuple((str(group), GROUP_RULES[group].label) for group in rule.groups) if rule else ()
+    for rule in CLASS_RULES
+)
+
+
+def class_rule(number):
+    """Règle d'une classe (1 à 8), ou None"""
+    return CLASS_RULES[number] if isinstance(number, int) and 0 <= number < len(CLASS_RULES) else None
+
+
+def group_rule(number):
+    """Règle d'un groupe (10 à 89), ou None"""
+    return GROUP_RULES[number] if isinstance(number, int) and 0 <= number < len(GROUP_RULES) else None
+
+
+def group_choices_for_class(class_number):
+    """Choix (valeur, libellé) des groupes OHADA d'une classe"""
+    rule = class_rule(class_number)
+    return GROUP_CHOICES[rule.number] if rule else ()
@@ -1 +1,37 @@
- 
+"""
+Création en lot des niveaux du plan comptable.
+
+Les règles de save() (noms et descriptions OHADA, position au bilan,
+cohérence groupe/classe, numéro complet et nom de recherche des comptes)
+sont appliquées par les QuerySet des modèles lors de bulk_create et update :
+les services créent ici les classes et groupes manquants d'un lot avec une
+requête par niveau, au lieu d'un save() par ligne.
+"""
+from ..models.account_class import AccountClass
+from ..models.account_group import AccountGroup
+
+
+def ensure_groups(group_numbers):
+    """
+    Crée les classes et groupes OHADA manquants parmi les numéros de groupe
+    donnés ; retourne {numéro de groupe: groupe}.
+    """
+    group_numbers = set(group_numbers)
+    groups = {group.number: group for group in AccountGroup.objects.filter(number__in=group_numbers).order_by()}
+    missing = sorted(group_numbers - groups.keys())
+    if not missing:
+        return groups
+
+    # La clé primaire d'une classe est son numéro
+    existing_classes = set(
+        AccountClass.objects.filter(number__in={number // 10 for number in missing}).values_list('number', flat=True)
+    )
+    AccountClass.objects.bulk_create([
+        AccountClass(number=class_number)
+        for class_number in sorted({number // 10 for number in missing} - existing_classes)
+    ])
+    AccountGroup.objects.bulk_create([
+        AccountGroup(account_class_id=number // 10, number=number) for number in missing
+    ])
+    # Relu : toutes les bases ne renvoient pas les clés des lignes insérées
+    return {group.number: group for group in AccountGroup.objects.filter(number__in=group_numbers).order_by()}
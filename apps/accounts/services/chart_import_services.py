@@ -0,0 +1,159 @@
+"""
+Import en masse du plan comptable (CSV ou JSON).
+
+Chaque ligne décrit un compte par son numéro complet (ex: 401100), son
+intitulé et son type (par défaut, celui de son groupe : voir accounts.rules).
+Tout le fichier est validé en mémoire contre les classes, groupes, types et
+comptes chargés une seule fois, puis les comptes sont insérés ou mis à jour
+par lots avec bulk_create(update_conflicts=True) : aucun save() ni clean()
+n'est appelé compte par compte (les règles de save() sont appliquées au lot
+par AccountQuerySet.bulk_create).
+"""
+import csv
+import json
+import os
+from typing import List, NamedTuple
+
+from django.db import transaction
+
+from core.tenancy import get_company_id
+from ..models.account import Account, build_full_number
+from ..models.account_group import AccountGroup
+from ..models.account_type import AccountType
+from ..rules import group_rule
+from .account_services import ensure_groups
+
+BATCH_SIZE = 1000
+
+FALSE_VALUES = {'0', 'false', 'faux', 'non', 'no', 'n'}
+
+
+class ImportRowError(NamedTuple):
+    line: int
+    full_number: str
+    message: str
+
+    def __str__(self):
+        return f"Ligne {self.line} ({self.full_number or '?'}) : {self.message}"
+
+
+class ImportReport(NamedTuple):
+    created: int
+    updated: int
+    errors: List[ImportRowError]
+
+
+def read_chart_file(path):
+    """Itère sur les lignes (numéro de ligne, dictionnaire) d'un fichier CSV ou JSON"""
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path, encoding='utf-8') as stream:
+            data = json.load(stream)
+        if not isinstance(data, list):
+            raise ValueError("le fichier JSON doit contenir une liste de comptes.")
+        yield from enumerate(data, start=1)
+        return
+
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        sample = stream.read(4096)
+        stream.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=';,\t')
+        # La ligne 1 est l'en-tête
+        yield from enumerate(csv.DictReader(stream, dialect=dialect), start=2)
+
+
+def import_chart(rows, dry_run=False, company=None):
+    """
+    Importe des comptes d'une société (par défaut, la société courante) à
+    partir de lignes (numéro de ligne, dictionnaire).
+
+    Les lignes invalides sont écartées et signalées dans le rapport ; les
+    autres sont importées (sauf si dry_run). Les classes et groupes OHADA
+    manquants sont créés.
+    """
+    company_id = get_company_id(company)
+    account_types = set(AccountType.objects.order_by().values_list('code', flat=True))
+    group_classes = dict(AccountGroup.objects.order_by().values_list('number', 'account_class_id'))
+    existing = set(
+        Account.objects.filter(company_id=company_id).order_by().values_list('full_number', flat=True)
+    )
+
+    errors = []
+    accounts = {}
+    for line, data in rows:
+        if not isinstance(data, dict):
+            errors.append(ImportRowError(line, '', "la ligne doit être un objet (numéro, intitulé, type)."))
+            continue
+        full_number = str(data.get('full_number') or '').strip()
+        try:
+            accounts[full_number] = _build_account(
+                full_number, data, accounts, account_types, group_classes, company_id
+            )
+        except ValueError as exc:
+            errors.append(ImportRowError(line, full_number, str(exc)))
+
+    if dry_run or not accounts:
+        return ImportReport(0, 0, errors)
+
+    with transaction.atomic():
+        groups = ensure_groups({account.account_group_id for account in accounts.values()})
+        for account in accounts.values():
+            # account_group_id contient le numéro du groupe jusqu'ici ; le groupe
+            # chargé évite à bulk_create de le relire pour le numéro complet
+            account.account_group = groups[account.account_group_id]
+        Account.objects.bulk_create(
+            accounts.values(),
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['company', 'full_number'],
+            update_fields=[
+                'account_group', 'number', 'name', 'search_name', 'description',
+                'account_type', 'is_active', 'updated_at',
+            ],
+        )
+
+    updated = len(existing.intersection(accounts))
+    return ImportReport(len(accounts) - updated, updated, errors)
+
+
+def _build_account(full_number, data, accounts, account_types, group_classes, company_id):
+    if not full_number.isdigit() or len(full_number) < 3:
+        raise ValueError("le numéro doit comporter au moins 3 chiffres.")
+    if full_number in accounts:
+        raise ValueError("compte en double dans le fichier.")
+
+    group_number, number = int(full_number[:2]), full_number[2:]
+    class_number = group_number // 10
+    if not 1 <= class_number <= 8:
+        raise ValueError(f"la classe {class_number} n'existe pas (1 à 8).")
+    if group_classes.get(group_number, class_number) != class_number:
+        raise ValueError(f"le groupe {group_number} n'appartient pas à la classe {class_number}.")
+    build_full_number(group_number, number)
+
+    name = str(data.get('name') or '').strip()
+    if not name:
+        raise ValueError("l'intitulé est obligatoire.")
+    if len(name) > Account._meta.get_field('name').max_length:
+        raise ValueError("l'intitulé est trop long.")
+
+    # Sans type, le compte prend le type par défaut de son groupe OHADA
+    account_type = str(data.get('account_type') or '').strip().upper()
+    if not account_type:
+        account_type = group_rule(group_number).account_type
+    if account_type not in account_types:
+        raise ValueError(f"type de compte « {account_type} » inconnu.")
+
+    is_active = data.get('is_active', True)
+    if isinstance(is_active, str):
+        is_active = is_active.strip().lower() not in FALSE_VALUES
+
+    return Account(
+        company_id=company_id,
+        # Le numéro du groupe est remplacé par son id une fois les groupes créés
+        account_group_id=group_number,
+        number=number,
+        # Numéro complet et nom de recherche : dérivés par bulk_create
+        name=name,
+        description=str(data.get('description') or '').strip(),
+        account_type_id=account_type,
+        is_active=bool(is_active),
+    )
@@ -0,0 +1,171 @@
+"""
+Cache en mémoire du plan comptable.
+
+L'arbre classes -> groupes -> comptes (ainsi que les types de compte) est
+construit une seule fois par processus et par société sous forme de tuples
+immuables (les classes et groupes OHADA sont communs, les comptes propres à
+chaque société).
+Un numéro de version partagé via le cache Django permet d'invalider l'arbre
+de tous les processus dès qu'un élément du plan est modifié (voir signals.py).
+"""
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core.tenancy import get_company_id
+from ..models.account import Account
+from ..models.account_class import AccountClass
+from ..models.account_group import AccountGroup
+from ..models.account_type import AccountType
+
+CHART_VERSION_KEY = 'accounts:chart_version'
+
+
+class AccountNode(NamedTuple):
+    id: int
+    number: str
+    full_number: str
+    name: str
+    account_type_id: str
+    is_active: bool
+
+
+class GroupNode(NamedTuple):
+    id: int
+    number: int
+    full_number: str
+    name: str
+    actif: bool
+    accounts: Tuple[AccountNode, ...]
+
+
+class ClassNode(NamedTuple):
+    number: int
+    name: str
+    position_bilan: str
+    actif: bool
+    groups: Tuple[GroupNode, ...]
+
+
+class TypeNode(NamedTuple):
+    code: str
+    name: str
+
+
+class ChartTree(NamedTuple):
+    version: int
+    classes: Tuple[ClassNode, ...]
+    types: Tuple[TypeNode, ...]
+    groups_by_id: Mapping[int, GroupNode]
+    accounts_by_id: Mapping[int, AccountNode]
+
+
+_lock = threading.Lock()
+_trees: Dict[int, ChartTree] = {}
+
+
+def get_chart_version():
+    """Retourne la version courante du plan comptable partagée entre processus"""
+    version = cache.get(CHART_VERSION_KEY)
+    if version is None:
+        # Valeur initiale imprévisible : une clé évincée ne doit pas retomber sur une ancienne version
+        cache.add(CHART_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CHART_VERSION_KEY)
+    return version
+
+
+def get_chart_tree(company=None):
+    """
+    Retourne l'arbre immuable du plan comptable de la société (par défaut, la société courante).
+    Aucune requête SQL n'est exécutée tant que la version n'a pas changé.
+    """
+    company_id = get_company_id(company)
+    version = get_chart_version()
+    tree = _trees.get(company_id)
+    if tree is None or tree.version != version:
+        with _lock:
+            tree = _trees.get(company_id)
+            if tree is None or tree.version != version:
+                tree = _trees[company_id] = _build_chart_tree(version, company_id)
+    return tree
+
+
+def invalidate_chart_tree():
+    """Change la version du plan comptable : chaque processus reconstruira son arbre"""
+    _bump_chart_version()
+    # Une reconstruction faite par un autre processus avant le commit serait périmée
+    transaction.on_commit(_bump_chart_version)
+
+
+def group_choices(tree=None):
+    """Choix (id, libellé) des groupes actifs, pour les formulaires"""
+    tree = tree or get_chart_tree()
+    return [
+        (group.id, f"{group.full_number} - {group.name}")
+        for account_class in tree.classes
+        for group in account_class.groups
+        if group.actif
+    ]
+
+
+def account_type_choices(tree=None):
+    """Choix (code, libellé) des types de compte, pour les formulaires"""
+    tree = tree or get_chart_tree()
+    return [(account_type.code, f"{account_type.code} = {account_type.name}") for account_type in tree.types]
+
+
+def _bump_chart_version():
+    try:
+        cache.incr(CHART_VERSION_KEY)
+    except ValueError:
+        cache.add(CHART_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _build_chart_tree(version, company_id):
+    accounts_by_group = {}
+    accounts_by_id = {}
+    for pk, group_id, number, full_number, name, type_id, is_active in Account.objects.filter(
+        company_id=company_id
+    ).order_by('full_number').values_list(
+        'pk', 'account_group_id', 'number', 'full_number', 'name', 'account_type_id', 'is_active'
+    ):
+        node = AccountNode(pk, number, full_number, name, type_id, is_active)
+        accounts_by_group.setdefault(group_id, []).append(node)
+        accounts_by_id[pk] = node
+
+    # Classes et groupes en une seule requête (jointure externe : une classe sans groupe reste dans l'arbre)
+    groups_by_class = {}
+    groups_by_id = {}
+    class_rows = {}
+    for number, name, position_bilan, actif, pk, group_number, group_name, group_actif in (
+        AccountClass.objects.order_by('number', 'accountgroup__number').values_list(
+            'number', 'name', 'position_bilan', 'actif',
+            'accountgroup__pk', 'accountgroup__number', 'accountgroup__name', 'accountgroup__actif',
+        )
+    ):
+        class_rows.setdefault(number, (name, position_bilan, actif))
+        if pk is None:
+            continue
+        node = GroupNode(
+            pk, group_number, str(group_number), group_name, group_actif, tuple(accounts_by_group.get(pk, ()))
+        )
+        groups_by_class.setdefault(number, []).append(node)
+        groups_by_id[pk] = node
+
+    classes = tuple(
+        ClassNode(number, *row, tuple(groups_by_class.get(number, ())))
+        for number, row in class_rows.items()
+    )
+    types = tuple(TypeNode(*row) for row in AccountType.objects.order_by('code').values_list('code', 'name'))
+
+    return ChartTree(
+        version=version,
+        classes=classes,
+        types=types,
+        groups_by_id=MappingProxyType(groups_by_id),
+        accounts_by_id=MappingProxyType(accounts_by_id),
+    )
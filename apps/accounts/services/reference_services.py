@@ -0,0 +1,76 @@
+"""
+Référentiel OHADA (classes et groupes) compilé en un paquet JSON versionné.
+
+Les noms, descriptions et positions au bilan sont lus dans les règles
+compilées (accounts.rules) : le paquet est construit une seule fois par
+processus, et sa version (empreinte du contenu) sert d'ETag et de paramètre
+d'URL pour un cache navigateur longue durée. L'admin le charge une fois par
+session et résout les aperçus côté client.
+"""
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple
+
+from django.urls import reverse
+
+from ..rules import CLASS_RULES, GROUP_RULES, group_choices_for_class
+
+
+class ReferenceBundle(NamedTuple):
+    version: str
+    content: bytes
+    data: dict
+
+
+@lru_cache(maxsize=None)
+def get_reference_bundle():
+    """Retourne le paquet du référentiel OHADA (calculé au premier appel)"""
+    data = {
+        'classes': {
+            str(rule.number): {
+                'name': rule.name,
+                'description': rule.description,
+                'position': rule.position,
+            }
+            for rule in CLASS_RULES
+            if rule
+        },
+        'groups': {
+            str(rule.number): {
+                'name': rule.name,
+                'description': rule.description,
+                'class': rule.class_number,
+                'account_type': rule.account_type,
+                'normal_balance': rule.normal_balance,
+            }
+            for rule in GROUP_RULES
+            if rule
+        },
+    }
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    version = hashlib.sha256(payload).hexdigest()[:16]
+    content = json.dumps(
+        {'version': version, **data}, ensure_ascii=False, sort_keys=True, separators=(',', ':')
+    ).encode('utf-8')
+    return ReferenceBundle(version, content, data)
+
+
+def get_reference_url():
+    """URL versionnée du paquet : elle change avec son contenu et peut être mise en cache indéfiniment"""
+    return f"{reverse('ohada_reference')}?v={get_reference_bundle().version}"
+
+
+def get_class_reference(number):
+    """Nom, description et position d'une classe OHADA, ou None"""
+    return get_reference_bundle().data['classes'].get(str(number))
+
+
+def get_group_reference(number):
+    """Nom, description et classe d'un groupe OHADA, ou None"""
+    return get_reference_bundle().data['groups'].get(str(number))
+
+
+def get_group_options(class_number):
+    """Options (valeur, libellé) des groupes OHADA d'une classe"""
+    return [{'value': value, 'label': label} for value, label in group_choices_for_class(class_number)]
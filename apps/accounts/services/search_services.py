@@ -0,0 +1,68 @@
+"""
+Recherche de comptes côté serveur.
+
+Un terme numérique est cherché comme préfixe du numéro complet (intervalle sur
+l'index de full_number) ; les autres termes sont cherchés, sans accents ni
+majuscules, dans la colonne indexée search_name (index trigramme sous
+PostgreSQL). Les résultats sont classés : nom commençant par le terme, puis
+mot commençant par le terme, puis le reste ; à rang égal, par ordre alphabétique.
+"""
+from typing import List, NamedTuple
+
+from django.db.models import Case, IntegerField, Value, When
+
+from core.tenancy import get_company_id
+from core.utils import normalize_search
+from ..models.account import Account
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_QUERY_LENGTH = 100
+
+
+class SearchPage(NamedTuple):
+    query: str
+    page: int
+    results: List[dict]
+    has_next: bool
+
+
+def search_accounts(query, page=1, page_size=PAGE_SIZE, company=None):
+    """Retourne une page de comptes de la société correspondant à la recherche"""
+    terms = normalize_search(query[:MAX_QUERY_LENGTH]).split()
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    if not terms:
+        return SearchPage(query, page, [], False)
+
+    prefix = next((term for term in terms if term.isdigit()), None)
+    words = [term for term in terms if term != prefix]
+
+    # La société en tête des index (société, numéro) et (société, nom de recherche)
+    accounts = Account.objects.filter(company_id=get_company_id(company))
+    if prefix:
+        accounts = accounts.with_prefix(prefix)
+    for word in words:
+        accounts = accounts.filter(search_name__contains=word)
+
+    start = (page - 1) * page_size
+    fields = ('id', 'full_number', 'name', 'account_group_id', 'is_active')
+    if not words:
+        # Recherche par numéro seul : l'intervalle sur l'index est déjà trié
+        rows = list(accounts.order_by('full_number').values(*fields)[start:start + page_size + 1])
+        return SearchPage(query, page, rows[:page_size], len(rows) > page_size)
+
+    # Classement puis tri alphabétique sur search_name : la première requête ne lit que
+    # l'index de search_name (couvrant), les comptes de la page sont chargés ensuite
+    ranked = accounts.annotate(rank=Case(
+        When(search_name__startswith=words[0], then=Value(0)),
+        When(search_name__contains=f" {words[0]}", then=Value(1)),
+        default=Value(2),
+        output_field=IntegerField(),
+    )).order_by('rank', 'search_name', 'id')
+    # Une ligne de plus que la page suffit à savoir s'il y a une suite (pas de COUNT)
+    ids = list(ranked.values_list('id', flat=True)[start:start + page_size + 1])
+    has_next = len(ids) > page_size
+    ids = ids[:page_size]
+    rows_by_id = {row['id']: row for row in Account.objects.filter(pk__in=ids).order_by().values(*fields)}
+    return SearchPage(query, page, [rows_by_id[pk] for pk in ids], has_next)
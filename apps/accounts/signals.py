@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.account import Account
+from .models.account_class import AccountClass
+from .models.account_group import AccountGroup
+from .models.account_type import AccountType
+from .services.chart_services import invalidate_chart_tree
+
+
+@receiver([post_save, post_delete], sender=AccountClass, dispatch_uid='chart_tree_account_class')
+@receiver([post_save, post_delete], sender=AccountGroup, dispatch_uid='chart_tree_account_group')
+@receiver([post_save, post_delete], sender=Account, dispatch_uid='chart_tree_account')
+@receiver([post_save, post_delete], sender=AccountType, dispatch_uid='chart_tree_account_type')
+def invalidate_chart_tree_on_change(sender, **kwargs):
+    """Invalide le cache du plan comptable à chaque modification d'un de ses éléments"""
+    invalidate_chart_tree()
@@ -0,0 +1,9 @@
+from django import template
+from ..services.reference_services import get_reference_url
+
+register = template.Library()
+
+@register.simple_tag
+def ohada_reference_url():
+    """URL versionnée du paquet JSON du référentiel OHADA"""
+    return get_reference_url()
@@ -0,0 +1,68 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+
+
+class AdminQueryBudgetTest(TestCase):
+    """Chaque page de liste exécute un nombre constant de requêtes, quelle que soit sa taille"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret')
+        for code, _ in AccountType.CODE_CHOICES:
+            AccountType.objects.create(code=code)
+        for class_number in range(1, 9):
+            account_class = AccountClass.objects.create(number=class_number)
+            for number in range(class_number * 10, class_number * 10 + 3):
+                group = AccountGroup.objects.create(account_class=account_class, number=number)
+                for i in range(3):
+                    Account.objects.create(
+                        account_group=group,
+                        number=f"{i:04d}",
+                        name=f"Compte {number}{i}",
+                        account_type_id=AccountType.CODE_CHOICES[i][0],
+                    )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def count_queries(self, model, per_page):
+        url = reverse(f'admin:accounts_{model._meta.model_name}_changelist')
+        with mock.patch.object(admin.site._registry[model], 'list_per_page', per_page):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def assertChangelistBudget(self, model, budget):
+        # Session, utilisateur, comptages, lignes de la page et filtres latéraux
+        self.assertEqual(self.count_queries(model, 1), budget)
+        self.assertEqual(self.count_queries(model, 100), budget)
+
+    def test_account_changelist(self):
+        self.assertChangelistBudget(Account, 7)
+
+    def test_account_group_changelist(self):
+        self.assertChangelistBudget(AccountGroup, 6)
+
+    def test_account_class_changelist(self):
+        self.assertChangelistBudget(AccountClass, 5)
+
+    def test_account_type_changelist(self):
+        self.assertChangelistBudget(AccountType, 5)
+
+    def test_account_change_form(self):
+        # Les libellés des groupes proposés ne chargent pas leur classe
+        account = Account.objects.first()
+        url = reverse('admin:accounts_account_change', args=[account.pk])
+        with self.assertNumQueries(6):
+            self.assertEqual(self.client.get(url).status_code, 200)
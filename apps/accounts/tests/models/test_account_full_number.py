@@ -0,0 +1,99 @@
+from django.test import TestCase
+
+from core.models import Company
+from core.tenancy import use_company
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.chart_services import get_chart_tree
+
+
+class AccountFullNumberTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account_class = AccountClass.objects.create(number=4)
+        cls.suppliers = AccountGroup.objects.create(account_class=cls.account_class, number=40)
+        cls.customers = AccountGroup.objects.create(account_class=cls.account_class, number=41)
+        cls.account_type = AccountType.objects.create(code=AccountType.PA)
+        cls.account = Account.objects.create(
+            account_group=cls.suppliers,
+            number="1100",
+            name="Fournisseurs",
+            account_type=cls.account_type,
+        )
+
+    def test_full_number_is_persisted_on_save(self):
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "401100")
+        self.assertEqual(str(self.account), "401100 - Fournisseurs")
+
+    def test_save_validate_number_length(self):
+        with self.assertRaises(ValueError):
+            Account.objects.create(
+                account_group=self.suppliers,
+                number="1234567",
+                name="Numéro trop long",
+                account_type=self.account_type,
+            )
+
+    def test_get_full_number_does_not_query_group(self):
+        account = Account.objects.get(pk=self.account.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(account.get_full_number(), "401100")
+
+    def test_queryset_update_keeps_full_number_in_sync(self):
+        Account.objects.filter(pk=self.account.pk).update(number="1200")
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "401200")
+
+        Account.objects.filter(pk=self.account.pk).update(account_group=self.customers)
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "411200")
+
+    def test_bulk_update_keeps_full_number_in_sync(self):
+        self.account.number = "1300"
+        Account.objects.bulk_update([self.account], ['number'])
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "401300")
+
+    def test_group_renumbering_updates_accounts(self):
+        group = AccountGroup.objects.get(pk=self.suppliers.pk)
+        group.number = 42
+        group.save()
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "421100")
+
+        AccountGroup.objects.filter(pk=group.pk).update(number=43)
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "431100")
+
+    def test_group_renumbering_updates_every_company(self):
+        other = Company.objects.create(name="Filiale", slug='filiale')
+        with use_company(other):
+            other_account = Account.objects.create(
+                account_group=self.suppliers, number="1100", name="Fournisseurs", account_type=self.account_type
+            )
+        get_chart_tree(other)
+
+        # Renumérotation faite depuis la société par défaut : les groupes sont communs
+        with use_company(Company.objects.get_default()):
+            group = AccountGroup.objects.get(pk=self.suppliers.pk)
+            group.number = 42
+            group.save()
+        accounts = Account.all_companies.filter(pk__in=[self.account.pk, other_account.pk])
+        self.assertEqual(
+            dict(accounts.values_list('pk', 'full_number')), {self.account.pk: "421100", other_account.pk: "421100"}
+        )
+        self.assertEqual(get_chart_tree(other).accounts_by_id[other_account.pk].full_number, "421100")
+
+        with use_company(other):
+            AccountGroup.objects.filter(pk=group.pk).update(number=43)
+        self.assertEqual(Account.objects.get(pk=self.account.pk).full_number, "431100")
+        self.assertEqual(get_chart_tree().accounts_by_id[self.account.pk].full_number, "431100")
+
+    def test_prefix_search(self):
+        Account.objects.create(
+            account_group=self.customers,
+            number="1100",
+            name="Clients",
+            account_type=self.account_type,
+        )
+        self.assertEqual(
+            list(Account.objects.with_prefix("401").values_list('full_number', flat=True)),
+            ["401100"],
+        )
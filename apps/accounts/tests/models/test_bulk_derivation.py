@@ -0,0 +1,74 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.account_services import ensure_groups
+
+
+class BulkDerivationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.account_type = AccountType.objects.create(code=AccountType.PA)
+
+    def test_bulk_create_derives_class_and_group_fields(self):
+        AccountClass.objects.bulk_create([AccountClass(number=4), AccountClass(number=6)])
+        AccountGroup.objects.bulk_create([AccountGroup(account_class_id=4, number=40)])
+
+        self.assertEqual(AccountClass.objects.get(number=4).name, AccountClass.NOMS_CLASSES[4])
+        self.assertEqual(AccountClass.objects.get(number=6).position_bilan, "Charges")
+        self.assertEqual(AccountGroup.objects.get(number=40).name, AccountGroup.NOMS_GROUPES[40])
+
+    def test_bulk_create_validates_group_class(self):
+        AccountClass.objects.create(number=4)
+        with self.assertRaises(ValidationError):
+            AccountGroup.objects.bulk_create([AccountGroup(account_class_id=4, number=52)])
+        self.assertFalse(AccountGroup.objects.exists())
+
+    def test_group_update_derives_name_and_validates_class(self):
+        AccountClass.objects.create(number=4)
+        group = AccountGroup.objects.create(account_class_id=4, number=40)
+
+        AccountGroup.objects.filter(pk=group.pk).update(number=41)
+        self.assertEqual(AccountGroup.objects.get(pk=group.pk).name, AccountGroup.NOMS_GROUPES[41])
+        with self.assertRaises(ValidationError):
+            AccountGroup.objects.filter(pk=group.pk).update(number=52)
+
+    def test_account_bulk_create_derives_full_number_and_search_name(self):
+        groups = ensure_groups({40})
+        # Groupe chargé : aucune requête en plus de l'insertion
+        with self.assertNumQueries(1):
+            Account.objects.bulk_create([
+                Account(account_group=groups[40], number="1100", name="Fournisseurs étrangers",
+                        account_type=self.account_type),
+            ])
+        # Groupe désigné par son id : une requête pour tout le lot
+        with self.assertNumQueries(2):
+            Account.objects.bulk_create([
+                Account(account_group_id=groups[40].pk, number=str(number), name=f"Fournisseur {number}",
+                        account_type=self.account_type)
+                for number in range(1200, 1205)
+            ])
+
+        account = Account.objects.get(full_number="401100")
+        self.assertEqual(account.search_name, "fournisseurs etrangers")
+        self.assertEqual(Account.objects.filter(full_number__startswith="4012").count(), 5)
+        with self.assertRaises(ValueError):
+            Account.objects.bulk_create([
+                Account(account_group=groups[40], number="1234567", name="Numéro trop long",
+                        account_type=self.account_type),
+            ])
+
+    def test_ensure_groups_uses_one_query_per_level(self):
+        AccountClass.objects.create(number=4)
+        AccountGroup.objects.create(account_class_id=4, number=40)
+
+        # Lecture des groupes, des classes, deux insertions et relecture des groupes
+        with self.assertNumQueries(5):
+            groups = ensure_groups({40, 41, 52, 60})
+        self.assertEqual(sorted(groups), [40, 41, 52, 60])
+        self.assertEqual(groups[52].account_class_id, 5)
+        self.assertEqual(groups[60].name, AccountGroup.NOMS_GROUPES[60])
+        with self.assertNumQueries(1):
+            ensure_groups({40, 41})
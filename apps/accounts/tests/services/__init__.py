@@ -0,0 +1 @@
+# Ce fichier est requis pour que Python traite le répertoire comme un package
\ No newline at end of file
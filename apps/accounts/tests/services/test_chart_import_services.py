@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.chart_import_services import import_chart, read_chart_file
+
+
+class ChartImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        AccountType.objects.create(code=AccountType.PA)
+        AccountType.objects.create(code=AccountType.AC)
+        cls.suppliers = AccountGroup.objects.create(account_class=AccountClass.objects.create(number=4), number=40)
+        cls.account = Account.objects.create(
+            account_group=cls.suppliers, number="1100", name="Fournisseurs", account_type_id=AccountType.PA
+        )
+
+    def rows(self, *rows):
+        return enumerate(rows, start=2)
+
+    def test_creates_and_updates_accounts(self):
+        report = import_chart(self.rows(
+            {'full_number': '401100', 'name': "Fournisseurs locaux", 'account_type': 'PA'},
+            {'full_number': '521000', 'name': "Banque", 'account_type': 'ac'},
+            {'full_number': '411100', 'name': "Clients", 'account_type': 'AC', 'is_active': 'non'},
+        ))
+        self.assertEqual((report.created, report.updated, report.errors), (2, 1, []))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.name, "Fournisseurs locaux")
+        bank = Account.objects.select_related('account_group__account_class').get(full_number='521000')
+        self.assertEqual((bank.account_group.number, bank.number), (52, "1000"))
+        self.assertEqual(bank.account_group.account_class.name, AccountClass.NOMS_CLASSES[5])
+        self.assertFalse(Account.objects.get(full_number='411100').is_active)
+
+    def test_missing_type_defaults_to_group_rule(self):
+        report = import_chart(self.rows(
+            {'full_number': '401200', 'name': "Fournisseurs étrangers"},
+            {'full_number': '411200', 'name': "Clients export", 'account_type': ''},
+        ))
+        self.assertEqual(report.errors, [])
+        self.assertEqual(
+            dict(Account.objects.filter(full_number__in=['401200', '411200']).values_list('full_number', 'account_type')),
+            {'401200': AccountType.PA, '411200': AccountType.AC},
+        )
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        report = import_chart(self.rows(
+            {'full_number': '4011', 'name': "Valide", 'account_type': 'PA'},
+            {'full_number': '901000', 'name': "Classe 9", 'account_type': 'PA'},
+            {'full_number': '401234567', 'name': "Trop long", 'account_type': 'PA'},
+            {'full_number': '402000', 'name': "", 'account_type': 'PA'},
+            {'full_number': '403000', 'name': "Type", 'account_type': 'ZZ'},
+            {'full_number': '4011', 'name': "Doublon", 'account_type': 'PA'},
+        ))
+        self.assertEqual(report.created, 1)
+        self.assertEqual([error.line for error in report.errors], [3, 4, 5, 6, 7])
+        self.assertFalse(Account.objects.filter(full_number__in=['901000', '402000', '403000']).exists())
+
+    def test_json_rows_that_are_not_objects_are_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'plan.json')
+            with open(path, 'w', encoding='utf-8') as stream:
+                json.dump([{'full_number': '521000', 'name': "Banque", 'account_type': 'AC'}, "521100", None], stream)
+            report = import_chart(read_chart_file(path))
+        self.assertEqual(report.created, 1)
+        self.assertEqual([(error.line, error.full_number) for error in report.errors], [(2, ''), (3, '')])
+
+    def test_validation_and_upsert_use_constant_queries(self):
+        rows = [
+            {'full_number': f"40{i:04d}", 'name': f"Fournisseur {i}", 'account_type': 'PA'}
+            for i in range(2000, 2050)
+        ]
+        # Référentiels (3), savepoint, groupes, un INSERT ... ON CONFLICT par lot, release
+        with self.assertNumQueries(7):
+            report = import_chart(self.rows(*rows))
+        self.assertEqual(report.created, 50)
+
+    def test_command_reads_csv(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'plan.csv')
+            with open(path, 'w', encoding='utf-8') as stream:
+                stream.write("full_number;name;account_type\n521000;Banque;AC\n52;Trop court;AC\n")
+            out, err = StringIO(), StringIO()
+            call_command('import_chart', path, stdout=out, stderr=err)
+        self.assertIn("1 compte(s) créé(s)", out.getvalue())
+        self.assertIn("Ligne 3", err.getvalue())
+        self.assertTrue(Account.objects.filter(full_number='521000').exists())
@@ -0,0 +1,78 @@
+from django.test import TestCase
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.chart_services import get_chart_tree, invalidate_chart_tree
+
+
+class ChartTreeCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_class = AccountClass.objects.create(number=4)
+        cls.group = AccountGroup.objects.create(account_class=account_class, number=40)
+        cls.account_type = AccountType.objects.create(code=AccountType.PA)
+        cls.account = Account.objects.create(
+            account_group=cls.group,
+            number="1100",
+            name="Fournisseurs",
+            account_type=cls.account_type,
+        )
+
+    def setUp(self):
+        # L'arbre est conservé en mémoire : repartir d'une version propre à chaque test
+        invalidate_chart_tree()
+
+    def test_tree_contains_hierarchy(self):
+        tree = get_chart_tree()
+        self.assertEqual([c.number for c in tree.classes], [4])
+        group = tree.classes[0].groups[0]
+        self.assertEqual(group.full_number, "40")
+        self.assertEqual(group.accounts[0].full_number, "401100")
+        self.assertIs(tree.accounts_by_id[self.account.pk], group.accounts[0])
+        self.assertEqual([t.code for t in tree.types], [AccountType.PA])
+
+    def test_warm_tree_runs_no_query(self):
+        get_chart_tree()
+        with self.assertNumQueries(0):
+            get_chart_tree()
+
+    def test_save_and_delete_invalidate_tree(self):
+        get_chart_tree()
+        account = Account.objects.create(
+            account_group=self.group,
+            number="1200",
+            name="Fournisseurs effets à payer",
+            account_type=self.account_type,
+        )
+        self.assertIn(account.pk, get_chart_tree().accounts_by_id)
+
+        account.delete()
+        self.assertNotIn(account.pk, get_chart_tree().accounts_by_id)
+
+    def test_bulk_operations_invalidate_tree(self):
+        get_chart_tree()
+        Account.objects.filter(pk=self.account.pk).update(name="Fournisseurs locaux")
+        self.assertEqual(get_chart_tree().accounts_by_id[self.account.pk].name, "Fournisseurs locaux")
+
+        self.account.name = "Fournisseurs groupe"
+        Account.objects.bulk_update([self.account], ['name'])
+        self.assertEqual(get_chart_tree().accounts_by_id[self.account.pk].name, "Fournisseurs groupe")
+
+        (account,) = Account.objects.bulk_create([
+            Account(account_group=self.group, number="1300", name="Fournisseurs retenues",
+                    account_type=self.account_type),
+        ])
+        self.assertIn(account.pk, get_chart_tree().accounts_by_id)
+
+        AccountGroup.objects.filter(pk=self.group.pk).update(name="Fournisseurs et comptes rattachés")
+        self.assertEqual(get_chart_tree().classes[0].groups[0].name, "Fournisseurs et comptes rattachés")
+
+        AccountGroup.objects.bulk_create([AccountGroup(account_class_id=4, number=41)])
+        self.assertEqual([group.number for group in get_chart_tree().classes[0].groups], [40, 41])
+
+    def test_update_without_rows_keeps_tree(self):
+        get_chart_tree()
+        Account.objects.filter(pk=0).update(name="Aucun")
+        with self.assertNumQueries(0):
+            get_chart_tree()
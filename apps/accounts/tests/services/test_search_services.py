@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Company
+from core.utils import normalize_search, prefix_upper_bound
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.search_services import search_accounts
+
+
+class AccountSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.PA)
+        account_class = AccountClass.objects.create(number=4)
+        suppliers = AccountGroup.objects.create(account_class=account_class, number=40)
+        customers = AccountGroup.objects.create(account_class=account_class, number=41)
+        for group, number, name in (
+            (suppliers, "1100", "Fournisseurs dettes en compte"),
+            (suppliers, "1200", "Dettes fournisseurs étrangers"),
+            (suppliers, "9000", "Créances sur fournisseurs"),
+            (customers, "1100", "Clients"),
+        ):
+            Account.objects.create(account_group=group, number=number, name=name, account_type=account_type)
+
+    def numbers(self, result):
+        return [account['full_number'] for account in result.results]
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_normalize_search(self):
+        self.assertEqual(normalize_search("  Créances   ÉTRANGÈRES "), "creances etrangeres")
+        self.assertEqual(prefix_upper_bound("4019"), "402")
+        self.assertEqual(prefix_upper_bound("49"), "5")
+        self.assertIsNone(prefix_upper_bound("99"))
+
+    def test_search_name_is_maintained(self):
+        account = Account.objects.get(full_number="401200")
+        self.assertEqual(account.search_name, "dettes fournisseurs etrangers")
+        Account.objects.filter(pk=account.pk).update(name="Fournisseurs Étrangers")
+        account.refresh_from_db()
+        self.assertEqual(account.search_name, "fournisseurs etrangers")
+
+    def test_number_prefix(self):
+        self.assertEqual(self.numbers(search_accounts("40")), ["401100", "401200", "409000"])
+        self.assertEqual(self.numbers(search_accounts("4011")), ["401100"])
+
+    def test_name_search_is_accent_insensitive_and_ranked(self):
+        # Nom commençant par le terme, puis mot commençant par le terme (par ordre alphabétique)
+        self.assertEqual(self.numbers(search_accounts("FOURN")), ["401100", "409000", "401200"])
+        self.assertEqual(self.numbers(search_accounts("creances")), ["409000"])
+        self.assertEqual(self.numbers(search_accounts("40 etrang")), ["401200"])
+
+    def test_pagination(self):
+        first = search_accounts("4", page_size=3)
+        second = search_accounts("4", page=2, page_size=3)
+        self.assertTrue(first.has_next)
+        self.assertFalse(second.has_next)
+        self.assertEqual(self.numbers(first) + self.numbers(second), ["401100", "401200", "409000", "411100"])
+
+    def test_endpoint(self):
+        # Session, utilisateur et appartenance à la société, puis identifiants classés et comptes de la page
+        with self.assertNumQueries(5):
+            data = self.client.get(reverse('account_search'), {'q': 'clients'}).json()
+        self.assertEqual(data['results'][0]['full_number'], "411100")
+        self.assertEqual(data['results'][0]['url'], reverse('account_detail', args=[data['results'][0]['id']]))
+        self.assertFalse(data['has_next'])
@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from ..models.account_class import AccountClass
+from ..models.account_group import AccountGroup
+from ..models.account_type import AccountType
+from ..rules import (
+    CLASS_RULES, CREDIT, DEBIT, DUAL_POSITION_CLASSES, GROUP_RULES, class_rule, group_choices_for_class,
+    group_rule,
+)
+
+
+class OhadaRulesTest(SimpleTestCase):
+    def test_rules_are_indexed_by_number(self):
+        self.assertEqual([rule.number for rule in CLASS_RULES if rule], list(range(1, 9)))
+        self.assertEqual(len([rule for rule in GROUP_RULES if rule]), len(AccountGroup.NOMS_GROUPES))
+        self.assertEqual(class_rule(4).position, AccountClass.POSITIONS_CLASSES[4])
+        self.assertEqual(group_rule(52).name, AccountGroup.NOMS_GROUPES[52])
+        for number in (0, 9, -1, None, "4"):
+            self.assertIsNone(class_rule(number))
+        self.assertIsNone(group_rule(95))
+
+    def test_class_to_groups_index(self):
+        self.assertEqual(class_rule(5).groups, tuple(range(50, 60)))
+        self.assertEqual(group_choices_for_class(4)[1], ('41', "41 - Clients et comptes rattachés"))
+        self.assertEqual(group_choices_for_class(9), ())
+
+    def test_default_account_types_and_normal_balance(self):
+        self.assertEqual((group_rule(40).account_type, group_rule(40).normal_balance), (AccountType.PA, CREDIT))
+        self.assertEqual((group_rule(41).account_type, group_rule(41).normal_balance), (AccountType.AC, DEBIT))
+        self.assertEqual(group_rule(28).normal_balance, CREDIT)
+        self.assertEqual(group_rule(82).account_type, AccountType.PR)
+        self.assertEqual([rule.number for rule in DUAL_POSITION_CLASSES], [4, 5, 8])
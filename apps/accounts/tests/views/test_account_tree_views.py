@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Company
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...models.account_type import AccountType
+from ...models.account import Account
+from ...services.chart_services import invalidate_chart_tree
+
+
+class AccountTreeViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.PA)
+        account_class = AccountClass.objects.create(number=4)
+        cls.group = AccountGroup.objects.create(account_class=account_class, number=40)
+        AccountGroup.objects.create(account_class=account_class, number=41)
+        for i in range(5):
+            Account.objects.create(
+                account_group=cls.group, number=f"{i}000", name=f"Fournisseur {i}", account_type=account_type
+            )
+
+    def setUp(self):
+        # L'arbre est conservé en mémoire : repartir d'une version propre à chaque test
+        invalidate_chart_tree()
+
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_list_renders_classes_only(self):
+        response = self.client.get(reverse('account_list'))
+        self.assertContains(response, reverse('account_tree_groups', args=[4]))
+        self.assertNotContains(response, "401000")
+
+    def test_list_builds_tree_in_three_queries_when_cold(self):
+        # Session, utilisateur et appartenance, puis comptes, classes avec groupes et types
+        with self.assertNumQueries(6):
+            self.client.get(reverse('account_list'))
+
+    def test_list_and_groups_do_not_query_chart_when_warm(self):
+        self.client.get(reverse('account_list'))
+        # Seules la session, l'utilisateur et son appartenance à la société sont lus à chaque requête
+        with self.assertNumQueries(6):
+            self.client.get(reverse('account_list'))
+            response = self.client.get(reverse('account_tree_groups', args=[4]))
+        self.assertContains(response, reverse('account_tree_accounts', args=[self.group.pk]))
+        self.assertContains(response, "41 - ")
+
+    def test_groups_fragment_follows_chart_changes(self):
+        self.client.get(reverse('account_tree_groups', args=[4]))
+        AccountGroup.objects.filter(pk=self.group.pk).update(name="Fournisseurs et rattachés")
+        self.assertContains(
+            self.client.get(reverse('account_tree_groups', args=[4])), "40 - Fournisseurs et rattachés"
+        )
+        self.assertContains(self.client.get(reverse('account_tree_groups', args=[9])), "Aucun groupe")
+
+    def test_accounts_fragment_is_paginated_by_cursor(self):
+        url = reverse('account_tree_accounts', args=[self.group.pk])
+        with mock.patch('accounts.views.account_views.TREE_PAGE_SIZE', 2):
+            # Session, utilisateur et appartenance à la société, puis la page de comptes
+            with self.assertNumQueries(4):
+                first = self.client.get(url)
+            second = self.client.get(url, {'after': '401000'})
+            last = self.client.get(url, {'after': '403000'})
+
+        self.assertContains(first, "400000 - Fournisseur 0")
+        self.assertContains(first, f'data-url="{url}?after=401000"')
+        self.assertContains(second, "402000")
+        self.assertNotContains(second, "401000 ")
+        self.assertContains(last, "404000")
+        self.assertNotContains(last, "load-more")
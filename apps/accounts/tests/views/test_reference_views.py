@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from ...models.account_class import AccountClass
+from ...models.account_group import AccountGroup
+from ...services.reference_services import get_reference_bundle, get_reference_url
+
+
+class OhadaReferenceViewTest(TestCase):
+    def test_bundle_contains_reference_data(self):
+        with self.assertNumQueries(0):
+            data = self.client.get(reverse('ohada_reference')).json()
+        self.assertEqual(data['version'], get_reference_bundle().version)
+        self.assertEqual(data['classes']['4']['position'], "Passif")
+        self.assertEqual(data['groups']['52']['name'], AccountGroup.NOMS_GROUPES[52])
+        self.assertEqual(data['groups']['52']['class'], 5)
+
+    def test_versioned_url_is_cached_long_term(self):
+        response = self.client.get(get_reference_url())
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        response = self.client.get(reverse('ohada_reference'))
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_etag_revalidation(self):
+        etag = self.client.get(reverse('ohada_reference'))['ETag']
+        response = self.client.get(reverse('ohada_reference'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_admin_lookups_do_not_query_classes(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        url = reverse('admin:get_group_options', args=[4])
+        # Session et utilisateur uniquement
+        with self.assertNumQueries(2):
+            options = self.client.get(url).json()['options']
+        self.assertEqual(options[0], {'value': '40', 'label': f"40 - {AccountGroup.NOMS_GROUPES[40]}"})
+        self.assertEqual(
+            self.client.get(reverse('admin:get_class_info', args=[6])).json()['name'],
+            AccountClass.NOMS_CLASSES[6],
+        )
+
+    def test_admin_forms_load_bundle(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        for name in ('admin:accounts_accountgroup_add', 'admin:accounts_accountclass_add'):
+            self.assertContains(self.client.get(reverse(name)), get_reference_url().replace('&', '&amp;'))
@@ -1,10 +1,18 @@
 # Simplifiez pour commencer
 from django.urls import path
-from ..views.account_views import account_list, account_create, account_detail, account_update
+from ..views.account_views import (
+    account_list, account_create, account_detail, account_update, account_search,
+    account_tree_groups, account_tree_accounts,
+)
+from ..views.reference_views import ohada_reference
 
 urlpatterns = [
     path('', account_list, name='account_list'),
     path('create/', account_create, name='account_create'),
     path('<int:pk>/', account_detail, name='account_detail'),
     path('<int:pk>/update/', account_update, name='account_update'),
+    path('search/', account_search, name='account_search'),
+    path('tree/classes/<int:class_number>/groups/', account_tree_groups, name='account_tree_groups'),
+    path('tree/groups/<int:group_id>/accounts/', account_tree_accounts, name='account_tree_accounts'),
+    path('reference.json', ohada_reference, name='ohada_reference'),
 ]
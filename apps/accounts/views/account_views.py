@@ -1,31 +1,84 @@
-from django.views.generic import ListView, DetailView, CreateView, UpdateView
-from django.urls import reverse_lazy
-from ..models.account_class import AccountClass
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views import View
+from django.views.generic import DetailView, CreateView, TemplateView, UpdateView
+from django.urls import reverse, reverse_lazy
 from ..models.account import Account
 from ..forms.account_forms import AccountForm
+from ..services.chart_services import get_chart_tree
+from ..services.search_services import search_accounts
 
-class AccountListView(ListView):
-    model = Account
+# Comptes affichés par page dans l'arbre du plan comptable
+TREE_PAGE_SIZE = 100
+
+class AccountListView(LoginRequiredMixin, TemplateView):
+    """
+    Plan comptable : seules les classes sont rendues, les groupes et les comptes
+    sont chargés à la demande (voir AccountTreeGroupsView et AccountTreeAccountsView).
+    Les classes sont lues dans l'arbre en mémoire : aucune requête s'il est à jour.
+    """
     template_name = 'accounts/account_list.html'
-    context_object_name = 'accounts'
-    
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['account_classes'] = AccountClass.objects.prefetch_related(
-            'groups', 'groups__accounts'
-        ).all()
+        context['account_classes'] = get_chart_tree().classes
         return context
 
 account_list = AccountListView.as_view()
 
-class AccountDetailView(DetailView):
+class AccountTreeGroupsView(LoginRequiredMixin, TemplateView):
+    """Fragment HTML : groupes d'une classe, lus dans l'arbre en mémoire"""
+    template_name = 'accounts/_tree_groups.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['groups'] = next(
+            (
+                account_class.groups for account_class in get_chart_tree().classes
+                if account_class.number == self.kwargs['class_number']
+            ),
+            (),
+        )
+        return context
+
+account_tree_groups = AccountTreeGroupsView.as_view()
+
+class AccountTreeAccountsView(LoginRequiredMixin, TemplateView):
+    """
+    Fragment HTML : comptes d'un groupe, par pages de TREE_PAGE_SIZE.
+    La page suivante reprend après le dernier numéro affiché (?after=401100) :
+    pas d'OFFSET, chaque page est une lecture d'intervalle sur l'index.
+    """
+    template_name = 'accounts/_tree_accounts.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        accounts = Account.objects.filter(account_group_id=self.kwargs['group_id'])
+        after = self.request.GET.get('after')
+        if after:
+            accounts = accounts.filter(full_number__gt=after)
+        rows = list(accounts.order_by('full_number').values(
+            'id', 'full_number', 'name', 'is_active'
+        )[:TREE_PAGE_SIZE + 1])
+        context['accounts'] = rows[:TREE_PAGE_SIZE]
+        context['first_page'] = not after
+        if len(rows) > TREE_PAGE_SIZE:
+            context['next_url'] = (
+                f"{reverse('account_tree_accounts', args=[self.kwargs['group_id']])}"
+                f"?after={rows[TREE_PAGE_SIZE - 1]['full_number']}"
+            )
+        return context
+
+account_tree_accounts = AccountTreeAccountsView.as_view()
+
+class AccountDetailView(LoginRequiredMixin, DetailView):
     model = Account
     template_name = 'accounts/account_detail.html'
     context_object_name = 'account'
 
 account_detail = AccountDetailView.as_view()
 
-class AccountCreateView(CreateView):
+class AccountCreateView(LoginRequiredMixin, CreateView):
     model = Account
     form_class = AccountForm
     template_name = 'accounts/account_form.html'
@@ -33,10 +86,31 @@ class AccountCreateView(CreateView):
 
 account_create = AccountCreateView.as_view()
 
-class AccountUpdateView(UpdateView):
+class AccountUpdateView(LoginRequiredMixin, UpdateView):
     model = Account
     form_class = AccountForm
     template_name = 'accounts/account_form.html'
     success_url = reverse_lazy('account_list')
 
 account_update = AccountUpdateView.as_view()
+
+class AccountSearchView(LoginRequiredMixin, View):
+    """Recherche de comptes (JSON) : ?q=<numéro ou nom>&page=<n>"""
+
+    def get(self, request):
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 1
+        result = search_accounts(request.GET.get('q', ''), page=page)
+        return JsonResponse({
+            'query': result.query,
+            'page': result.page,
+            'has_next': result.has_next,
+            'results': [
+                {**account, 'url': reverse('account_detail', args=[account['id']])}
+                for account in result.results
+            ],
+        })
+
+account_search = AccountSearchView.as_view()
@@ -0,0 +1,24 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views import View
+from ..services.reference_services import get_reference_bundle
+
+# Durée de cache d'une URL versionnée (un an)
+VERSIONED_MAX_AGE = 365 * 24 * 60 * 60
+
+class OhadaReferenceView(View):
+    """Paquet JSON du référentiel OHADA (classes et groupes), servi avec ETag"""
+
+    def get(self, request):
+        bundle = get_reference_bundle()
+        response = HttpResponse(bundle.content, content_type='application/json; charset=utf-8')
+        response['ETag'] = quote_etag(bundle.version)
+        if request.GET.get('v') == bundle.version:
+            # Le contenu d'une version ne change jamais
+            patch_cache_control(response, public=True, max_age=VERSIONED_MAX_AGE, immutable=True)
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return get_conditional_response(request, etag=response['ETag'], response=response)
+
+ohada_reference = OhadaReferenceView.as_view()
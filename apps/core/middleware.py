@@ -0,0 +1,156 @@
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+
+from .profiling import QueryRecorder, RequestProfile, get_sql_budget, record_profile
+from .routers import PIN_COOKIE_NAME, has_written, primary_pinning
+from .tenancy import SESSION_KEY, activate, deactivate, get_user_company_id
+
+
+class AsyncCapableMiddleware:
+    """
+    Intergiciel utilisable en WSGI comme en ASGI : sous ASGI, les vues asynchrones
+    sont appelées sans passer par un thread (voir reporting.views.job_views).
+    Les sous-classes redéfinissent process() (WSGI) et __acall__() (ASGI).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process(request)
+
+    async def __acall__(self, request):
+        """Traitement sous ASGI ; par défaut, transmet la requête"""
+        return await self.get_response(request)
+
+    def process(self, request):
+        """Traitement sous WSGI ; par défaut, transmet la requête"""
+        return self.get_response(request)
+
+
+class TenantMiddleware(AsyncCapableMiddleware):
+    """
+    Lie à chaque requête la société de l'utilisateur connecté : celle choisie en
+    session (voir tenancy.select_company) s'il en est membre, sinon la société par
+    défaut ou sa première société ; refuse la requête s'il n'est membre d'aucune.
+    Sans utilisateur connecté, aucune société n'est liée (request.company_id est
+    None) : les vues qui lisent des données d'une société exigent une connexion.
+    Doit suivre AuthenticationMiddleware.
+    """
+
+    def process(self, request):
+        request.company_id = self.get_company_id(request.user, request.session.get(SESSION_KEY))
+        token = activate(request.company_id)
+        try:
+            return self.get_response(request)
+        finally:
+            deactivate(token)
+
+    async def __acall__(self, request):
+        user = await request.auser()
+        requested_id = await request.session.aget(SESSION_KEY)
+        request.company_id = await sync_to_async(self.get_company_id)(user, requested_id)
+        token = activate(request.company_id)
+        try:
+            return await self.get_response(request)
+        finally:
+            deactivate(token)
+
+    def get_company_id(self, user, requested_id):
+        if not user.is_authenticated:
+            return None
+        company_id = get_user_company_id(user, requested_id)
+        if company_id is None:
+            raise PermissionDenied("Vous n'êtes membre d'aucune société.")
+        return company_id
+
+
+class PrimaryPinningMiddleware(AsyncCapableMiddleware):
+    """
+    Lecture de ses propres écritures : une requête qui a écrit épingle le client
+    sur la base principale pendant REPORTING_PIN_SECONDS (voir core.routers).
+    """
+
+    def process(self, request):
+        with primary_pinning(PIN_COOKIE_NAME in request.COOKIES):
+            response = self.get_response(request)
+            self.pin_client(response)
+        return response
+
+    async def __acall__(self, request):
+        with primary_pinning(PIN_COOKIE_NAME in request.COOKIES):
+            response = await self.get_response(request)
+            self.pin_client(response)
+        return response
+
+    def pin_client(self, response):
+        if has_written():
+            response.set_cookie(
+                PIN_COOKIE_NAME, '1', max_age=settings.REPORTING_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+
+
+class ProfilingMiddleware(AsyncCapableMiddleware):
+    """
+    Profile une fraction des requêtes (settings.PROFILING_SAMPLE_RATE) : requêtes
+    SQL, doublons et temps de réponse, renvoyés dans l'en-tête Server-Timing,
+    journalisés (logger core.profiling) et cumulés par nom d'URL (voir core.profiling).
+    À placer en tête de MIDDLEWARE pour mesurer toute la réponse.
+    """
+    logger = logging.getLogger('core.profiling')
+
+    def process(self, request):
+        if not self.sampled():
+            return self.get_response(request)
+        start = time.perf_counter()
+        with QueryRecorder().record() as recorder:
+            response = self.get_response(request)
+        self.report(request, response, recorder, start)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        start = time.perf_counter()
+        with QueryRecorder().record() as recorder:
+            response = await self.get_response(request)
+        self.report(request, response, recorder, start)
+        return response
+
+    def sampled(self):
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+    def report(self, request, response, recorder, start):
+        match = request.resolver_match
+        profile = RequestProfile(
+            url_name=(match.view_name if match else None) or '<non résolue>',
+            duration=(time.perf_counter() - start) * 1000,
+            query_count=recorder.count,
+            query_duration=recorder.duration,
+            duplicate_count=recorder.duplicate_count,
+        )
+        record_profile(profile)
+        response['Server-Timing'] = profile.server_timing()
+        budget = get_sql_budget(profile.url_name)
+        over_budget = budget is not None and profile.query_count > budget
+        self.logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            "%s %s -> %s : %d requêtes SQL (%.1f ms, %d doublons), %.1f ms",
+            request.method, profile.url_name, response.status_code,
+            profile.query_count, profile.query_duration, profile.duplicate_count, profile.duration,
+            extra={**profile._asdict(), 'method': request.method, 'status': response.status_code,
+                   'sql_budget': budget},
+        )
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_default_company(apps, schema_editor):
+    # Les données existantes (et celles créées hors requête) sont rattachées à cette société
+    Company = apps.get_model('core', 'Company')
+    Company.objects.get_or_create(
+        pk=settings.DEFAULT_COMPANY_ID,
+        defaults={'name': "Société par défaut", 'slug': 'defaut'},
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150, verbose_name='Raison sociale')),
+                ('slug', models.SlugField(unique=True, verbose_name='Identifiant')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Société',
+                'verbose_name_plural': 'Sociétés',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RunPython(create_default_company, migrations.RunPython.noop),
+    ]
@@ -1 +1,70 @@
- 
+from django.conf import settings
+from django.db import models
+
+from .tenancy import get_company_id, get_current_company_id
+
+
+class CompanyManager(models.Manager):
+
+    def get_default(self):
+        """Société à laquelle sont rattachées les données hors contexte de requête"""
+        return self.get(pk=settings.DEFAULT_COMPANY_ID)
+
+    def for_user(self, user):
+        """Sociétés actives accessibles à un utilisateur : celles dont il est membre, toutes pour un superutilisateur"""
+        queryset = self.filter(is_active=True)
+        return queryset if user.is_superuser else queryset.filter(members=user)
+
+
+class Company(models.Model):
+    """
+    Société (tenant) : le plan de comptes et toutes les données comptables
+    sont partitionnés par société. Les classes et groupes OHADA sont communs.
+    """
+    name = models.CharField(max_length=150, verbose_name="Raison sociale")
+    slug = models.SlugField(max_length=50, unique=True, verbose_name="Identifiant")
+    is_active = models.BooleanField(default=True, verbose_name="Active")
+    members = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, blank=True, related_name='companies', verbose_name="Membres"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CompanyManager()
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Société"
+        verbose_name_plural = "Sociétés"
+
+    def __str__(self):
+        return self.name
+
+
+class TenantManager(models.Manager):
+    """Gestionnaire limité à la société courante lorsqu'une société est liée au contexte"""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        company_id = get_current_company_id()
+        return queryset if company_id is None else queryset.filter(company_id=company_id)
+
+
+class TenantModel(models.Model):
+    """
+    Modèle partitionné par société. Les index et contraintes des modèles
+    dérivés commencent par company : les requêtes d'une société ne lisent
+    que sa partie de l'index.
+    """
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.PROTECT,
+        default=get_company_id,
+        editable=False,
+        related_name='+',
+        verbose_name="Société"
+    )
+
+    objects = TenantManager()
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,144 @@
+"""
+Profilage des requêtes HTTP (voir core.middleware.ProfilingMiddleware).
+
+Pour une requête échantillonnée (settings.PROFILING_SAMPLE_RATE), on mesure
+le nombre de requêtes SQL, leur durée totale, les requêtes répétées à
+l'identique (symptôme d'un N+1) et le temps de réponse. Les mesures sont
+ajoutées à un historique glissant par nom d'URL (les PROFILING_WINDOW
+dernières requêtes), lu par la vue des statistiques réservée au personnel.
+
+Une requête non échantillonnée ne coûte qu'un tirage aléatoire : l'intergiciel
+peut rester actif en production avec un taux faible.
+"""
+import bisect
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connections
+
+# Bornes supérieures (ms) des tranches de l'histogramme des temps de réponse
+DURATION_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class RequestProfile(NamedTuple):
+    url_name: str
+    duration: float
+    query_count: int
+    query_duration: float
+    duplicate_count: int
+
+    def server_timing(self):
+        """Valeur de l'en-tête Server-Timing (durées en ms)"""
+        return (
+            f'sql;dur={self.query_duration:.1f}, queries;desc="{self.query_count}", '
+            f'duplicates;desc="{self.duplicate_count}", total;dur={self.duration:.1f}'
+        )
+
+
+class QueryRecorder:
+    """Enveloppe d'exécution SQL (connection.execute_wrapper) qui compte et chronomètre les requêtes"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += (time.perf_counter() - start) * 1000
+            self.count += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicate_count(self):
+        """Exécutions d'une requête SQL déjà exécutée pendant la requête HTTP"""
+        return self.count - len(self.statements)
+
+    @contextmanager
+    def record(self):
+        """Enregistre les requêtes de toutes les bases pendant le bloc"""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+
+class RollingStats:
+    """Historique glissant des profils d'une URL"""
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.total = 0
+
+    def add(self, profile):
+        self.samples.append(profile)
+        self.total += 1
+
+    def summary(self):
+        samples = list(self.samples)
+        durations = sorted(sample.duration for sample in samples)
+        buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        for duration in durations:
+            buckets[bisect.bisect_left(DURATION_BUCKETS, duration)] += 1
+        return {
+            'requests': self.total,
+            'window': len(samples),
+            'duration_ms': {
+                'p50': _percentile(durations, 50),
+                'p95': _percentile(durations, 95),
+                'max': round(durations[-1], 1),
+            },
+            'queries': {
+                'mean': round(sum(sample.query_count for sample in samples) / len(samples), 1),
+                'max': max(sample.query_count for sample in samples),
+                'duration_ms_mean': round(sum(sample.query_duration for sample in samples) / len(samples), 1),
+                'duplicates_max': max(sample.duplicate_count for sample in samples),
+            },
+            'histogram': {
+                **{f'<={bound}ms': count for bound, count in zip(DURATION_BUCKETS, buckets)},
+                f'>{DURATION_BUCKETS[-1]}ms': buckets[-1],
+            },
+        }
+
+
+_lock = threading.Lock()
+_stats = {}
+
+
+def record_profile(profile):
+    """Ajoute le profil d'une requête à l'historique de son URL"""
+    with _lock:
+        stats = _stats.get(profile.url_name)
+        if stats is None:
+            stats = _stats[profile.url_name] = RollingStats(settings.PROFILING_WINDOW)
+        stats.add(profile)
+
+
+def get_stats():
+    """Statistiques par nom d'URL, de la plus lente (p95) à la plus rapide"""
+    with _lock:
+        summaries = {url_name: stats.summary() for url_name, stats in _stats.items()}
+    return dict(sorted(summaries.items(), key=lambda item: -item[1]['duration_ms']['p95']))
+
+
+def reset_stats():
+    """Vide l'historique (tests)"""
+    with _lock:
+        _stats.clear()
+
+
+def get_sql_budget(url_name):
+    """Nombre maximal de requêtes SQL attendu pour une URL, ou None"""
+    return settings.PROFILING_SQL_BUDGETS.get(url_name)
+
+
+def _percentile(values, percent):
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return round(values[index], 1)
@@ -0,0 +1,79 @@
+"""
+Routage des lectures des rapports vers une réplique.
+
+Les lectures faites dans un bloc (ou une fonction décorée) reporting_reads()
+vont à l'alias settings.REPORTING_DATABASE_ALIAS lorsqu'il est configuré
+(voir settings/production.py) ; tout le reste, et toutes les écritures, vont à
+la base principale.
+
+Lecture de ses propres écritures : toute écriture épingle le contexte courant
+(la requête) sur la base principale, et PrimaryPinningMiddleware prolonge
+l'épinglage aux requêtes suivantes du même client pendant
+settings.REPORTING_PIN_SECONDS, le temps que la réplique rattrape son retard.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+PIN_COOKIE_NAME = 'pin_primary'
+
+_reporting_reads = ContextVar('reporting_reads', default=False)
+_primary_pinned = ContextVar('primary_pinned', default=False)
+_primary_written = ContextVar('primary_written', default=False)
+
+
+@contextmanager
+def reporting_reads():
+    """Envoie à la réplique des rapports les lectures faites dans le bloc"""
+    token = _reporting_reads.set(True)
+    try:
+        yield
+    finally:
+        _reporting_reads.reset(token)
+
+
+@contextmanager
+def primary_pinning(pinned=False):
+    """Délimite la portée de l'épinglage sur la base principale (une requête, une tâche)"""
+    pinned_token = _primary_pinned.set(pinned)
+    written_token = _primary_written.set(False)
+    try:
+        yield
+    finally:
+        _primary_written.reset(written_token)
+        _primary_pinned.reset(pinned_token)
+
+
+def pin_primary():
+    """Signale une écriture : le contexte courant lit désormais la base principale"""
+    _primary_pinned.set(True)
+    _primary_written.set(True)
+
+
+def is_primary_pinned():
+    return _primary_pinned.get()
+
+
+def has_written():
+    """Indique si le contexte courant a écrit depuis le début de sa portée d'épinglage"""
+    return _primary_written.get()
+
+
+class ReportingRouter:
+
+    def db_for_read(self, model, **hints):
+        alias = settings.REPORTING_DATABASE_ALIAS
+        if _reporting_reads.get() and not _primary_pinned.get() and alias in connections:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Les lectures suivantes du contexte doivent voir cette écriture
+        pin_primary()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplique contient les mêmes données que la base principale
+        return True
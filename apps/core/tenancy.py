@@ -0,0 +1,86 @@
+"""
+Société (tenant) courante.
+
+La société de la requête est liée au contexte d'exécution par TenantMiddleware :
+pour un utilisateur connecté, la société choisie en session parmi celles dont il
+est membre (Company.members), sinon la société par défaut ou sa première société
+(sans utilisateur connecté, aucune : les vues des données comptables exigent une
+connexion) ;
+les gestionnaires des modèles partitionnés (TenantModel) filtrent alors sur elle
+et les nouvelles instances lui sont rattachées. Hors requête (commandes, tests),
+aucune société n'est liée : les gestionnaires ne filtrent pas et les écritures
+vont à la société par défaut (settings.DEFAULT_COMPANY_ID).
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+
+SESSION_KEY = 'company_id'
+
+_current_company_id = ContextVar('current_company_id', default=None)
+
+
+def get_current_company_id():
+    """Id de la société liée au contexte, ou None"""
+    return _current_company_id.get()
+
+
+def get_company_id(company=None):
+    """Id de la société donnée (instance ou id), sinon de la société courante, sinon par défaut"""
+    if company is not None:
+        return getattr(company, 'pk', company)
+    company_id = _current_company_id.get()
+    return settings.DEFAULT_COMPANY_ID if company_id is None else company_id
+
+
+def activate(company):
+    """Lie une société au contexte ; retourne le jeton à passer à deactivate()"""
+    return _current_company_id.set(None if company is None else get_company_id(company))
+
+
+def deactivate(token):
+    _current_company_id.reset(token)
+
+
+@contextmanager
+def use_company(company):
+    """Exécute un bloc pour le compte d'une société (ex: commande, tâche de fond)"""
+    token = activate(company)
+    try:
+        yield
+    finally:
+        deactivate(token)
+
+
+def get_user_company_id(user, requested_id=None):
+    """
+    Id de la société à lier pour un utilisateur connecté : requested_id (choix
+    mémorisé en session) s'il y a accès, sinon la société par défaut, sinon la
+    première de ses sociétés. None s'il n'est membre d'aucune société.
+    """
+    from .models import Company
+
+    if user.is_superuser and requested_id is None:
+        # Accès à toutes les sociétés : la société par défaut, sans requête
+        return settings.DEFAULT_COMPANY_ID
+    companies = Company.objects.for_user(user).order_by('pk').values_list('pk', flat=True)
+    preferred = [pk for pk in (requested_id, settings.DEFAULT_COMPANY_ID) if pk is not None]
+    allowed = set(companies.filter(pk__in=preferred))
+    for pk in preferred:
+        if pk in allowed:
+            return pk
+    return companies.first()
+
+
+def select_company(request, company):
+    """
+    Mémorise en session la société choisie par l'utilisateur connecté ;
+    PermissionDenied s'il n'en est pas membre.
+    """
+    from .models import Company
+
+    if not Company.objects.for_user(request.user).filter(pk=company.pk).exists():
+        raise PermissionDenied("Vous n'avez pas accès à cette société.")
+    request.session[SESSION_KEY] = company.pk
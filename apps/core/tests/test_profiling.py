@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from accounts.services.chart_services import invalidate_chart_tree
+from ..models import Company
+from ..profiling import get_stats, reset_stats
+
+
+@override_settings(PROFILING_SAMPLE_RATE=1)
+class ProfilingMiddlewareTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        group = AccountGroup.objects.create(account_class=AccountClass.objects.create(number=4), number=40)
+        Account.objects.create(
+            account_group=group, number="1100", name="Fournisseurs",
+            account_type=AccountType.objects.create(code=AccountType.PA),
+        )
+        cls.staff = get_user_model().objects.create_user('controle', password='secret', is_staff=True)
+        Company.objects.get_default().members.add(cls.staff)
+
+    def setUp(self):
+        reset_stats()
+        # Arbre du plan à reconstruire : la liste des comptes exécute des requêtes
+        invalidate_chart_tree()
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_profiled_request_reports_server_timing_and_stats(self):
+        with self.assertLogs('core.profiling', 'INFO') as logs:
+            response = self.client.get(reverse('account_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'^sql;dur=[\d.]+, queries;desc="\d+", ')
+        self.assertEqual(logs.records[0].url_name, 'account_list')
+
+        stats = get_stats()['account_list']
+        self.assertEqual(stats['requests'], 1)
+        self.assertGreater(stats['queries']['max'], 0)
+        self.assertEqual(sum(stats['histogram'].values()), 1)
+
+    @override_settings(PROFILING_SQL_BUDGETS={'account_list': 0})
+    def test_request_over_sql_budget_is_logged_as_warning(self):
+        with self.assertLogs('core.profiling', 'WARNING'):
+            self.client.get(reverse('account_list'))
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_unsampled_request_is_not_profiled(self):
+        response = self.client.get(reverse('account_list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(get_stats(), {})
+
+    def test_stats_endpoint_is_reserved_to_staff(self):
+        self.client.get(reverse('account_list'))
+        self.assertEqual(self.client.get(reverse('profiling_stats')).status_code, 302)
+
+        self.client.force_login(self.staff)
+        payload = self.client.get(reverse('profiling_stats')).json()
+        self.assertEqual(payload['urls']['account_list']['sql_budget'], 10)
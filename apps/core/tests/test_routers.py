@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from reporting.services.report_services import trial_balance
+from transactions.services.transaction_services import post_entries
+from ..models import Company
+from ..routers import PIN_COOKIE_NAME, is_primary_pinned, primary_pinning
+
+REPLICA = settings.REPORTING_DATABASE_ALIAS
+HAS_REPLICA = REPLICA in settings.DATABASES
+
+
+@skipUnless(HAS_REPLICA, "alias de réplique absent : lancer les tests avec compta_project.settings.test")
+@override_settings(DATABASE_ROUTERS=['core.routers.ReportingRouter'])
+class ReportingRouterTest(TestCase):
+    """
+    Deux bases SQLite : la base principale et une « réplique » migrée mais jamais
+    alimentée, qui simule une réplique en retard. Un rapport lu sur la réplique
+    est donc vide, un rapport lu sur la base principale ne l'est pas.
+    """
+    databases = {'default', REPLICA} if HAS_REPLICA else {'default'}
+
+    @classmethod
+    def setUpTestData(cls):
+        with primary_pinning():
+            account_type = AccountType.objects.create(code=AccountType.AC)
+            cls.bank = AccountGroup.objects.create(account_class=AccountClass.objects.create(number=5), number=52)
+            cls.cash = AccountGroup.objects.create(account_class_id=5, number=57)
+            Account.objects.create(account_group=cls.bank, number="1000", name="Banque", account_type=account_type)
+            Account.objects.create(account_group=cls.cash, number="1000", name="Caisse", account_type=account_type)
+            post_entries([{
+                'date': date(2025, 3, 10),
+                'label': "Retrait",
+                'lines': [
+                    {'account': '571000', 'debit': '50.00'},
+                    {'account': '521000', 'credit': '50.00'},
+                ],
+            }])
+
+    def balance(self):
+        return trial_balance(date(2025, 1, 1), date(2025, 12, 31)).total_debit
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_reports_read_replica_until_context_writes(self):
+        with primary_pinning():
+            self.assertEqual(self.balance(), Decimal('0.00'))
+            # Les lectures hors rapports restent sur la base principale
+            self.assertEqual(Account.objects.count(), 2)
+
+            AccountType.objects.create(code=AccountType.PA)
+            self.assertTrue(is_primary_pinned())
+            self.assertEqual(self.balance(), Decimal('50.00'))
+
+    def test_client_is_pinned_after_a_write(self):
+        url = f"{reverse('trial_balance')}?date_from=2025-01-01&date_to=2025-12-31"
+        self.assertContains(self.client.get(url), "Aucun mouvement")
+        self.assertNotIn(PIN_COOKIE_NAME, self.client.cookies)
+
+        response = self.client.post(reverse('account_create'), {
+            'account_group': self.bank.pk,
+            'number': "2000",
+            'name': "Banque 2",
+            'account_type': AccountType.AC,
+            'is_active': 'on',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+        response = self.client.get(url)
+        self.assertContains(response, "571000")
+        # Une lecture n'allonge pas l'épinglage
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
@@ -0,0 +1,141 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from reporting.services.report_services import trial_balance
+from transactions.models.account_balance import AccountBalance
+from transactions.models.fiscal_period import FiscalPeriod
+from transactions.services.transaction_services import post_entries
+from ..models import Company
+from ..tenancy import SESSION_KEY, use_company
+
+
+class TenancyTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.default = Company.objects.get_default()
+        cls.other = Company.objects.create(name="Filiale", slug='filiale')
+        account_type = AccountType.objects.create(code=AccountType.PA)
+        cls.suppliers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=40
+        )
+        cls.banks = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=5), number=52
+        )
+        for company in (cls.default, cls.other):
+            with use_company(company):
+                Account.objects.create(
+                    account_group=cls.suppliers, number="1100", name=f"Fournisseurs {company.slug}",
+                    account_type=account_type,
+                )
+                Account.objects.create(
+                    account_group=cls.banks, number="1000", name="Banque", account_type=account_type
+                )
+
+    def entry(self, amount):
+        return {
+            'date': date(2025, 3, 10),
+            'label': "Règlement",
+            'lines': [
+                {'account': '401100', 'debit': amount},
+                {'account': '521000', 'credit': amount},
+            ],
+        }
+
+    def test_same_number_in_each_company(self):
+        self.assertEqual(Account.objects.filter(full_number='401100').count(), 2)
+        with self.assertRaises(IntegrityError):
+            Account.objects.create(
+                company=self.other, account_group=self.suppliers, number="1100", name="Doublon",
+                account_type_id=AccountType.PA,
+            )
+
+    def test_manager_is_scoped_to_current_company(self):
+        with use_company(self.other):
+            self.assertEqual(
+                list(Account.objects.values_list('name', flat=True)), ["Fournisseurs filiale", "Banque"]
+            )
+            self.assertEqual(Account.objects.get(full_number='401100').company_id, self.other.pk)
+        self.assertEqual(Account.objects.count(), 4)
+
+    def test_ledger_data_is_partitioned(self):
+        post_entries([self.entry('100')])
+        post_entries([self.entry('30')], company=self.other)
+
+        self.assertEqual(FiscalPeriod.objects.filter(start_date=date(2025, 3, 1)).count(), 2)
+        with use_company(self.other):
+            self.assertEqual(AccountBalance.objects.get(account__full_number='401100').debit, Decimal('30.00'))
+        self.assertEqual(trial_balance(date(2025, 1, 1), date(2025, 12, 31)).total_debit, Decimal('100.00'))
+        self.assertEqual(
+            trial_balance(date(2025, 1, 1), date(2025, 12, 31), company=self.other).total_debit,
+            Decimal('30.00'),
+        )
+
+    def search_names(self):
+        response = self.client.get(reverse('account_search'), {'q': "fournisseurs"})
+        return [row['name'] for row in response.json()['results']]
+
+    def test_middleware_binds_selected_company_of_member(self):
+        user = get_user_model().objects.create_user('comptable')
+        self.other.members.add(user)
+        self.client.force_login(user)
+        # Membre de la seule filiale : elle est liée sans choix
+        self.assertEqual(self.search_names(), ["Fournisseurs filiale"])
+
+        self.default.members.add(user)
+        self.assertEqual(self.search_names(), ["Fournisseurs defaut"])
+        response = self.client.post(reverse('company_select'), {'company': self.other.pk, 'next': '/'})
+        self.assertRedirects(response, '/', fetch_redirect_response=False)
+        self.assertEqual(self.search_names(), ["Fournisseurs filiale"])
+        self.assertEqual(
+            [company['slug'] for company in self.client.get(reverse('company_select')).json()['companies']],
+            ['filiale', 'defaut'],
+        )
+
+    def test_cross_tenant_access_is_refused(self):
+        user = get_user_model().objects.create_user('comptable')
+        self.default.members.add(user)
+        self.client.force_login(user)
+
+        response = self.client.post(reverse('company_select'), {'company': self.other.pk})
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn(SESSION_KEY, self.client.session)
+
+        # Une société forgée en session est ignorée
+        session = self.client.session
+        session[SESSION_KEY] = self.other.pk
+        session.save()
+        self.assertEqual(self.search_names(), ["Fournisseurs defaut"])
+
+        # Sans utilisateur connecté, aucune donnée d'une société n'est servie
+        self.client.logout()
+        session = self.client.session
+        session[SESSION_KEY] = self.other.pk
+        session.save()
+        for url in (reverse('account_search'), reverse('account_list'), reverse('ledger_export'),
+                    reverse('account_balances'), reverse('report_job_status', args=[1])):
+            self.assertRedirects(
+                self.client.get(url), f"{reverse('login')}?next={url}", fetch_redirect_response=False
+            )
+
+    def test_user_without_company_is_refused(self):
+        self.client.force_login(get_user_model().objects.create_user('visiteur'))
+        self.assertEqual(self.client.get(reverse('account_search'), {'q': "fournisseurs"}).status_code, 403)
+
+    async def test_middleware_checks_membership_under_asgi(self):
+        user = await get_user_model().objects.acreate(username='comptable')
+        await self.default.members.aadd(user)
+        await self.async_client.aforce_login(user)
+        session = await self.async_client.asession()
+        await session.aset(SESSION_KEY, self.other.pk)
+        await session.asave()
+        response = await self.async_client.get(reverse('account_search'), {'q': "fournisseurs"})
+        self.assertEqual([row['name'] for row in response.json()['results']], ["Fournisseurs defaut"])
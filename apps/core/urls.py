@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import profiling_stats
+
+urlpatterns = [
+    path('statistiques/', profiling_stats, name='profiling_stats'),
+]
@@ -1 +1,26 @@
- 
+import re
+import unicodedata
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_search(text):
+    """
+    Normalise un texte pour la recherche : sans accents, en minuscules,
+    espaces multiples réduits (ex: "  Crédit-Bail " -> "credit-bail").
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    without_accents = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES.sub(' ', without_accents.casefold()).strip()
+
+
+def prefix_upper_bound(prefix):
+    """
+    Borne supérieure exclue des chaînes de chiffres commençant par prefix
+    (ex: "4019" -> "402", "49" -> "5"), ou None s'il n'y en a pas ("99").
+    Permet une recherche par préfixe en intervalle, servie par un index B-tree.
+    """
+    digits = prefix.rstrip('9')
+    if not digits:
+        return None
+    return digits[:-1] + str(int(digits[-1]) + 1)
@@ -1 +1,55 @@
- 
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import redirect
+from django.utils.decorators import method_decorator
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views import View
+
+from .models import Company
+from .profiling import get_sql_budget, get_stats
+from .tenancy import select_company
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class ProfilingStatsView(View):
+    """Statistiques de profilage par nom d'URL (voir core.profiling), réservées au personnel"""
+
+    def get(self, request):
+        stats = get_stats()
+        for url_name, summary in stats.items():
+            summary['sql_budget'] = get_sql_budget(url_name)
+        return JsonResponse({'sample_rate': settings.PROFILING_SAMPLE_RATE, 'urls': stats})
+
+
+profiling_stats = ProfilingStatsView.as_view()
+
+
+@method_decorator(login_required, name='dispatch')
+class CompanySelectView(View):
+    """
+    Sociétés accessibles à l'utilisateur (GET) et choix de la société de travail
+    (POST company=<id>) : la société n'est mémorisée en session que s'il en est membre.
+    """
+
+    def get(self, request):
+        companies = Company.objects.for_user(request.user).values('pk', 'name', 'slug')
+        return JsonResponse({
+            'current': request.company_id,
+            'companies': [{'id': row['pk'], 'name': row['name'], 'slug': row['slug']} for row in companies],
+        })
+
+    def post(self, request):
+        try:
+            company = Company.objects.get(pk=request.POST.get('company'), is_active=True)
+        except (Company.DoesNotExist, ValueError):
+            raise Http404("Société inconnue.")
+        select_company(request, company)
+        next_url = request.POST.get('next')
+        if not url_has_allowed_host_and_scheme(next_url, {request.get_host()}, request.is_secure()):
+            next_url = 'home'
+        return redirect(next_url)
+
+
+company_select = CompanySelectView.as_view()
@@ -1 +1,9 @@
- 
+from django.contrib import admin
+from .models import ReportJob
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'company', 'status', 'progress', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind', 'company')
+    readonly_fields = ('started_at', 'finished_at', 'artifact', 'error')
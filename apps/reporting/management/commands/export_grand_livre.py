@@ -0,0 +1,72 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from core.models import Company
+from reporting.services.ledger_services import CHUNK_SIZE, iter_ledger_csv, write_ledger_xlsx
+
+class Command(BaseCommand):
+    help = 'Exporte le grand livre (CSV ou XLSX) en flux, sans charger les lignes en mémoire'
+
+    def add_arguments(self, parser):
+        parser.add_argument('date_from', help="Date de début (AAAA-MM-JJ)")
+        parser.add_argument('date_to', help="Date de fin (AAAA-MM-JJ)")
+        parser.add_argument(
+            '--format',
+            choices=('csv', 'xlsx'),
+            default='csv',
+            help="Format du fichier (défaut : csv)",
+        )
+        parser.add_argument(
+            '-o', '--output',
+            help="Fichier de sortie (défaut : sortie standard, CSV uniquement)",
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help=f"Nombre de lignes lues par paquet (défaut : {CHUNK_SIZE})",
+        )
+        parser.add_argument(
+            '--company',
+            help="Identifiant (slug) de la société (défaut : société par défaut)",
+        )
+
+    def handle(self, *args, **options):
+        date_from = self._parse_date(options['date_from'])
+        date_to = self._parse_date(options['date_to'])
+        output = options['output']
+        chunk_size = options['chunk_size']
+        company = self._get_company(options['company'])
+
+        if options['format'] == 'xlsx':
+            if not output:
+                raise CommandError("L'export XLSX nécessite --output.")
+            try:
+                write_ledger_xlsx(output, date_from, date_to, chunk_size, company)
+            except ImproperlyConfigured as exc:
+                raise CommandError(str(exc))
+            return
+
+        if output:
+            with open(output, 'w', encoding='utf-8', newline='') as stream:
+                stream.writelines(iter_ledger_csv(date_from, date_to, chunk_size, company))
+        else:
+            for line in iter_ledger_csv(date_from, date_to, chunk_size, company):
+                self.stdout.write(line, ending='')
+
+    def _parse_date(self, value):
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"Date invalide : {value}")
+        return day
+
+    def _get_company(self, slug):
+        if slug is None:
+            return None
+        try:
+            return Company.objects.get(slug=slug)
+        except Company.DoesNotExist:
+            raise CommandError(f"Société inconnue : {slug}")
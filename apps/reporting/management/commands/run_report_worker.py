@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from reporting.services.job_services import run_pending_jobs
+
+class Command(BaseCommand):
+    help = 'Exécute les générations de rapports en attente (travailleur hors du processus web)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help="Traite les travaux en attente puis s'arrête",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help="Pause entre deux interrogations de la file, en secondes (défaut : 2)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending_jobs()
+            if count:
+                self.stdout.write(f"{count} rapport(s) généré(s)")
+            if options['once']:
+                break
+            if not count:
+                time.sleep(options['interval'])
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+import core.tenancy
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=30, verbose_name='Rapport')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Paramètres')),
+                ('status', models.CharField(choices=[('pending', 'En attente'), ('running', 'En cours'), ('done', 'Terminé'), ('failed', 'Échec')], default='pending', max_length=10, verbose_name='État')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Avancement (%)')),
+                ('error', models.TextField(blank=True, verbose_name='Erreur')),
+                ('artifact', models.CharField(blank=True, help_text='Chemin du rapport généré, relatif à REPORT_CACHE_DIR.', max_length=255, verbose_name='Fichier')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('company', models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société')),
+            ],
+            options={
+                'verbose_name': 'Génération de rapport',
+                'verbose_name_plural': 'Générations de rapports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'id'], name='report_job_queue_idx'), models.Index(fields=['company', 'kind', 'status'], name='report_job_company_idx')],
+            },
+        ),
+    ]
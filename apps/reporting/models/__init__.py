@@ -1 +1,3 @@
- 
+from .report_job import ReportJob
+
+__all__ = ['ReportJob']
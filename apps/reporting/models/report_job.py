@@ -0,0 +1,55 @@
+from django.db import models
+
+from core.models import TenantModel
+
+
+class ReportJob(TenantModel):
+    """
+    Demande de génération d'un rapport, traitée en arrière-plan (voir job_services).
+    La table sert de file d'attente : un travailleur réserve un travail en attente
+    en le passant à l'état « en cours » par une mise à jour conditionnelle.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (PENDING, "En attente"),
+        (RUNNING, "En cours"),
+        (DONE, "Terminé"),
+        (FAILED, "Échec"),
+    ]
+
+    kind = models.CharField(max_length=30, verbose_name="Rapport")
+    params = models.JSONField(default=dict, blank=True, verbose_name="Paramètres")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="État")
+    progress = models.PositiveSmallIntegerField(default=0, verbose_name="Avancement (%)")
+    error = models.TextField(blank=True, verbose_name="Erreur")
+    artifact = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Fichier",
+        help_text="Chemin du rapport généré, relatif à REPORT_CACHE_DIR."
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = 'reporting'
+        ordering = ['-created_at']
+        indexes = [
+            # Réservation du plus ancien travail en attente, toutes sociétés confondues
+            models.Index(fields=['status', 'id'], name='report_job_queue_idx'),
+            models.Index(fields=['company', 'kind', 'status'], name='report_job_company_idx'),
+        ]
+        verbose_name = "Génération de rapport"
+        verbose_name_plural = "Générations de rapports"
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
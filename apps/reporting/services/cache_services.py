@@ -0,0 +1,125 @@
+"""
+Cache des résultats de rapports.
+
+Un résultat est rangé sous une clé (type de rapport, société, dates) avec
+la version du plan comptable (intitulés des comptes et des groupes) et les
+versions du grand livre des mois qu'il couvre (transactions.ledger_versions) ;
+il reste valable tant qu'elles n'ont pas changé. Deux niveaux :
+- un LRU en mémoire du processus (settings.REPORT_RESULT_CACHE_SIZE entrées) ;
+- le cache Django, partagé entre processus.
+
+Un rapport déjà calculé ne coûte aucune requête SQL et deux accès au cache
+partagé : la lecture des versions.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router
+
+from accounts.services.chart_services import get_chart_version
+from core.routers import is_primary_pinned, reporting_reads
+from core.tenancy import get_company_id
+from transactions.ledger_versions import get_ledger_versions
+from transactions.models.fiscal_period import FiscalPeriod
+
+REPORT_CACHE_PREFIX = 'reporting:result'
+
+
+class CachedReport(NamedTuple):
+    versions: Tuple[int, ...]
+    on_replica: bool
+    expires_at: Optional[float]
+    value: Any
+
+
+class LRUCache:
+    """Cache borné en mémoire du processus : les entrées les moins récemment lues sont évincées"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_local = LRUCache(settings.REPORT_RESULT_CACHE_SIZE)
+
+
+@reporting_reads()
+def cached_report(kind, date_from, date_to, compute, company=None, since=None):
+    """
+    Retourne le rapport `kind` d'une société (par défaut, la société courante)
+    entre deux dates, depuis le cache s'il est à jour.
+    Sinon, compute(period_ids, using) le calcule sur les périodes et la base données.
+
+    Un rapport cumulé (bilan) dépend aussi des mois antérieurs : since, s'il
+    est antérieur à date_from, étend les versions vérifiées à partir de ce mois.
+    """
+    company_id = get_company_id(company)
+    key = f'{REPORT_CACHE_PREFIX}:{kind}:{company_id}:{date_from}:{date_to}'
+    # Versions lues avant un éventuel calcul : une écriture concurrente rendra le résultat périmé
+    versions = (get_chart_version(),) + get_ledger_versions(company_id, min(since or date_from, date_from), date_to)
+    for tier in (_local, cache):
+        entry = tier.get(key)
+        if entry is not None and _is_fresh(entry, versions):
+            if tier is cache:
+                _local.set(key, entry)
+            return entry.value
+
+    using = router.db_for_read(FiscalPeriod)
+    periods = list(
+        FiscalPeriod.objects.using(using).filter(
+            company_id=company_id, start_date__gte=date_from.replace(day=1), start_date__lte=date_to
+        ).order_by('id').values_list('id', 'is_closed')
+    )
+    period_ids = tuple(period_id for period_id, _ in periods)
+    value = compute(period_ids, using)
+
+    on_replica = using not in (None, DEFAULT_DB_ALIAS)
+    # Une réplique peut être en retard sur les versions : le résultat d'une
+    # période ouverte qui y a été lu n'est gardé que le temps du rattrapage
+    timeout = None
+    if on_replica and not all(is_closed for _, is_closed in periods):
+        timeout = settings.REPORTING_PIN_SECONDS
+    entry = CachedReport(versions, on_replica, timeout and time.time() + timeout, value)
+    _local.set(key, entry)
+    cache.set(key, entry, timeout=timeout)
+    return value
+
+
+def clear_local_cache():
+    """Vide le niveau en mémoire du processus (tests)"""
+    _local.clear()
+
+
+def _is_fresh(entry, versions):
+    if entry.expires_at is not None and entry.expires_at < time.time():
+        return False
+    # Un client épinglé sur la base principale doit voir ses propres écritures
+    if entry.on_replica and is_primary_pinned():
+        return False
+    return entry.versions == versions
@@ -0,0 +1,259 @@
+"""
+Génération des rapports en arrière-plan.
+
+enqueue_report() enregistre une demande (ReportJob) et rend la main
+immédiatement. Les travaux en attente sont exécutés par un pool de threads
+local au processus web (settings.REPORT_WORKERS, réveillé après le commit de
+la demande) ou par la commande run_report_worker. La table des travaux sert de
+file : plusieurs travailleurs, dans un ou plusieurs processus, se partagent
+les travaux sans les exécuter deux fois. Un travail resté en cours au-delà de
+settings.REPORT_JOB_TIMEOUT (travailleur arrêté) est passé en échec, et une
+nouvelle demande identique crée un nouveau travail.
+
+Chaque rapport est écrit dans un fichier de REPORT_CACHE_DIR, d'où il est
+servi ensuite sans être recalculé.
+"""
+import csv
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Callable, NamedTuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.tenancy import get_company_id, use_company
+from ..models.report_job import ReportJob
+from .report_services import cached_trial_balance
+from .statement_services import financial_statements
+
+logger = logging.getLogger(__name__)
+
+
+class ReportGenerator(NamedTuple):
+    label: str
+    function: Callable
+    extension: str
+    content_type: str
+
+
+# {type de rapport: générateur} ; un générateur écrit le rapport d'une période dans un flux texte
+REPORT_GENERATORS = {}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def register_report(kind, label, extension='csv', content_type='text/csv; charset=utf-8'):
+    """
+    Enregistre un générateur de rapport :
+    function(stream, date_from, date_to, progress) où progress(pourcentage) signale l'avancement.
+    """
+    def decorator(function):
+        REPORT_GENERATORS[kind] = ReportGenerator(label, function, extension, content_type)
+        return function
+    return decorator
+
+
+def enqueue_report(kind, params, company=None):
+    """
+    Demande la génération d'un rapport pour une société (par défaut, la société courante).
+    Une demande identique encore en attente ou en cours est réutilisée.
+    Lève ValueError si le rapport ou les paramètres sont invalides.
+    """
+    if kind not in REPORT_GENERATORS:
+        raise ValueError(f"Rapport inconnu : {kind}")
+    params = _clean_params(params)
+    company_id = get_company_id(company)
+    # Un travail en cours depuis trop longtemps (travailleur arrêté) n'est pas réutilisé
+    job = ReportJob._base_manager.filter(
+        Q(status=ReportJob.PENDING) | Q(status=ReportJob.RUNNING, started_at__gte=_stale_cutoff()),
+        company_id=company_id, kind=kind, params=params,
+    ).first()
+    if job is None:
+        job = ReportJob._base_manager.create(company_id=company_id, kind=kind, params=params)
+        transaction.on_commit(_wake_workers)
+    return job
+
+
+def run_pending_jobs(limit=None):
+    """Exécute les travaux en attente (toutes sociétés) ; retourne le nombre de travaux traités"""
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
+
+
+def claim_next_job():
+    """Réserve le plus ancien travail en attente, ou retourne None s'il n'y en a pas"""
+    jobs = ReportJob._base_manager
+    fail_stale_jobs()
+    while True:
+        pk = jobs.filter(status=ReportJob.PENDING).order_by('id').values_list('pk', flat=True).first()
+        if pk is None:
+            return None
+        # Mise à jour conditionnelle : un seul travailleur obtient le travail
+        if jobs.filter(pk=pk, status=ReportJob.PENDING).update(
+            status=ReportJob.RUNNING, progress=0, started_at=timezone.now()
+        ):
+            return jobs.get(pk=pk)
+
+
+def fail_stale_jobs():
+    """
+    Passe en échec les travaux en cours depuis plus de REPORT_JOB_TIMEOUT
+    secondes : leur travailleur a été arrêté. Retourne leur nombre.
+    """
+    return ReportJob._base_manager.filter(status=ReportJob.RUNNING, started_at__lt=_stale_cutoff()).update(
+        status=ReportJob.FAILED,
+        error="Génération interrompue (délai dépassé) : relancer la demande.",
+        finished_at=timezone.now(),
+    )
+
+
+def _stale_cutoff():
+    return timezone.now() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+
+
+def run_job(job):
+    """Génère le rapport d'un travail réservé et l'écrit dans le cache de fichiers"""
+    generator = REPORT_GENERATORS.get(job.kind)
+    jobs = ReportJob._base_manager.filter(pk=job.pk)
+
+    def progress(percent):
+        jobs.update(progress=min(max(int(percent), 0), 99))
+
+    try:
+        if generator is None:
+            raise ValueError(f"Rapport inconnu : {job.kind}")
+        artifact = os.path.join(str(job.company_id), f"{job.kind}-{job.pk}.{generator.extension}")
+        with use_company(job.company_id), _open_artifact(artifact) as stream:
+            generator.function(
+                stream, parse_date(job.params['date_from']), parse_date(job.params['date_to']), progress
+            )
+    except Exception as exc:
+        logger.exception("Échec du rapport %s #%s", job.kind, job.pk)
+        jobs.update(status=ReportJob.FAILED, error=str(exc), finished_at=timezone.now())
+    else:
+        jobs.update(status=ReportJob.DONE, progress=100, artifact=artifact, finished_at=timezone.now())
+    job.refresh_from_db()
+    return job
+
+
+def get_artifact_path(artifact):
+    return os.path.join(settings.REPORT_CACHE_DIR, artifact)
+
+
+@contextmanager
+def _open_artifact(artifact):
+    """Fichier temporaire renommé en fin d'écriture : un rapport servi est toujours complet"""
+    path = get_artifact_path(artifact)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stream = tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', newline='', dir=os.path.dirname(path), suffix='.tmp', delete=False
+    )
+    try:
+        with stream:
+            yield stream
+        os.replace(stream.name, path)
+    except BaseException:
+        os.unlink(stream.name)
+        raise
+
+
+def _clean_params(params):
+    date_from = _to_date(params.get('date_from'), 'date_from')
+    date_to = _to_date(params.get('date_to'), 'date_to')
+    if date_from > date_to:
+        raise ValueError("La date de début doit précéder la date de fin.")
+    return {'date_from': date_from.isoformat(), 'date_to': date_to.isoformat()}
+
+
+def _to_date(value, name):
+    if isinstance(value, date):
+        return value
+    try:
+        day = parse_date(value or '')
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValueError(f"Date invalide pour {name} : {value!r}")
+    return day
+
+
+def _wake_workers():
+    """Confie l'exécution des travaux en attente au pool de threads du processus"""
+    global _pool
+    if settings.REPORT_WORKERS <= 0:
+        return
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=settings.REPORT_WORKERS, thread_name_prefix='report-worker')
+    _pool.submit(_drain)
+
+
+def _drain():
+    try:
+        run_pending_jobs()
+    finally:
+        # Les connexions ouvertes par un thread du pool lui sont propres
+        connections.close_all()
+
+
+TRIAL_BALANCE_HEADER = ("Compte", "Libellé", "Débit", "Crédit", "Solde débiteur", "Solde créditeur")
+
+
+@register_report('trial_balance', "Balance générale")
+def write_trial_balance(stream, date_from, date_to, progress):
+    balance = cached_trial_balance(date_from, date_to)
+    progress(50)
+    writer = csv.writer(stream, delimiter=';')
+    writer.writerow(TRIAL_BALANCE_HEADER)
+    for row in balance.rows:
+        writer.writerow((row.number, row.label, row.debit, row.credit, row.solde_debiteur, row.solde_crediteur))
+    writer.writerow(("Total", "", balance.total_debit, balance.total_credit, "", ""))
+
+
+STATEMENT_HEADER = ("Poste", "Libellé", "Montant")
+
+
+@register_report('bilan', "Bilan")
+def write_bilan(stream, date_from, date_to, progress):
+    statements = financial_statements(date_from, date_to)
+    progress(50)
+    writer = csv.writer(stream, delimiter=';')
+    writer.writerow(STATEMENT_HEADER)
+    _write_section(writer, statements.actif)
+    writer.writerow(("", "Total actif", statements.actif.total))
+    _write_section(writer, statements.passif)
+    writer.writerow(("", "Résultat de l'exercice", statements.resultat))
+    writer.writerow(("", "Total passif", statements.total_passif))
+
+
+@register_report('compte_resultat', "Compte de résultat")
+def write_compte_resultat(stream, date_from, date_to, progress):
+    statements = financial_statements(date_from, date_to)
+    progress(50)
+    writer = csv.writer(stream, delimiter=';')
+    writer.writerow(STATEMENT_HEADER)
+    for section in (statements.charges, statements.produits):
+        _write_section(writer, section)
+        writer.writerow(("", f"Total {section.position.lower()}", section.total))
+    writer.writerow(("", "Résultat de l'exercice", statements.resultat))
+
+
+def _write_section(writer, section):
+    writer.writerow((section.position, "", ""))
+    for line in section.lines:
+        writer.writerow((line.group_number, line.label, line.amount))
@@ -0,0 +1,95 @@
+"""
+Export du grand livre.
+
+Les lignes sont lues par paquets avec QuerySet.iterator() (curseur côté
+serveur sous PostgreSQL) et écrites au fil de l'eau : la mémoire reste
+constante quel que soit le nombre de lignes, et le premier octet part dès
+le premier paquet lu.
+
+Le tri (numéro de compte, date) est servi par l'index unique (société,
+numéro complet) des comptes puis par l'index (société, compte, date) des
+lignes : la base n'a pas à trier tout l'exercice avant de renvoyer la
+première ligne.
+
+Les lignes des périodes clôturées sont lues dans la table d'archive et
+fusionnées au fil de l'eau avec celles des périodes ouvertes.
+
+La société et la base de lecture sont résolues à l'appel : un flux consommé
+après la fin de la requête (StreamingHttpResponse) reste limité à la société
+de la requête et lu sur la même base.
+"""
+import csv
+import heapq
+from operator import itemgetter
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router
+
+from core.routers import reporting_reads
+from core.tenancy import get_company_id
+from transactions.models.archived_journal_line import ArchivedJournalLine
+from transactions.models.journal_line import JournalLine
+
+CHUNK_SIZE = 2000
+
+LEDGER_HEADER = ("Compte", "Intitulé", "Date", "Journal", "Pièce", "Libellé", "Débit", "Crédit")
+
+
+class Echo:
+    """Pseudo-fichier dont write() renvoie la ligne au lieu de la stocker"""
+
+    def write(self, value):
+        return value
+
+
+@reporting_reads()
+def ledger_rows(date_from, date_to, chunk_size=CHUNK_SIZE, company=None):
+    """Itère sur les lignes du grand livre d'une société, triées par compte puis par date"""
+    company_id = get_company_id(company)
+    archived, current = (
+        model.objects.using(router.db_for_read(model)).filter(
+            company_id=company_id,
+            date__gte=date_from,
+            date__lte=date_to,
+        ).order_by(
+            'account__full_number', 'date', 'id'
+        ).values_list(
+            'account__full_number', 'account__name', 'date', 'entry__journal',
+            'entry__reference', 'label', 'debit', 'credit',
+        ).iterator(chunk_size=chunk_size)
+        for model in (ArchivedJournalLine, JournalLine)
+    )
+    # Les périodes se clôturent dans l'ordre : pour un même compte, les lignes
+    # archivées précèdent toujours les lignes des périodes ouvertes
+    return heapq.merge(archived, current, key=itemgetter(0))
+
+
+def iter_ledger_csv(date_from, date_to, chunk_size=CHUNK_SIZE, company=None):
+    """Produit le grand livre au format CSV, une ligne de texte à la fois"""
+    return _iter_csv(ledger_rows(date_from, date_to, chunk_size, company))
+
+
+def _iter_csv(rows):
+    writer = csv.writer(Echo(), delimiter=';')
+    yield writer.writerow(LEDGER_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def write_ledger_xlsx(output, date_from, date_to, chunk_size=CHUNK_SIZE, company=None):
+    """
+    Écrit le grand livre au format XLSX dans output (chemin ou fichier).
+    Nécessite openpyxl ; le classeur est ouvert en mode write_only pour que
+    les lignes ne soient pas conservées en mémoire.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImproperlyConfigured("L'export XLSX nécessite le paquet openpyxl.")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Grand livre")
+    sheet.append(LEDGER_HEADER)
+    for row in ledger_rows(date_from, date_to, chunk_size, company):
+        sheet.append(row)
+    workbook.save(output)
@@ -0,0 +1,179 @@
+"""
+Balance générale (trial balance).
+
+Les totaux par compte, par groupe et par classe sont calculés par la base
+à partir des soldes matérialisés par période, en une seule requête
+(agrégations UNION ALL, équivalent portable d'un GROUP BY ROLLUP).
+Aucun calcul n'est fait compte par compte en Python.
+"""
+from decimal import Decimal
+from typing import List, NamedTuple
+
+from django.db import connections, router
+
+from core.routers import reporting_reads
+from core.tenancy import get_company_id
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from transactions.models.account_balance import AccountBalance
+from transactions.models.fiscal_period import FiscalPeriod
+from .cache_services import cached_report
+
+CLASS_LEVEL = 1
+GROUP_LEVEL = 2
+ACCOUNT_LEVEL = 3
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+class TrialBalanceRow(NamedTuple):
+    level: int
+    number: str
+    label: str
+    debit: Decimal
+    credit: Decimal
+
+    @property
+    def solde(self):
+        """Solde du poste (positif = débiteur, négatif = créditeur)"""
+        return self.debit - self.credit
+
+    @property
+    def solde_debiteur(self):
+        return max(self.solde, ZERO)
+
+    @property
+    def solde_crediteur(self):
+        return max(-self.solde, ZERO)
+
+
+class TrialBalance(NamedTuple):
+    date_from: object
+    date_to: object
+    rows: List[TrialBalanceRow]
+    total_debit: Decimal
+    total_credit: Decimal
+
+    @property
+    def accounts(self):
+        return [row for row in self.rows if row.level == ACCOUNT_LEVEL]
+
+    @property
+    def groups(self):
+        return [row for row in self.rows if row.level == GROUP_LEVEL]
+
+    @property
+    def classes(self):
+        return [row for row in self.rows if row.level == CLASS_LEVEL]
+
+
+@reporting_reads()
+def trial_balance(date_from, date_to, using=None, company=None):
+    """
+    Balance générale des mouvements d'une société (par défaut, la société
+    courante) entre deux dates (arrondies aux périodes).
+
+    Les lignes sont renvoyées dans l'ordre du plan : chaque classe précède ses
+    groupes, et chaque groupe ses comptes (tri sur le numéro puis le niveau).
+    """
+    # Requête brute : la base de lecture est demandée explicitement aux routeurs
+    connection = connections[using or router.db_for_read(AccountBalance)]
+    with connection.cursor() as cursor:
+        company_id = get_company_id(company)
+        cursor.execute(
+            _trial_balance_sql(connection), [company_id, company_id, date_from.replace(day=1), date_to]
+        )
+        rows = [
+            TrialBalanceRow(level, number, label, _to_decimal(debit), _to_decimal(credit))
+            for level, number, label, debit, credit in cursor.fetchall()
+        ]
+    classes = [row for row in rows if row.level == CLASS_LEVEL]
+    return TrialBalance(
+        date_from=date_from,
+        date_to=date_to,
+        rows=rows,
+        total_debit=sum((row.debit for row in classes), ZERO),
+        total_credit=sum((row.credit for row in classes), ZERO),
+    )
+
+
+def cached_trial_balance(date_from, date_to, company=None):
+    """Balance générale servie par le cache des rapports (voir cache_services)"""
+    return cached_report(
+        'trial_balance',
+        date_from,
+        date_to,
+        lambda period_ids, using: trial_balance(date_from, date_to, using, company),
+        company,
+    )
+
+
+def _to_decimal(value):
+    # SQLite renvoie les sommes en entier ou en float, PostgreSQL en Decimal :
+    # tous les montants sont ramenés au centime (0 comme 0.00 dans les états et CSV)
+    if value is None:
+        return ZERO
+    if isinstance(value, float):
+        value = repr(value)
+    return Decimal(value).quantize(CENT)
+
+
+def _trial_balance_sql(connection):
+    """
+    Une seule requête : les soldes de la période sont agrégés une fois par
+    compte (CTE matérialisée), puis cumulés par groupe et par classe.
+
+    Le « + » devant period_id empêche SQLite d'utiliser l'index sur la période :
+    l'index unique (société, compte, période) sert alors directement le GROUP BY
+    sur la seule partie de la société.
+    Sous PostgreSQL, c'est une simple expression sans effet sur le plan.
+    """
+    quote = connection.ops.quote_name
+
+    def table(model):
+        return quote(model._meta.db_table)
+
+    def column(model, name):
+        return quote(model._meta.get_field(name).column)
+
+    materialized = 'MATERIALIZED ' if connection.vendor in ('sqlite', 'postgresql') else ''
+    return f"""
+        WITH per_account AS {materialized}(
+            SELECT a.{column(Account, 'full_number')} AS number, a.{column(Account, 'name')} AS label,
+                   a.{column(Account, 'account_group')} AS group_id, t.debit, t.credit
+            FROM (
+                SELECT {column(AccountBalance, 'account')} AS account_id,
+                       SUM({column(AccountBalance, 'debit')}) AS debit,
+                       SUM({column(AccountBalance, 'credit')}) AS credit
+                FROM {table(AccountBalance)}
+                WHERE {column(AccountBalance, 'company')} = %s AND +{column(AccountBalance, 'period')} IN (
+                    SELECT {column(FiscalPeriod, 'id')} FROM {table(FiscalPeriod)}
+                    WHERE {column(FiscalPeriod, 'company')} = %s
+                      AND {column(FiscalPeriod, 'start_date')} >= %s AND {column(FiscalPeriod, 'start_date')} <= %s
+                )
+                GROUP BY {column(AccountBalance, 'account')}
+            ) t
+            JOIN {table(Account)} a ON a.{column(Account, 'id')} = t.account_id
+        ),
+        per_group AS {materialized}(
+            SELECT g.{column(AccountGroup, 'number')} AS number, g.{column(AccountGroup, 'name')} AS label,
+                   g.{column(AccountGroup, 'account_class')} AS class_id,
+                   SUM(p.debit) AS debit, SUM(p.credit) AS credit
+            FROM per_account p
+            JOIN {table(AccountGroup)} g ON g.{column(AccountGroup, 'id')} = p.group_id
+            GROUP BY g.{column(AccountGroup, 'id')}, g.{column(AccountGroup, 'number')},
+                     g.{column(AccountGroup, 'name')}, g.{column(AccountGroup, 'account_class')}
+        )
+        SELECT {ACCOUNT_LEVEL}, number, label, debit, credit FROM per_account
+        UNION ALL
+        SELECT {GROUP_LEVEL}, CAST(number AS VARCHAR(8)), label, debit, credit FROM per_group
+        UNION ALL
+        SELECT {CLASS_LEVEL}, CAST(c.{column(AccountClass, 'number')} AS VARCHAR(8)), c.{column(AccountClass, 'name')},
+               SUM(p.debit), SUM(p.credit)
+        FROM per_group p
+        JOIN {table(AccountClass)} c ON c.{column(AccountClass, 'number')} = p.class_id
+        GROUP BY c.{column(AccountClass, 'number')}, c.{column(AccountClass, 'name')}
+        ORDER BY 2, 1
+    """
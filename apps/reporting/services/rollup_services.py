@@ -0,0 +1,72 @@
+"""
+Totaux par sous-arbre du plan comptable.
+
+Le numéro complet d'un compte (Account.full_number) est le chemin
+matérialisé classe -> groupe -> comptes et sous-comptes (jusqu'à 8 chiffres) :
+le total de tout ce qui est sous la classe 4, le groupe 40 ou le compte 4011
+est une seule agrégation des soldes matérialisés sur un intervalle de
+numéros, servi par l'index (société, numéro complet), sans parcours de
+l'arbre en Python.
+"""
+from typing import NamedTuple
+
+from django.db.models import Sum
+from django.db.models.functions import Substr
+
+from core.routers import reporting_reads
+from core.tenancy import get_company_id
+from accounts.models.account import Account
+from transactions.models.account_balance import AccountBalance
+from .report_services import _to_decimal
+
+
+class RollupTotal(NamedTuple):
+    number: str
+    debit: object
+    credit: object
+
+    @property
+    def solde(self):
+        """Solde du nœud (positif = débiteur, négatif = créditeur)"""
+        return self.debit - self.credit
+
+
+@reporting_reads()
+def subtree_totals(node, date_from, date_to, company=None):
+    """
+    Mouvements cumulés de tous les comptes sous un nœud du plan (classe, groupe,
+    compte ou préfixe de numéro) entre deux dates (arrondies aux périodes).
+    """
+    number = node if isinstance(node, str) else node.get_full_number()
+    totals = _balances(number, date_from, date_to, company).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+    return RollupTotal(number, _to_decimal(totals['debit']), _to_decimal(totals['credit']))
+
+
+@reporting_reads()
+def rollup(depth, date_from, date_to, prefix='', company=None):
+    """
+    Mouvements cumulés par nœud de `depth` chiffres (1 = classe, 2 = groupe,
+    3 à 8 = sous-comptes) sous un préfixe, en une requête GROUP BY.
+    Un compte plus court que `depth` forme son propre nœud.
+    """
+    rows = _balances(prefix, date_from, date_to, company).annotate(
+        node=Substr('account__full_number', 1, depth)
+    ).values('node').annotate(debit=Sum('debit'), credit=Sum('credit')).order_by('node')
+    return [
+        RollupTotal(row['node'], _to_decimal(row['debit']), _to_decimal(row['credit']))
+        for row in rows
+        if row['debit'] or row['credit']
+    ]
+
+
+def _balances(prefix, date_from, date_to, company):
+    company_id = get_company_id(company)
+    accounts = Account.objects.filter(company_id=company_id)
+    if prefix:
+        accounts = accounts.with_prefix(prefix)
+    return AccountBalance.objects.filter(
+        company_id=company_id,
+        account__in=accounts.values('pk'),
+        period__start_date__gte=date_from.replace(day=1),
+        period__start_date__lte=date_to,
+    )
@@ -0,0 +1,212 @@
+"""
+Bilan et compte de résultat (états financiers OHADA).
+
+Les soldes matérialisés sont agrégés en une seule requête par position
+(AccountClass.position_bilan), classe et groupe : cumulés jusqu'à la fin du
+rapport pour le bilan (dernier à-nouveau au plus tard au début du rapport et
+périodes suivantes), limités aux périodes du rapport pour le compte de
+résultat, clôturées ou non. La position des
+classes 4, 5 et 8 dépend du solde de chaque compte
+(accounts.rules.DUAL_POSITION_CLASSES) : un compte client créditeur figure au
+passif, un compte bancaire créditeur (découvert) aussi.
+
+Le résultat est servi par le cache des rapports (voir cache_services) : il
+n'est recalculé qu'après une écriture dans l'une des périodes du rapport.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, connections, router
+
+from core.tenancy import get_company_id
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.rules import CLASS_RULES, DUAL_POSITION_CLASSES
+from transactions.models.account_balance import AccountBalance
+from transactions.models.fiscal_period import FiscalPeriod, first_open_month
+from transactions.models.opening_balance import OpeningBalance
+from .cache_services import cached_report
+from .report_services import ZERO, _to_decimal
+
+ACTIF = "Actif"
+PASSIF = "Passif"
+CHARGES = "Charges"
+PRODUITS = "Produits"
+
+# Positions lues au solde débiteur ; les autres au solde créditeur
+DEBIT_POSITIONS = (ACTIF, CHARGES)
+
+# Classes du bilan, soldées à la fin du rapport ; les autres ne reprennent que ses périodes
+BALANCE_SHEET_CLASSES = tuple(rule.number for rule in CLASS_RULES if rule and rule.position in (ACTIF, PASSIF))
+
+
+class StatementLine(NamedTuple):
+    class_number: int
+    group_number: int
+    label: str
+    amount: Decimal
+
+
+class StatementSection(NamedTuple):
+    position: str
+    lines: Tuple[StatementLine, ...]
+
+    @property
+    def total(self):
+        return sum((line.amount for line in self.lines), ZERO)
+
+
+class FinancialStatements(NamedTuple):
+    date_from: object
+    date_to: object
+    actif: StatementSection
+    passif: StatementSection
+    charges: StatementSection
+    produits: StatementSection
+
+    @property
+    def resultat(self):
+        """Résultat de la période (positif = bénéfice, négatif = perte)"""
+        return self.produits.total - self.charges.total
+
+    @property
+    def total_passif(self):
+        """Total du passif, résultat de la période compris : égal au total de l'actif"""
+        return self.passif.total + self.resultat
+
+
+def financial_statements(date_from, date_to, company=None):
+    """
+    Bilan et compte de résultat d'une société (par défaut, la société courante)
+    entre deux dates (arrondies aux périodes).
+    """
+    company_id = get_company_id(company)
+    # Le bilan cumule tous les mois ouverts jusqu'à date_to : leurs versions valident le cache
+    since = first_open_month(company_id, router.db_for_read(FiscalPeriod))
+    return cached_report(
+        'financial_statements',
+        date_from,
+        date_to,
+        lambda period_ids, using: _build_statements(date_from, date_to, company_id, using),
+        company_id,
+        since=since,
+    )
+
+
+def _build_statements(date_from, date_to, company_id, using):
+    lines = {position: [] for position, _ in AccountClass.POSITION_CHOICES}
+    prior = ZERO
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    # Dernier à-nouveau jusqu'au mois de date_from : écrit pour toute la société à chaque clôture.
+    # Un à-nouveau postérieur cumulerait les charges et produits des premiers mois du rapport.
+    opening = OpeningBalance.objects.using(using).filter(
+        company_id=company_id, period__start_date__lte=date_from.replace(day=1)
+    ).order_by('-period__start_date').values_list('period_id', 'period__start_date').first()
+    sql, params = _statements_sql(connection, company_id, date_from, date_to, opening)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        for position, class_number, group_number, label, debit, credit, before in cursor.fetchall():
+            prior += _to_decimal(before)
+            amount = _to_decimal(debit) - _to_decimal(credit)
+            if position not in DEBIT_POSITIONS:
+                amount = -amount
+            # Les postes soldés ne figurent pas dans les états
+            if amount:
+                lines[position].append(StatementLine(class_number, group_number, label, amount))
+    # Résultat des mois antérieurs à la période, non affecté : report à nouveau au passif
+    if prior:
+        lines[PASSIF].append(StatementLine(1, 12, "Résultats antérieurs", -prior))
+        lines[PASSIF].sort(key=lambda line: (line.class_number, line.group_number))
+    return FinancialStatements(
+        date_from,
+        date_to,
+        *(StatementSection(position, tuple(lines[position])) for position in (ACTIF, PASSIF, CHARGES, PRODUITS))
+    )
+
+
+def _statements_sql(connection, company_id, date_from, date_to, opening):
+    """
+    Soldes par compte, puis cumul par position, classe et groupe.
+
+    Les comptes du bilan (classes 1 à 5) sont soldés à date_to : à-nouveau
+    `opening` (au plus tard au mois de date_from) et soldes des périodes
+    suivantes. Ceux du compte de résultat reprennent les soldes des périodes
+    du rapport ; leurs mouvements antérieurs (à-nouveau et périodes
+    précédant le rapport, colonne `before`, débit - crédit) forment le
+    résultat des périodes précédentes.
+    La position d'un compte des classes à double position est choisie selon son solde.
+    """
+    quote = connection.ops.quote_name
+
+    def table(model):
+        return quote(model._meta.db_table)
+
+    def column(model, name):
+        return quote(model._meta.get_field(name).column)
+
+    class_number = f"c.{column(AccountClass, 'number')}"
+    cases, case_params = [], []
+    for rule in DUAL_POSITION_CLASSES:
+        debit_position, credit_position = rule.positions_selon_solde
+        cases.append("WHEN t.class_number = %s THEN CASE WHEN t.debit >= t.credit THEN %s ELSE %s END")
+        case_params += [rule.number, debit_position, credit_position]
+    position = f"CASE {' '.join(cases)} ELSE t.position_bilan END"
+
+    balance_sheet = ', '.join(['%s'] * len(BALANCE_SHEET_CLASSES))
+    opening_start, opening_params = "%s", [date.min]
+    opening_rows, opening_row_params = "", []
+    if opening is not None:
+        opening_period_id, opening_start_date = opening
+        opening_params = [opening_start_date]
+        opening_rows = f"""
+            UNION ALL
+            SELECT {column(OpeningBalance, 'account')}, {column(OpeningBalance, 'debit')},
+                   {column(OpeningBalance, 'credit')}, 0, 0
+            FROM {table(OpeningBalance)}
+            WHERE {column(OpeningBalance, 'company')} = %s AND {column(OpeningBalance, 'period')} = %s
+        """
+        opening_row_params = [company_id, opening_period_id]
+
+    b = f"b.{column(AccountBalance, 'debit')}", f"b.{column(AccountBalance, 'credit')}"
+    p_start = f"p.{column(FiscalPeriod, 'start_date')}"
+    sql = f"""
+        SELECT {position} AS position, t.class_number, t.group_number, t.group_name,
+               SUM(t.debit), SUM(t.credit), SUM(t.before)
+        FROM (
+            SELECT {class_number} AS class_number, c.{column(AccountClass, 'position_bilan')} AS position_bilan,
+                   g.{column(AccountGroup, 'number')} AS group_number, g.{column(AccountGroup, 'name')} AS group_name,
+                   CASE WHEN {class_number} IN ({balance_sheet}) THEN s.cumulated_debit ELSE s.debit END AS debit,
+                   CASE WHEN {class_number} IN ({balance_sheet}) THEN s.cumulated_credit ELSE s.credit END AS credit,
+                   CASE WHEN {class_number} IN ({balance_sheet}) THEN 0
+                        ELSE (s.cumulated_debit - s.debit) - (s.cumulated_credit - s.credit) END AS before
+            FROM (
+                SELECT account_id, SUM(cumulated_debit) AS cumulated_debit, SUM(cumulated_credit) AS cumulated_credit,
+                       SUM(debit) AS debit, SUM(credit) AS credit
+                FROM (
+                    SELECT b.{column(AccountBalance, 'account')} AS account_id,
+                           {b[0]} AS cumulated_debit, {b[1]} AS cumulated_credit,
+                           CASE WHEN {p_start} >= %s THEN {b[0]} ELSE 0 END AS debit,
+                           CASE WHEN {p_start} >= %s THEN {b[1]} ELSE 0 END AS credit
+                    FROM {table(AccountBalance)} b
+                    JOIN {table(FiscalPeriod)} p ON p.{column(FiscalPeriod, 'id')} = b.{column(AccountBalance, 'period')}
+                    WHERE b.{column(AccountBalance, 'company')} = %s
+                      AND {p_start} >= {opening_start} AND {p_start} <= %s
+                    {opening_rows}
+                ) u
+                GROUP BY account_id
+            ) s
+            JOIN {table(Account)} a ON a.{column(Account, 'id')} = s.account_id
+            JOIN {table(AccountGroup)} g ON g.{column(AccountGroup, 'id')} = a.{column(Account, 'account_group')}
+            JOIN {table(AccountClass)} c ON {class_number} = g.{column(AccountGroup, 'account_class')}
+        ) t
+        GROUP BY 1, t.class_number, t.group_number, t.group_name
+        ORDER BY t.class_number, t.group_number, 1
+    """
+    month_from, month_to = date_from.replace(day=1), date_to.replace(day=1)
+    params = (
+        case_params + list(BALANCE_SHEET_CLASSES) * 3
+        + [month_from, month_from, company_id] + opening_params + [month_to] + opening_row_params
+    )
+    return sql, params
@@ -0,0 +1,64 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Company
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.services.transaction_services import post_entries
+
+
+class AccountBalancesViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=41
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7), number=70
+        )
+        Account.objects.create(account_group=customers, number="1100", name="Clients", account_type=account_type)
+        Account.objects.create(account_group=customers, number="1200", name="Clients douteux", account_type=account_type)
+        Account.objects.create(account_group=sales, number="1000", name="Ventes", account_type=account_type)
+        post_entries([
+            {
+                'date': day,
+                'label': "Facture",
+                'lines': [{'account': '411100', 'debit': amount}, {'account': '701000', 'credit': amount}],
+            }
+            for day, amount in ((date(2025, 1, 10), '100'), (date(2025, 2, 5), '30'))
+        ])
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_returns_columnar_balances(self):
+        # Session, utilisateur et appartenance à la société, puis comptes, périodes et soldes
+        with self.assertNumQueries(6):
+            response = self.client.get(
+                reverse('account_balances'), {'comptes': '701000,411100', 'dates': '2025-01-31,2025-02-28'}
+            )
+        self.assertEqual(response.json(), {
+            'accounts': ['701000', '411100'],
+            'dates': ['2025-01-31', '2025-02-28'],
+            'balances': [['-100.00', '100.00'], ['-130.00', '130.00']],
+        })
+
+    def test_selects_accounts_by_prefix(self):
+        response = self.client.get(reverse('account_balances'), {'prefixe': '41', 'dates': '2025-02-28'})
+        self.assertEqual(response.json()['accounts'], ['411100', '411200'])
+        self.assertEqual(response.json()['balances'], [['130.00', '0.00']])
+
+    def test_rejects_unknown_accounts_and_invalid_dates(self):
+        response = self.client.get(reverse('account_balances'), {'comptes': '411100,999999', 'dates': '2025-01-31'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('999999', response.json()['error'])
+        response = self.client.get(reverse('account_balances'), {'comptes': '411100', 'dates': '2025-13-01'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,147 @@
+import csv
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.models.fiscal_period import FiscalPeriod
+from transactions.services.closing_services import close_periods
+from transactions.services.transaction_services import post_entries
+from ..models.report_job import ReportJob
+from ..services.cache_services import clear_local_cache
+from ..services.job_services import enqueue_report, get_artifact_path, run_pending_jobs
+from ..services.statement_services import financial_statements
+
+
+def entry(day, label, debit_account, credit_account, amount):
+    return {
+        'date': day,
+        'label': label,
+        'lines': [{'account': debit_account, 'debit': amount}, {'account': credit_account, 'credit': amount}],
+    }
+
+
+class FinancialStatementsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        for class_number, group_number, account_number, name in [
+            (1, 10, "1000", "Capital"),
+            (4, 40, "1000", "Fournisseurs"),
+            (4, 41, "1100", "Clients"),
+            (4, 41, "9100", "Clients, avances reçues"),
+            (5, 52, "1000", "Banque"),
+            (5, 56, "1000", "Découvert"),
+            (6, 60, "1000", "Achats"),
+            (7, 70, "1000", "Ventes"),
+        ]:
+            account_class, _ = AccountClass.objects.get_or_create(number=class_number)
+            group, _ = AccountGroup.objects.get_or_create(account_class=account_class, number=group_number)
+            Account.objects.create(account_group=group, number=account_number, name=name, account_type=account_type)
+        post_entries([
+            entry(date(2025, 1, 2), "Apport", '521000', '101000', '1000.00'),
+            entry(date(2025, 2, 10), "Vente", '411100', '701000', '300.00'),
+            entry(date(2025, 2, 12), "Avance client", '521000', '419100', '50.00'),
+            entry(date(2025, 3, 5), "Achat", '601000', '401000', '200.00'),
+            # Fournisseur réglé par le compte à découvert : solde créditeur en classe 5
+            entry(date(2025, 3, 20), "Règlement", '401000', '561000', '200.00'),
+        ])
+
+    def setUp(self):
+        # Les caches survivent à l'annulation des transactions de test
+        cache.clear()
+        clear_local_cache()
+
+    def statements(self):
+        return financial_statements(date(2025, 1, 1), date(2025, 12, 31))
+
+    def lines(self, section):
+        return [(line.group_number, line.amount) for line in section.lines]
+
+    def test_positions_follow_account_balance(self):
+        statements = self.statements()
+        self.assertEqual(self.lines(statements.actif), [(41, Decimal('300.00')), (52, Decimal('1050.00'))])
+        self.assertEqual(
+            self.lines(statements.passif),
+            [(10, Decimal('1000.00')), (41, Decimal('50.00')), (56, Decimal('200.00'))],
+        )
+        self.assertEqual(self.lines(statements.charges), [(60, Decimal('200.00'))])
+        self.assertEqual(self.lines(statements.produits), [(70, Decimal('300.00'))])
+        self.assertEqual(statements.resultat, Decimal('100.00'))
+        self.assertEqual(statements.total_passif, statements.actif.total)
+
+    def test_balance_sheet_includes_history_before_the_report(self):
+        def check():
+            statements = financial_statements(date(2025, 3, 1), date(2025, 3, 31))
+            # Apport de janvier et vente de février au bilan ; seul mars au compte de résultat
+            self.assertEqual(self.lines(statements.actif), [(41, Decimal('300.00')), (52, Decimal('1050.00'))])
+            self.assertEqual(
+                [(line.group_number, line.label, line.amount) for line in statements.passif.lines],
+                [(10, "Capital", Decimal('1000.00')), (12, "Résultats antérieurs", Decimal('300.00')),
+                 (41, "Clients et comptes rattachés", Decimal('50.00')), (56, "Virements de fonds", Decimal('200.00'))],
+            )
+            self.assertEqual(self.lines(statements.charges), [(60, Decimal('200.00'))])
+            self.assertEqual(statements.produits.lines, ())
+            self.assertEqual(statements.resultat, Decimal('-200.00'))
+            self.assertEqual(statements.total_passif, statements.actif.total)
+
+        check()
+        # Après clôture, le bilan repart des à-nouveaux de mars
+        close_periods(date(2025, 2, 1))
+        cache.clear()
+        clear_local_cache()
+        check()
+
+    def test_closing_inside_the_report_keeps_income_statement(self):
+        close_periods(date(2025, 2, 1))
+        statements = self.statements()
+        # Vente de février, période clôturée, toujours au compte de résultat de l'exercice
+        self.assertEqual(self.lines(statements.charges), [(60, Decimal('200.00'))])
+        self.assertEqual(self.lines(statements.produits), [(70, Decimal('300.00'))])
+        self.assertEqual(statements.resultat, Decimal('100.00'))
+        self.assertNotIn("Résultats antérieurs", [line.label for line in statements.passif.lines])
+        self.assertEqual(statements.total_passif, statements.actif.total)
+
+    def test_cached_until_a_period_is_posted(self):
+        self.statements()
+        with self.assertNumQueries(0):
+            self.statements()
+
+        post_entries([entry(date(2025, 3, 25), "Vente", '411100', '701000', '40.00')])
+        self.assertEqual(self.statements().resultat, Decimal('140.00'))
+
+        # Une écriture hors de la période du rapport ne l'invalide pas
+        post_entries([entry(date(2026, 1, 5), "Vente", '411100', '701000', '10.00')])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.statements().resultat, Decimal('140.00'))
+
+    def test_closed_period_is_served_from_cache(self):
+        FiscalPeriod.objects.update(is_closed=True)
+        self.statements()
+        clear_local_cache()
+        # Niveau partagé seul, comme dans un autre processus
+        with self.assertNumQueries(0):
+            self.assertEqual(self.statements().resultat, Decimal('100.00'))
+
+    def test_report_jobs(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(REPORT_CACHE_DIR=directory):
+            jobs = [
+                enqueue_report(kind, {'date_from': '2025-01-01', 'date_to': '2025-12-31'})
+                for kind in ('bilan', 'compte_resultat')
+            ]
+            self.assertEqual(run_pending_jobs(), 2)
+            rows = {}
+            for job in jobs:
+                job.refresh_from_db()
+                self.assertEqual(job.status, ReportJob.DONE)
+                with open(get_artifact_path(job.artifact), encoding='utf-8') as stream:
+                    rows[job.kind] = list(csv.reader(StringIO(stream.read()), delimiter=';'))
+        self.assertEqual(rows['bilan'][-1], ["", "Total passif", "1350.00"])
+        self.assertEqual(rows['compte_resultat'][-1], ["", "Résultat de l'exercice", "100.00"])
@@ -0,0 +1,90 @@
+import csv
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Company
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.services.transaction_services import post_entries
+from ..services.ledger_services import LEDGER_HEADER, iter_ledger_csv
+
+
+class LedgerExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=41
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7), number=70
+        )
+        Account.objects.create(account_group=sales, number="1000", name="Ventes", account_type=account_type)
+        Account.objects.create(account_group=customers, number="1100", name="Clients", account_type=account_type)
+
+        def sale(day, amount, reference):
+            return {
+                'date': day,
+                'journal': 'VE',
+                'reference': reference,
+                'label': f"Facture {reference}",
+                'lines': [{'account': '411100', 'debit': amount}, {'account': '701000', 'credit': amount}],
+            }
+
+        post_entries([
+            sale(date(2025, 3, 1), '30', 'F2'),
+            sale(date(2025, 1, 15), '100', 'F1'),
+            sale(date(2024, 12, 31), '5', 'F0'),
+        ])
+
+    def read(self, lines):
+        return list(csv.reader(StringIO(''.join(lines)), delimiter=';'))
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_csv_is_ordered_by_account_then_date(self):
+        rows = self.read(iter_ledger_csv(date(2025, 1, 1), date(2025, 12, 31), chunk_size=1))
+        self.assertEqual(tuple(rows[0]), LEDGER_HEADER)
+        self.assertEqual(
+            [(row[0], row[2], row[4], row[6], row[7]) for row in rows[1:]],
+            [
+                ("411100", "2025-01-15", "F1", "100.00", "0.00"),
+                ("411100", "2025-03-01", "F2", "30.00", "0.00"),
+                ("701000", "2025-01-15", "F1", "0.00", "100.00"),
+                ("701000", "2025-03-01", "F2", "0.00", "30.00"),
+            ],
+        )
+
+    def test_view_streams_csv(self):
+        response = self.client.get(
+            reverse('ledger_export'), {'date_from': '2025-01-01', 'date_to': '2025-12-31'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertIn('grand-livre-20250101-20251231.csv', response['Content-Disposition'])
+        rows = self.read(chunk.decode('utf-8') for chunk in response.streaming_content)
+        self.assertEqual(len(rows), 5)
+
+    def test_command_writes_csv(self):
+        out = StringIO()
+        call_command('export_grand_livre', '2025-01-01', '2025-01-31', stdout=out)
+        self.assertEqual(len(self.read([out.getvalue()])), 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'grand-livre.csv')
+            call_command('export_grand_livre', '2025-01-01', '2025-12-31', output=path)
+            with open(path, encoding='utf-8', newline='') as stream:
+                self.assertEqual(len(self.read([stream.read()])), 5)
@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.services.transaction_services import post_entries
+from ..services.cache_services import LRUCache, cached_report, clear_local_cache
+
+
+class LRUCacheTest(SimpleTestCase):
+    def test_least_recently_read_entry_is_evicted(self):
+        lru = LRUCache(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+        self.assertEqual(len(lru), 2)
+
+
+class ReportCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        bank = AccountGroup.objects.create(account_class=AccountClass.objects.create(number=5), number=52)
+        cash = AccountGroup.objects.create(account_class_id=5, number=57)
+        Account.objects.create(account_group=bank, number="1000", name="Banque", account_type=account_type)
+        Account.objects.create(account_group=cash, number="1000", name="Caisse", account_type=account_type)
+        cls.post(date(2025, 1, 10))
+
+    @staticmethod
+    def post(day):
+        post_entries([{
+            'date': day,
+            'label': "Retrait",
+            'lines': [{'account': '571000', 'debit': '50.00'}, {'account': '521000', 'credit': '50.00'}],
+        }])
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        self.computed = []
+
+    def report(self, month):
+        def compute(period_ids, using):
+            self.computed.append(month)
+            return len(period_ids)
+        return cached_report('test', date(2025, month, 1), date(2025, month, 28), compute)
+
+    def test_repeat_request_costs_no_query(self):
+        self.assertEqual(self.report(1), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.report(1), 1)
+        self.assertEqual(self.computed, [1])
+
+    def test_posting_only_invalidates_its_period(self):
+        self.report(1)
+        self.report(3)
+        self.post(date(2025, 3, 5))
+        self.assertEqual((self.report(1), self.report(3)), (1, 1))
+        self.assertEqual(self.computed, [1, 3, 3])
+
+    def test_new_period_invalidates_reports_covering_it(self):
+        self.assertEqual(self.report(2), 0)
+        self.post(date(2025, 2, 5))
+        self.assertEqual(self.report(2), 1)
+
+    def test_shared_tier_is_used_by_other_processes(self):
+        self.report(1)
+        clear_local_cache()
+        self.report(1)
+        self.assertEqual(self.computed, [1])
+
+    def test_chart_change_invalidates_reports(self):
+        self.report(1)
+        Account.objects.filter(full_number='521000').update(name="Banque principale")
+        self.report(1)
+        self.assertEqual(self.computed, [1, 1])
@@ -0,0 +1,143 @@
+import csv
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from core.models import Company
+from core.tenancy import use_company
+from transactions.services.transaction_services import post_entries
+from ..models.report_job import ReportJob
+from ..services.cache_services import clear_local_cache
+from ..services.job_services import (
+    REPORT_GENERATORS, TRIAL_BALANCE_HEADER, ReportGenerator, claim_next_job, enqueue_report, run_pending_jobs,
+)
+
+
+class ReportJobTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        bank = AccountGroup.objects.create(account_class=AccountClass.objects.create(number=5), number=52)
+        cash = AccountGroup.objects.create(account_class_id=5, number=57)
+        Account.objects.create(account_group=bank, number="1000", name="Banque", account_type=account_type)
+        Account.objects.create(account_group=cash, number="1000", name="Caisse", account_type=account_type)
+        post_entries([{
+            'date': date(2025, 3, 10),
+            'label': "Retrait",
+            'lines': [
+                {'account': '571000', 'debit': '50.00'},
+                {'account': '521000', 'credit': '50.00'},
+            ],
+        }])
+
+    def setUp(self):
+        cache.clear()
+        clear_local_cache()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache_dir = override_settings(REPORT_CACHE_DIR=directory.name)
+        cache_dir.enable()
+        self.addCleanup(cache_dir.disable)
+
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+        self.async_client.force_login(user)
+
+    def request_report(self, kind='trial_balance', **data):
+        data.setdefault('date_from', '2025-01-01')
+        data.setdefault('date_to', '2025-12-31')
+        return self.client.post(reverse('report_job_create', args=[kind]), data)
+
+    def test_request_returns_job_immediately(self):
+        response = self.request_report()
+        self.assertEqual(response.status_code, 202)
+        job = ReportJob.objects.get(pk=response.json()['id'])
+        self.assertEqual(job.status, ReportJob.PENDING)
+        self.assertEqual(job.params, {'date_from': '2025-01-01', 'date_to': '2025-12-31'})
+        self.assertEqual(response['Location'], reverse('report_job_status', args=[job.pk]))
+
+        # Une demande identique en attente est réutilisée
+        self.assertEqual(self.request_report().json()['id'], job.pk)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_invalid_request(self):
+        self.assertEqual(self.request_report('inconnu').status_code, 400)
+        self.assertEqual(self.request_report(date_from='2025-12-31', date_to='2025-01-01').status_code, 400)
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_worker_generates_and_serves_file(self):
+        job_id = self.request_report().json()['id']
+        self.assertEqual(run_pending_jobs(), 1)
+        self.assertEqual(run_pending_jobs(), 0)
+
+        status = self.client.get(reverse('report_job_status', args=[job_id])).json()
+        self.assertEqual((status['status'], status['progress']), (ReportJob.DONE, 100))
+
+        response = self.client.get(status['download_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('trial_balance-2025-01-01-2025-12-31.csv', response['Content-Disposition'])
+        rows = list(csv.reader(StringIO(b''.join(response.streaming_content).decode('utf-8')), delimiter=';'))
+        self.assertEqual(tuple(rows[0]), TRIAL_BALANCE_HEADER)
+        self.assertEqual(rows[-1][:4], ["Total", "", "50.00", "50.00"])
+
+    def test_failed_generator_is_reported(self):
+        def fail(stream, date_from, date_to, progress):
+            progress(10)
+            raise RuntimeError("plus de papier")
+
+        failing = ReportGenerator("Échec", fail, 'csv', 'text/csv')
+        with mock.patch.dict(REPORT_GENERATORS, {'echec': failing}):
+            job = enqueue_report('echec', {'date_from': '2025-01-01', 'date_to': '2025-12-31'})
+            with self.assertLogs('reporting.services.job_services', 'ERROR'):
+                run_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.artifact), (ReportJob.FAILED, "plus de papier", ""))
+        self.assertEqual(self.client.get(reverse('report_job_download', args=[job.pk])).status_code, 404)
+
+    def test_job_is_claimed_once(self):
+        enqueue_report('trial_balance', {'date_from': date(2025, 1, 1), 'date_to': date(2025, 12, 31)})
+        self.assertEqual(claim_next_job().status, ReportJob.RUNNING)
+        self.assertIsNone(claim_next_job())
+
+    @override_settings(REPORT_JOB_TIMEOUT=60)
+    def test_job_abandoned_by_worker_is_failed_and_requested_again(self):
+        params = {'date_from': '2025-01-01', 'date_to': '2025-12-31'}
+        job = enqueue_report('trial_balance', params)
+        claim_next_job()
+        # Travail en cours récent : la demande est réutilisée
+        self.assertEqual(enqueue_report('trial_balance', params).pk, job.pk)
+
+        ReportJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(seconds=61))
+        retry = enqueue_report('trial_balance', params)
+        self.assertNotEqual(retry.pk, job.pk)
+        self.assertEqual(claim_next_job().pk, retry.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_jobs_are_scoped_to_company(self):
+        other = Company.objects.create(name="Filiale", slug="filiale")
+        with use_company(other):
+            job = enqueue_report('trial_balance', {'date_from': '2025-01-01', 'date_to': '2025-12-31'})
+        self.assertEqual(job.company_id, other.pk)
+        self.assertEqual(self.client.get(reverse('report_job_status', args=[job.pk])).status_code, 404)
+
+    async def test_status_view_under_asgi(self):
+        response = await self.async_client.post(
+            reverse('report_job_create', args=['trial_balance']), {'date_from': '2025-01-01', 'date_to': '2025-12-31'}
+        )
+        self.assertEqual(response.status_code, 202)
+        response = await self.async_client.get(response['Location'])
+        self.assertEqual(response.json()['status'], ReportJob.PENDING)
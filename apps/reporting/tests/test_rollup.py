@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.services.transaction_services import post_entries
+from ..services.rollup_services import RollupTotal, rollup, subtree_totals
+
+
+class AccountTreeRollupTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        cls.tiers = AccountClass.objects.create(number=4, name="Tiers")
+        cls.suppliers = AccountGroup.objects.create(account_class=cls.tiers, number=40, name="Fournisseurs")
+        customers = AccountGroup.objects.create(account_class=cls.tiers, number=41, name="Clients")
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7, name="Produits"), number=70, name="Ventes"
+        )
+        accounts = {}
+        for group, number in (
+            (cls.suppliers, "11"), (cls.suppliers, "1100"), (cls.suppliers, "1200"),
+            (customers, "1100"), (sales, "1000"),
+        ):
+            account = Account.objects.create(
+                account_group=group, number=number, name=f"Compte {number}", account_type=account_type
+            )
+            accounts[account.full_number] = account
+        cls.accounts = accounts
+
+        def entry(day, debit, credit, amount):
+            return {
+                'date': day,
+                'lines': [{'account': debit, 'debit': amount}, {'account': credit, 'credit': amount}],
+            }
+
+        post_entries([
+            entry(date(2025, 1, 10), '411100', '701000', '100'),
+            entry(date(2025, 2, 5), '701000', '401100', '30'),
+            entry(date(2025, 2, 6), '701000', '401200', '20'),
+            entry(date(2025, 2, 7), '701000', '4011', '5'),
+        ])
+
+    def test_tree_navigation_by_path(self):
+        account = self.accounts['401100']
+        self.assertEqual(account.level, 6)
+        self.assertEqual([a.full_number for a in account.get_ancestors()], ['4011'])
+        self.assertEqual([a.full_number for a in self.accounts['4011'].get_descendants()], ['401100'])
+        self.assertEqual(
+            list(Account.objects.subtree(self.suppliers).values_list('full_number', flat=True)),
+            ['4011', '401100', '401200'],
+        )
+
+    def test_subtree_totals_in_one_query(self):
+        with self.assertNumQueries(1):
+            totals = subtree_totals(self.tiers, date(2025, 1, 1), date(2025, 12, 31))
+        self.assertEqual(totals, RollupTotal('4', Decimal('100'), Decimal('55')))
+        self.assertEqual(
+            subtree_totals(self.accounts['4011'], date(2025, 1, 1), date(2025, 12, 31)).solde, Decimal('-35')
+        )
+        self.assertEqual(subtree_totals('41', date(2025, 2, 1), date(2025, 2, 28)).debit, Decimal('0'))
+
+    def test_rollup_by_depth(self):
+        with self.assertNumQueries(1):
+            rows = rollup(4, date(2025, 1, 1), date(2025, 12, 31), prefix='40')
+        self.assertEqual(rows, [RollupTotal('4011', Decimal('0'), Decimal('35')),
+                                RollupTotal('4012', Decimal('0'), Decimal('20'))])
+        self.assertEqual(
+            [(row.number, row.solde) for row in rollup(1, date(2025, 1, 1), date(2025, 12, 31))],
+            [('4', Decimal('45')), ('7', Decimal('-45'))],
+        )
@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from core.models import Company
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from transactions.services.transaction_services import post_entries
+from ..services.report_services import ACCOUNT_LEVEL, CLASS_LEVEL, GROUP_LEVEL, trial_balance
+
+
+class TrialBalanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4, name="Tiers"), number=41, name="Clients"
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7, name="Produits"), number=70, name="Ventes"
+        )
+        for group, number, name in (
+            (customers, "1100", "Clients locaux"),
+            (customers, "1200", "Clients export"),
+            (sales, "1000", "Ventes de marchandises"),
+        ):
+            Account.objects.create(account_group=group, number=number, name=name, account_type=account_type)
+
+        def sale(day, customer, amount):
+            return {
+                'date': day,
+                'lines': [{'account': customer, 'debit': amount}, {'account': '701000', 'credit': amount}],
+            }
+
+        post_entries([
+            sale(date(2025, 1, 10), '411100', '100'),
+            sale(date(2025, 3, 5), '411200', '40.50'),
+            sale(date(2024, 12, 31), '411100', '999'),
+        ])
+
+    def setUp(self):
+        user = get_user_model().objects.create_user('comptable')
+        Company.objects.get_default().members.add(user)
+        self.client.force_login(user)
+
+    def test_rows_follow_chart_order_with_rollups(self):
+        balance = trial_balance(date(2025, 1, 1), date(2025, 12, 31))
+        self.assertEqual(
+            [(row.level, row.number, row.debit, row.credit) for row in balance.rows],
+            [
+                (CLASS_LEVEL, "4", Decimal('140.50'), Decimal('0')),
+                (GROUP_LEVEL, "41", Decimal('140.50'), Decimal('0')),
+                (ACCOUNT_LEVEL, "411100", Decimal('100'), Decimal('0')),
+                (ACCOUNT_LEVEL, "411200", Decimal('40.50'), Decimal('0')),
+                (CLASS_LEVEL, "7", Decimal('0'), Decimal('140.50')),
+                (GROUP_LEVEL, "70", Decimal('0'), Decimal('140.50')),
+                (ACCOUNT_LEVEL, "701000", Decimal('0'), Decimal('140.50')),
+            ],
+        )
+        self.assertEqual(balance.total_debit, balance.total_credit)
+        self.assertEqual(balance.classes[1].solde_crediteur, Decimal('140.50'))
+
+    def test_amounts_are_quantized_to_the_cent(self):
+        # SQLite renvoie 100 et 0 en entiers : ils doivent s'afficher 100.00 et 0.00
+        balance = trial_balance(date(2025, 1, 1), date(2025, 12, 31))
+        self.assertEqual(
+            {str(amount) for row in balance.rows if row.number == "411100" for amount in (row.debit, row.credit)},
+            {'100.00', '0.00'},
+        )
+        self.assertEqual(
+            {amount.as_tuple().exponent for row in balance.rows for amount in (row.debit, row.credit)},
+            {-2},
+        )
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            trial_balance(date(2025, 1, 1), date(2025, 1, 31))
+
+    def test_view(self):
+        response = self.client.get(
+            reverse('trial_balance'), {'date_from': '2025-01-01', 'date_to': '2025-01-31'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "411100")
+        self.assertNotContains(response, "411200")
@@ -1 +1 @@
- 
+from .report_urls import urlpatterns  # noqa: F401
@@ -1 +1,12 @@
- 
+from django.urls import path
+from ..views.job_views import report_job_create, report_job_download, report_job_status
+from ..views.report_views import account_balances, ledger_export, trial_balance_view
+
+urlpatterns = [
+    path('balance-generale/', trial_balance_view, name='trial_balance'),
+    path('grand-livre/export/', ledger_export, name='ledger_export'),
+    path('soldes/', account_balances, name='account_balances'),
+    path('generer/<slug:kind>/', report_job_create, name='report_job_create'),
+    path('travaux/<int:pk>/', report_job_status, name='report_job_status'),
+    path('travaux/<int:pk>/fichier/', report_job_download, name='report_job_download'),
+]
@@ -0,0 +1,76 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.urls import reverse
+from django.views import View
+
+from ..models.report_job import ReportJob
+from ..services.job_services import REPORT_GENERATORS, enqueue_report, get_artifact_path
+from .report_views import PeriodMixin
+
+# Vues asynchrones : sous ASGI, elles n'occupent pas de thread du serveur pendant
+# qu'un rapport est généré. La génération elle-même se fait en arrière-plan.
+# login_required est appliqué à la vue : il lit l'utilisateur sans bloquer (request.auser()).
+
+
+def job_payload(job):
+    payload = {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error,
+        'status_url': reverse('report_job_status', args=[job.pk]),
+        'download_url': None,
+    }
+    if job.status == ReportJob.DONE:
+        payload['download_url'] = reverse('report_job_download', args=[job.pk])
+    return payload
+
+
+class ReportJobCreateView(PeriodMixin, View):
+    """Demande la génération d'un rapport ; répond aussitôt avec l'identifiant du travail"""
+    http_method_names = ['post']
+
+    async def post(self, request, kind):
+        date_from, date_to = self.get_period()
+        try:
+            job = await sync_to_async(enqueue_report)(kind, {'date_from': date_from, 'date_to': date_to})
+        except ValueError as exc:
+            return JsonResponse({'error': str(exc)}, status=400)
+        payload = job_payload(job)
+        return JsonResponse(payload, status=202, headers={'Location': payload['status_url']})
+
+report_job_create = login_required(ReportJobCreateView.as_view())
+
+
+class ReportJobStatusView(View):
+    """État et avancement d'un travail, interrogé périodiquement par le client"""
+
+    async def get(self, request, pk):
+        job = await ReportJob.objects.filter(pk=pk).afirst()
+        if job is None:
+            raise Http404("Travail introuvable")
+        return JsonResponse(job_payload(job))
+
+report_job_status = login_required(ReportJobStatusView.as_view())
+
+
+class ReportJobDownloadView(View):
+    """Sert le fichier d'un rapport terminé depuis le cache, sans le recalculer"""
+
+    async def get(self, request, pk):
+        job = await ReportJob.objects.filter(pk=pk, status=ReportJob.DONE).afirst()
+        generator = REPORT_GENERATORS.get(job.kind) if job else None
+        if generator is None:
+            raise Http404("Rapport indisponible")
+        try:
+            stream = open(get_artifact_path(job.artifact), 'rb')
+        except FileNotFoundError:
+            raise Http404("Rapport indisponible")
+        filename = f"{job.kind}-{job.params['date_from']}-{job.params['date_to']}.{generator.extension}"
+        response = FileResponse(stream, as_attachment=True, filename=filename)
+        response['Content-Type'] = generator.content_type
+        return response
+
+report_job_download = login_required(ReportJobDownloadView.as_view())
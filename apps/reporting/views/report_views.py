@@ -1 +1,109 @@
- 
+import tempfile
+from datetime import date
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.dateparse import parse_date
+from django.views import View
+from django.views.generic import TemplateView
+
+from accounts.models.account import Account
+from core.routers import reporting_reads
+from transactions.services.balance_services import get_balances
+from ..services.ledger_services import iter_ledger_csv, write_ledger_xlsx
+from ..services.report_services import cached_trial_balance
+
+
+class ReportingReadsMixin:
+    """Vue en lecture seule : ses requêtes vont à la réplique des rapports"""
+
+    def dispatch(self, request, *args, **kwargs):
+        with reporting_reads():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class PeriodMixin:
+    """Lit la période demandée (date_from, date_to), par défaut l'année civile en cours"""
+
+    def get_period(self):
+        today = date.today()
+        date_from = self._get_date('date_from') or today.replace(month=1, day=1)
+        date_to = self._get_date('date_to') or today.replace(month=12, day=31)
+        return date_from, date_to
+
+    def _get_date(self, name):
+        data = self.request.POST if self.request.method == 'POST' else self.request.GET
+        try:
+            return parse_date(data.get(name, ''))
+        except ValueError:
+            return None
+
+
+class TrialBalanceView(LoginRequiredMixin, ReportingReadsMixin, PeriodMixin, TemplateView):
+    template_name = 'reporting/trial_balance.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['balance'] = cached_trial_balance(*self.get_period())
+        return context
+
+trial_balance_view = TrialBalanceView.as_view()
+
+
+class LedgerExportView(LoginRequiredMixin, ReportingReadsMixin, PeriodMixin, View):
+    """Export du grand livre en CSV (streamé) ou en XLSX (?format=xlsx)"""
+
+    def get(self, request):
+        date_from, date_to = self.get_period()
+        filename = f"grand-livre-{date_from:%Y%m%d}-{date_to:%Y%m%d}"
+
+        if request.GET.get('format') == 'xlsx':
+            # Un classeur XLSX est une archive zip : il est écrit dans un fichier
+            # temporaire (en mode write_only) puis envoyé par blocs
+            output = tempfile.TemporaryFile()
+            try:
+                write_ledger_xlsx(output, date_from, date_to)
+            except ImproperlyConfigured as exc:
+                output.close()
+                return HttpResponse(str(exc), status=501)
+            output.seek(0)
+            return FileResponse(output, as_attachment=True, filename=f"{filename}.xlsx")
+
+        response = StreamingHttpResponse(
+            iter_ledger_csv(date_from, date_to),
+            content_type='text/csv; charset=utf-8',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
+
+ledger_export = LedgerExportView.as_view()
+
+
+class AccountBalancesView(LoginRequiredMixin, ReportingReadsMixin, View):
+    """
+    Soldes de comptes à plusieurs dates, en JSON colonnaire :
+    ?comptes=401100,411100 (ou ?prefixe=41) & dates=2025-01-31,2025-02-28
+    """
+
+    def get(self, request):
+        try:
+            dates = [parse_date(value) for value in request.GET.get('dates', '').split(',') if value]
+        except ValueError:
+            dates = [None]
+        if not dates or None in dates:
+            return JsonResponse({'error': "Dates invalides (format AAAA-MM-JJ, séparées par des virgules)."}, status=400)
+
+        accounts = Account.objects.only('id', 'full_number')
+        if request.GET.get('prefixe'):
+            accounts = list(accounts.with_prefix(request.GET['prefixe']))
+        else:
+            numbers = [number for number in request.GET.get('comptes', '').split(',') if number]
+            by_number = {account.full_number: account for account in accounts.filter(full_number__in=numbers)}
+            unknown = [number for number in numbers if number not in by_number]
+            if not numbers or unknown:
+                return JsonResponse({'error': "Comptes inconnus : " + ", ".join(unknown or ['?'])}, status=400)
+            accounts = [by_number[number] for number in numbers]
+        return JsonResponse(get_balances(accounts, dates).as_json())
+
+account_balances = AccountBalancesView.as_view()
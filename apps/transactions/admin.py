@@ -1 +1,39 @@
- 
+from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
+from .models.fiscal_period import FiscalPeriod
+from .models.journal_entry import JournalEntry
+from .models.journal_line import JournalLine
+from .services.closing_services import close_period
+
+
+class JournalLineInline(admin.TabularInline):
+    model = JournalLine
+    fields = ('account', 'label', 'debit', 'credit')
+    autocomplete_fields = ('account',)
+    extra = 2
+
+
+@admin.register(JournalEntry)
+class JournalEntryAdmin(admin.ModelAdmin):
+    list_display = ('date', 'journal', 'reference', 'label')
+    list_filter = ('journal',)
+    search_fields = ('reference', 'label')
+    date_hierarchy = 'date'
+    inlines = [JournalLineInline]
+
+
+@admin.register(FiscalPeriod)
+class FiscalPeriodAdmin(admin.ModelAdmin):
+    list_display = ('start_date', 'end_date', 'is_closed')
+    list_filter = ('is_closed',)
+    actions = ['close_periods']
+
+    @admin.action(description="Clôturer les périodes sélectionnées")
+    def close_periods(self, request, queryset):
+        for period in queryset.filter(is_closed=False).order_by('start_date'):
+            try:
+                close_period(period)
+            except ValidationError as exc:
+                self.message_user(request, " ".join(exc.messages), messages.ERROR)
+                return
+            self.message_user(request, f"Période {period} clôturée.", messages.SUCCESS)
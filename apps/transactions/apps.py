@@ -1 +1,5 @@
- 
+from django.apps import AppConfig
+
+class TransactionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'transactions'
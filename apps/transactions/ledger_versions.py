@@ -0,0 +1,62 @@
+"""
+Versions du grand livre par société et par période (mois).
+
+Chaque modification des soldes d'une période augmente sa version, partagée
+entre processus via le cache Django (même principe que la version du plan
+comptable, voir accounts.services.chart_services). Les clés ne dépendent que
+de la société et du mois : les versions d'un intervalle de dates se lisent
+sans requête SQL.
+
+Un résultat calculé sur un intervalle reste valable tant que les versions de
+ses mois n'ont pas changé : une écriture en mars n'invalide pas les rapports
+de janvier, et ceux d'une période clôturée, qui ne reçoit plus d'écritures,
+ne le sont jamais.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _key(company_id, month):
+    return f'transactions:ledger_version:{company_id}:{month:%Y-%m}'
+
+
+def months_between(date_from, date_to):
+    """Premiers jours des mois de l'intervalle"""
+    month = date_from.replace(day=1)
+    while month <= date_to:
+        yield month
+        month = month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def get_ledger_versions(company_id, date_from, date_to):
+    """Retourne en un accès au cache les versions des mois de l'intervalle"""
+    keys = [_key(company_id, month) for month in months_between(date_from, date_to)]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Valeur initiale imprévisible : une clé évincée ne doit pas retomber sur une ancienne version
+        initial = time.time_ns()
+        for key in missing:
+            cache.add(key, initial, timeout=None)
+        versions.update(cache.get_many(missing))
+    return tuple(versions.get(key) for key in keys)
+
+
+def invalidate_ledger(company_id, months, using=None):
+    """Augmente la version des mois dont les soldes viennent d'être modifiés"""
+    keys = {_key(company_id, month) for month in months}
+    if not keys:
+        return
+    _bump(keys)
+    # Un calcul fait par un autre processus avant le commit serait périmé
+    transaction.on_commit(lambda: _bump(keys), using=using)
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
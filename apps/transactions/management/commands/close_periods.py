@@ -0,0 +1,43 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+from core.models import Company
+from transactions.services.closing_services import close_periods
+
+class Command(BaseCommand):
+    help = 'Clôture dans l\'ordre les périodes ouvertes jusqu\'au mois donné et archive leurs lignes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('until', help="Dernier mois à clôturer (AAAA-MM)")
+        parser.add_argument(
+            '--company',
+            help="Identifiant (slug) de la société (défaut : société par défaut)",
+        )
+
+    def handle(self, *args, **options):
+        until = self._parse_month(options['until'])
+        company = self._get_company(options['company'])
+        try:
+            closed = close_periods(until, company)
+        except ValidationError as exc:
+            raise CommandError(" ".join(exc.messages))
+        for period in closed:
+            self.stdout.write(f"Période {period} clôturée")
+        self.stdout.write(self.style.SUCCESS(f"{len(closed)} période(s) clôturée(s)."))
+
+    def _parse_month(self, value):
+        try:
+            day = parse_date(f"{value}-01")
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"Mois invalide : {value}")
+        return day
+
+    def _get_company(self, slug):
+        if slug is None:
+            return None
+        try:
+            return Company.objects.get(slug=slug)
+        except Company.DoesNotExist:
+            raise CommandError(f"Société inconnue : {slug}")
@@ -0,0 +1,74 @@
+import csv
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from core.models import Company
+from transactions.services.journal_import_services import import_journal, read_bank_statement, read_journal_file
+
+class Command(BaseCommand):
+    help = 'Importe des écritures depuis un fichier FEC, un journal CSV ou un relevé bancaire CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help="Fichier FEC ou CSV (en-tête : entry, date, journal, reference, label, account, debit, credit)",
+        )
+        parser.add_argument(
+            '--bank-account',
+            help="Relevé bancaire (en-tête : date, label, amount[, reference]) : numéro du compte de banque",
+        )
+        parser.add_argument(
+            '--counterpart-account',
+            default='471000',
+            help="Relevé bancaire : compte de contrepartie des opérations (défaut : 471000, compte d'attente)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help="Écritures enregistrées par transaction (défaut : settings.JOURNAL_IMPORT_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            '--resume-after',
+            type=int,
+            default=0,
+            help="Reprend l'import après cette ligne du fichier (dernière ligne enregistrée d'un import interrompu)",
+        )
+        parser.add_argument(
+            '--company',
+            help="Identifiant (slug) de la société (défaut : société par défaut)",
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            try:
+                company = Company.objects.get(slug=options['company'])
+            except Company.DoesNotExist:
+                raise CommandError(f"Société inconnue : {options['company']}")
+
+        if options['bank_account']:
+            rows = read_bank_statement(options['path'], options['bank_account'], options['counterpart_account'])
+        else:
+            rows = read_journal_file(options['path'])
+
+        started = time.perf_counter()
+        try:
+            report = import_journal(
+                rows, batch_size=options['batch_size'], resume_after=options['resume_after'], company=company
+            )
+        except (OSError, ValueError, csv.Error) as exc:
+            raise CommandError(f"Lecture du fichier impossible : {exc}")
+
+        for error in report.errors:
+            self.stderr.write(str(error))
+
+        elapsed = time.perf_counter() - started
+        if not report.complete:
+            raise CommandError(
+                f"Import interrompu après {report.entries} écriture(s) : relancer avec "
+                f"--resume-after {report.last_line} pour reprendre après le dernier lot enregistré."
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.entries} écriture(s) ({report.lines} ligne(s)) enregistrée(s) en {report.batches} lot(s), "
+            f"{len(report.errors)} erreur(s) en {elapsed:.1f} s. Dernière ligne enregistrée : {report.last_line}."
+        ))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0010_account_full_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('journal', models.CharField(choices=[('AC', 'Achats'), ('VE', 'Ventes'), ('BQ', 'Banque'), ('CA', 'Caisse'), ('OD', 'Opérations diverses')], default='OD', max_length=5, verbose_name='Journal')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('reference', models.CharField(blank=True, help_text='Numéro de la pièce justificative.', max_length=50, verbose_name='Référence')),
+                ('label', models.CharField(max_length=255, verbose_name='Libellé')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Écriture comptable',
+                'verbose_name_plural': 'Écritures comptables',
+                'ordering': ['date', 'id'],
+                'indexes': [models.Index(fields=['date'], name='journal_entry_date_idx'), models.Index(fields=['journal', 'date'], name='journal_entry_journal_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('label', models.CharField(blank=True, max_length=255, verbose_name='Libellé')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Débit')),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Crédit')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='journal_lines', to='accounts.account', verbose_name='Compte')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='transactions.journalentry', verbose_name='Écriture')),
+            ],
+            options={
+                'verbose_name': "Ligne d'écriture",
+                'verbose_name_plural': "Lignes d'écriture",
+                'ordering': ['date', 'id'],
+                'indexes': [models.Index(fields=['account', 'date'], name='journal_line_account_date_idx')],
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('credit', 0), ('debit__gt', 0)), models.Q(('credit__gt', 0), ('debit', 0)), _connector='OR'), name='journal_line_debit_xor_credit')],
+            },
+        ),
+    ]
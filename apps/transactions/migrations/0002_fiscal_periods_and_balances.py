@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:39
+
+import calendar
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_periods_and_balances(apps, schema_editor):
+    FiscalPeriod = apps.get_model('transactions', 'FiscalPeriod')
+    JournalLine = apps.get_model('transactions', 'JournalLine')
+    AccountBalance = apps.get_model('transactions', 'AccountBalance')
+
+    for day in JournalLine.objects.dates('date', 'month'):
+        end_date = day.replace(day=calendar.monthrange(day.year, day.month)[1])
+        period = FiscalPeriod.objects.create(start_date=day, end_date=end_date)
+        JournalLine.objects.filter(date__gte=day, date__lte=end_date).update(period=period)
+
+    AccountBalance.objects.bulk_create([
+        AccountBalance(
+            account_id=row['account_id'],
+            period_id=row['period_id'],
+            debit=row['total_debit'],
+            credit=row['total_credit'],
+        )
+        for row in JournalLine.objects.values('account_id', 'period_id').annotate(
+            total_debit=Sum('debit'), total_credit=Sum('credit')
+        ).order_by()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_account_full_number'),
+        ('transactions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FiscalPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField(unique=True, verbose_name='Début')),
+                ('end_date', models.DateField(verbose_name='Fin')),
+                ('is_closed', models.BooleanField(default=False, verbose_name='Clôturée')),
+            ],
+            options={
+                'verbose_name': 'Période comptable',
+                'verbose_name_plural': 'Périodes comptables',
+                'ordering': ['start_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='journalline',
+            name='period',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='transactions.fiscalperiod', verbose_name='Période'),
+        ),
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Total débit')),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Total crédit')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='accounts.account', verbose_name='Compte')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='balances', to='transactions.fiscalperiod', verbose_name='Période')),
+            ],
+            options={
+                'verbose_name': 'Solde de compte',
+                'verbose_name_plural': 'Soldes de comptes',
+                'constraints': [models.UniqueConstraint(fields=('account', 'period'), name='account_balance_unique_period')],
+            },
+        ),
+        migrations.RunPython(backfill_periods_and_balances, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='journalline',
+            name='period',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='transactions.fiscalperiod', verbose_name='Période'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:00
+
+import core.tenancy
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_account_company'),
+        ('core', '0001_initial'),
+        ('transactions', '0002_fiscal_periods_and_balances'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='accountbalance',
+            name='account_balance_unique_period',
+        ),
+        migrations.RemoveIndex(
+            model_name='journalentry',
+            name='journal_entry_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='journalentry',
+            name='journal_entry_journal_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='journalline',
+            name='journal_line_account_date_idx',
+        ),
+        migrations.AddField(
+            model_name='accountbalance',
+            name='company',
+            field=models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société'),
+        ),
+        migrations.AddField(
+            model_name='fiscalperiod',
+            name='company',
+            field=models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société'),
+        ),
+        migrations.AddField(
+            model_name='journalentry',
+            name='company',
+            field=models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société'),
+        ),
+        migrations.AddField(
+            model_name='journalline',
+            name='company',
+            field=models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société'),
+        ),
+        migrations.AlterField(
+            model_name='fiscalperiod',
+            name='start_date',
+            field=models.DateField(verbose_name='Début'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['company', 'date'], name='journal_entry_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalentry',
+            index=models.Index(fields=['company', 'journal', 'date'], name='journal_entry_journal_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='journalline',
+            index=models.Index(fields=['company', 'account', 'date'], name='journal_line_account_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='accountbalance',
+            constraint=models.UniqueConstraint(fields=('company', 'account', 'period'), name='account_balance_unique_period'),
+        ),
+        migrations.AddConstraint(
+            model_name='fiscalperiod',
+            constraint=models.UniqueConstraint(fields=('company', 'start_date'), name='fiscal_period_company_start_uniq'),
+        ),
+    ]
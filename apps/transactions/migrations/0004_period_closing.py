@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:26
+
+import core.tenancy
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_account_company'),
+        ('core', '0001_initial'),
+        ('transactions', '0003_company'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJournalLine',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('date', models.DateField(verbose_name='Date')),
+                ('label', models.CharField(blank=True, max_length=255, verbose_name='Libellé')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Débit')),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=15, verbose_name='Crédit')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_journal_lines', to='accounts.account', verbose_name='Compte')),
+                ('company', models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_lines', to='transactions.journalentry', verbose_name='Écriture')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_lines', to='transactions.fiscalperiod', verbose_name='Période')),
+            ],
+            options={
+                'verbose_name': "Ligne d'écriture archivée",
+                'verbose_name_plural': "Lignes d'écriture archivées",
+                'ordering': ['date', 'id'],
+                'indexes': [models.Index(fields=['company', 'account', 'date'], name='archived_line_account_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OpeningBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Total débit')),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=17, verbose_name='Total crédit')),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_balances', to='accounts.account', verbose_name='Compte')),
+                ('company', models.ForeignKey(default=core.tenancy.get_company_id, editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.company', verbose_name='Société')),
+                ('period', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opening_balances', to='transactions.fiscalperiod', verbose_name='Période')),
+            ],
+            options={
+                'verbose_name': 'À-nouveau',
+                'verbose_name_plural': 'À-nouveaux',
+                'constraints': [models.UniqueConstraint(fields=('company', 'account', 'period'), name='opening_balance_unique_period')],
+            },
+        ),
+    ]
@@ -1 +1,10 @@
- 
+from .fiscal_period import FiscalPeriod
+from .journal_entry import JournalEntry
+from .journal_line import JournalLine
+from .archived_journal_line import ArchivedJournalLine
+from .account_balance import AccountBalance
+from .opening_balance import OpeningBalance
+
+__all__ = [
+    'FiscalPeriod', 'JournalEntry', 'JournalLine', 'ArchivedJournalLine', 'AccountBalance', 'OpeningBalance',
+]
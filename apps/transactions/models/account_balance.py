@@ -0,0 +1,90 @@
+from django.db import connections, models, router
+
+from core.models import TenantManager, TenantModel
+from core.tenancy import get_company_id
+from ..ledger_versions import invalidate_ledger
+from .fiscal_period import FiscalPeriod, period_months
+
+
+class AccountBalanceQuerySet(models.QuerySet):
+
+    # Lignes par requête (5 paramètres par ligne, sous la limite de SQLite)
+    UPSERT_BATCH_SIZE = 500
+
+    def apply_deltas(self, deltas, company=None):
+        """
+        Ajoute des mouvements aux soldes matérialisés de la société.
+        deltas : {(account_id, period_id): (débit, crédit)}
+
+        Un seul INSERT ... ON CONFLICT DO UPDATE par lot (syntaxe commune à
+        SQLite et PostgreSQL) : l'incrément est atomique, même entre
+        transactions concurrentes, sans lecture préalable des soldes.
+        La version des périodes touchées change (voir ledger_versions).
+        """
+        company_id = get_company_id(company)
+        rows = [
+            (company_id, account_id, period_id, debit, credit)
+            for (account_id, period_id), (debit, credit) in deltas.items()
+            if debit or credit
+        ]
+        if not rows:
+            return
+        # Écriture en SQL brut : self.db désignerait la base de lecture
+        connection = connections[self._db or router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        opts = self.model._meta
+        table = quote(opts.db_table)
+        company, account, period, debit, credit = (
+            quote(opts.get_field(name).column) for name in ('company', 'account', 'period', 'debit', 'credit')
+        )
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.UPSERT_BATCH_SIZE):
+                chunk = rows[start:start + self.UPSERT_BATCH_SIZE]
+                cursor.execute(
+                    f"INSERT INTO {table} ({company}, {account}, {period}, {debit}, {credit}) VALUES "
+                    + ", ".join(["(%s, %s, %s, %s, %s)"] * len(chunk))
+                    + f" ON CONFLICT ({company}, {account}, {period}) DO UPDATE SET"
+                    f" {debit} = {table}.{debit} + excluded.{debit},"
+                    f" {credit} = {table}.{credit} + excluded.{credit}",
+                    [value for row in chunk for value in row],
+                )
+        invalidate_ledger(company_id, period_months({row[2] for row in rows}, connection.alias), connection.alias)
+
+
+class AccountBalance(TenantModel):
+    """
+    Solde matérialisé d'un compte sur une période : totaux des débits et crédits
+    de la période, tenus à jour par le service de saisie.
+    """
+    account = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.CASCADE,
+        related_name='balances',
+        verbose_name="Compte"
+    )
+    period = models.ForeignKey(
+        FiscalPeriod,
+        on_delete=models.CASCADE,
+        related_name='balances',
+        verbose_name="Période"
+    )
+    debit = models.DecimalField(max_digits=17, decimal_places=2, default=0, verbose_name="Total débit")
+    credit = models.DecimalField(max_digits=17, decimal_places=2, default=0, verbose_name="Total crédit")
+
+    objects = TenantManager.from_queryset(AccountBalanceQuerySet)()
+
+    class Meta:
+        app_label = 'transactions'
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'account', 'period'], name='account_balance_unique_period'),
+        ]
+        verbose_name = "Solde de compte"
+        verbose_name_plural = "Soldes de comptes"
+
+    def __str__(self):
+        return f"{self.account_id} {self.period_id} : {self.balance}"
+
+    @property
+    def balance(self):
+        """Solde de la période (positif = débiteur, négatif = créditeur)"""
+        return self.debit - self.credit
@@ -0,0 +1,48 @@
+from django.db import models
+
+from core.models import TenantModel
+from .fiscal_period import FiscalPeriod
+from .journal_entry import JournalEntry
+
+
+class ArchivedJournalLine(TenantModel):
+    """
+    Ligne d'écriture d'une période clôturée, déplacée hors de la table des lignes
+    (voir closing_services) : la table des lignes ne contient que les périodes ouvertes.
+    La ligne garde son id d'origine et n'est plus modifiable.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    entry = models.ForeignKey(
+        JournalEntry,
+        on_delete=models.PROTECT,
+        related_name='archived_lines',
+        verbose_name="Écriture"
+    )
+    account = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        related_name='archived_journal_lines',
+        verbose_name="Compte"
+    )
+    period = models.ForeignKey(
+        FiscalPeriod,
+        on_delete=models.PROTECT,
+        related_name='archived_lines',
+        verbose_name="Période"
+    )
+    date = models.DateField(verbose_name="Date")
+    label = models.CharField(max_length=255, blank=True, verbose_name="Libellé")
+    debit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Débit")
+    credit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Crédit")
+
+    class Meta:
+        app_label = 'transactions'
+        ordering = ['date', 'id']
+        indexes = [
+            models.Index(fields=['company', 'account', 'date'], name='archived_line_account_date_idx'),
+        ]
+        verbose_name = "Ligne d'écriture archivée"
+        verbose_name_plural = "Lignes d'écriture archivées"
+
+    def __str__(self):
+        return f"{self.account_id} D {self.debit} / C {self.credit}"
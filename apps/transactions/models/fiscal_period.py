@@ -0,0 +1,125 @@
+import calendar
+
+from django.core.cache import cache
+from django.db import models, transaction
+
+from core.models import TenantManager, TenantModel
+from core.tenancy import get_company_id
+
+
+def month_bounds(day):
+    """Retourne le premier et le dernier jour du mois d'une date"""
+    last_day = calendar.monthrange(day.year, day.month)[1]
+    return day.replace(day=1), day.replace(day=last_day)
+
+
+# {id de période: premier jour du mois}, mémorisé par processus : une période ne change pas de mois
+_period_months = {}
+
+
+class FiscalPeriodQuerySet(models.QuerySet):
+
+    def for_dates(self, dates, company=None):
+        """
+        Retourne {premier jour du mois: période} de la société pour les dates
+        données, en créant en une requête les périodes manquantes.
+        """
+        company_id = get_company_id(company)
+        bounds = {month_bounds(day) for day in dates}
+        starts = {start for start, _ in bounds}
+        queryset = self.filter(company_id=company_id, start_date__in=starts)
+        periods = {period.start_date: period for period in queryset}
+        missing = [
+            self.model(company_id=company_id, start_date=start, end_date=end)
+            for start, end in bounds if start not in periods
+        ]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            periods = {period.start_date: period for period in queryset.all()}
+            # Le premier mois ouvert ne change que si une période est créée avant lui
+            cached = cache.get(_first_open_key(company_id))
+            if cached is None or cached[0] is None or min(period.start_date for period in missing) < cached[0]:
+                forget_first_open_month(company_id)
+        _period_months.update((period.pk, start) for start, period in periods.items())
+        return periods
+
+    def closed_through(self, company=None):
+        """
+        Dernier jour de la dernière période clôturée de la société, ou None.
+        Les clôtures se font dans l'ordre : aucune écriture n'est acceptée
+        jusqu'à cette date, même dans un mois qui n'a pas encore de période.
+        """
+        return self.filter(company_id=get_company_id(company), is_closed=True).aggregate(
+            end=models.Max('end_date')
+        )['end']
+
+    def for_date(self, day, company=None):
+        """Retourne (en la créant si besoin) la période contenant la date"""
+        return self.for_dates([day], company)[day.replace(day=1)]
+
+
+class FiscalPeriod(TenantModel):
+    """
+    Période comptable (mois) d'une société. Les soldes des comptes sont matérialisés par période.
+    """
+    start_date = models.DateField(verbose_name="Début")
+    end_date = models.DateField(verbose_name="Fin")
+    is_closed = models.BooleanField(default=False, verbose_name="Clôturée")
+
+    objects = TenantManager.from_queryset(FiscalPeriodQuerySet)()
+
+    class Meta:
+        app_label = 'transactions'
+        ordering = ['start_date']
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'start_date'], name='fiscal_period_company_start_uniq'),
+        ]
+        verbose_name = "Période comptable"
+        verbose_name_plural = "Périodes comptables"
+
+    def __str__(self):
+        return f"{self.start_date:%m/%Y}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Une clôture ou une nouvelle période peut déplacer le premier mois ouvert
+        forget_first_open_month(self.company_id)
+
+
+def _first_open_key(company_id):
+    return f'transactions:first_open_month:{company_id}'
+
+
+def first_open_month(company_id, using=None):
+    """
+    Premier jour de la première période ouverte de la société (None si aucune),
+    mémorisé dans le cache partagé. Les mois antérieurs sont clôturés : leurs
+    soldes ne changent plus, et les rapports cumulés n'en dépendent pas.
+    """
+    key = _first_open_key(company_id)
+    cached = cache.get(key)
+    if cached is None:
+        start = FiscalPeriod._base_manager.using(using).filter(
+            company_id=company_id, is_closed=False
+        ).aggregate(start=models.Min('start_date'))['start']
+        # Tuple : une société sans période ouverte est aussi mémorisée
+        cached = (start,)
+        cache.set(key, cached, timeout=None)
+    return cached[0]
+
+
+def forget_first_open_month(company_id):
+    keys = [_first_open_key(company_id)]
+    cache.delete_many(keys)
+    # Une lecture faite par un autre processus avant le commit serait périmée
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def period_months(period_ids, using=None):
+    """Premiers jours des mois des périodes données (sans requête pour les périodes déjà vues)"""
+    missing = set(period_ids) - _period_months.keys()
+    if missing:
+        _period_months.update(
+            FiscalPeriod._base_manager.using(using).filter(pk__in=missing).values_list('pk', 'start_date')
+        )
+    return {_period_months[period_id] for period_id in period_ids if period_id in _period_months}
@@ -0,0 +1,100 @@
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Sum
+
+from core.models import TenantManager, TenantModel
+
+
+def _delete_lines(model, entry_ids):
+    """Supprime les lignes des écritures en retirant leurs mouvements des soldes (voir JournalLineQuerySet)"""
+    line_model = model._meta.get_field('lines').related_model
+    # QuerySet des lignes sans filtre de société : les écritures désignées suffisent
+    line_model._default_manager._queryset_class(model=line_model).filter(entry_id__in=entry_ids).delete()
+
+
+class JournalEntryQuerySet(models.QuerySet):
+    """
+    QuerySet des écritures : la suppression en masse (action de l'admin comprise)
+    corrige les soldes avant que la cascade ne supprime les lignes.
+    """
+
+    def delete(self):
+        with transaction.atomic():
+            _delete_lines(self.model, list(self.values_list('pk', flat=True)))
+            return super().delete()
+
+
+class JournalEntry(TenantModel):
+    """
+    Écriture comptable : en-tête regroupant des lignes au débit et au crédit
+    qui doivent être équilibrées (partie double).
+    """
+    ACHATS = 'AC'
+    VENTES = 'VE'
+    BANQUE = 'BQ'
+    CAISSE = 'CA'
+    OPERATIONS_DIVERSES = 'OD'
+
+    JOURNAL_CHOICES = [
+        (ACHATS, "Achats"),
+        (VENTES, "Ventes"),
+        (BANQUE, "Banque"),
+        (CAISSE, "Caisse"),
+        (OPERATIONS_DIVERSES, "Opérations diverses"),
+    ]
+
+    journal = models.CharField(
+        max_length=5,
+        choices=JOURNAL_CHOICES,
+        default=OPERATIONS_DIVERSES,
+        verbose_name="Journal"
+    )
+    date = models.DateField(verbose_name="Date")
+    reference = models.CharField(
+        max_length=50,
+        blank=True,
+        verbose_name="Référence",
+        help_text="Numéro de la pièce justificative."
+    )
+    label = models.CharField(max_length=255, verbose_name="Libellé")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TenantManager.from_queryset(JournalEntryQuerySet)()
+
+    class Meta:
+        app_label = 'transactions'
+        ordering = ['date', 'id']
+        indexes = [
+            models.Index(fields=['company', 'date'], name='journal_entry_date_idx'),
+            models.Index(fields=['company', 'journal', 'date'], name='journal_entry_journal_idx'),
+        ]
+        verbose_name = "Écriture comptable"
+        verbose_name_plural = "Écritures comptables"
+
+    def __str__(self):
+        return f"{self.date:%d/%m/%Y} {self.journal} - {self.label}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Les lignes recopient la date de l'écriture (et changent éventuellement de période)
+        for line in self.lines.exclude(date=self.date):
+            line.date = self.date
+            line.save()
+
+    def delete(self, *args, **kwargs):
+        # La cascade ne passe pas par JournalLine.delete : les soldes sont corrigés ici
+        with transaction.atomic():
+            _delete_lines(type(self), [self.pk])
+            return super().delete(*args, **kwargs)
+
+    def clean(self):
+        # Une écriture enregistrée doit être équilibrée (total débit = total crédit)
+        if self.pk:
+            totals = self.lines.aggregate(debit=Sum('debit'), credit=Sum('credit'))
+            debit = totals['debit'] or 0
+            credit = totals['credit'] or 0
+            if debit != credit:
+                raise ValidationError(
+                    f"L'écriture n'est pas équilibrée : débit {debit} ≠ crédit {credit}."
+                )
+        super().clean()
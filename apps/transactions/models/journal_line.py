@@ -0,0 +1,118 @@
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Q, Sum
+
+from core.models import TenantManager, TenantModel
+from .account_balance import AccountBalance
+from .fiscal_period import FiscalPeriod
+from .journal_entry import JournalEntry
+
+
+class JournalLineQuerySet(models.QuerySet):
+    """QuerySet des lignes dont la suppression en masse retire leurs mouvements des soldes"""
+
+    def delete(self):
+        with transaction.atomic():
+            # Mouvements des lignes supprimées, agrégés en une requête par (société, compte, période)
+            rows = self.order_by().values('company_id', 'account_id', 'period_id').annotate(
+                total_debit=Sum('debit'), total_credit=Sum('credit')
+            )
+            deltas = {}
+            for row in rows:
+                deltas.setdefault(row['company_id'], {})[(row['account_id'], row['period_id'])] = (
+                    -row['total_debit'], -row['total_credit']
+                )
+            result = super().delete()
+            for company_id, company_deltas in deltas.items():
+                AccountBalance.objects.apply_deltas(company_deltas, company_id)
+        return result
+
+
+class JournalLine(TenantModel):
+    """
+    Ligne d'écriture : un mouvement au débit ou au crédit d'un compte.
+    La date de l'écriture est recopiée pour indexer les lignes par (société, compte, date).
+    """
+    entry = models.ForeignKey(
+        JournalEntry,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        verbose_name="Écriture"
+    )
+    account = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.PROTECT,
+        related_name='journal_lines',
+        verbose_name="Compte"
+    )
+    period = models.ForeignKey(
+        FiscalPeriod,
+        on_delete=models.PROTECT,
+        related_name='lines',
+        verbose_name="Période"
+    )
+    date = models.DateField(verbose_name="Date")
+    label = models.CharField(max_length=255, blank=True, verbose_name="Libellé")
+    debit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Débit")
+    credit = models.DecimalField(max_digits=15, decimal_places=2, default=0, verbose_name="Crédit")
+
+    objects = TenantManager.from_queryset(JournalLineQuerySet)()
+
+    class Meta:
+        app_label = 'transactions'
+        ordering = ['date', 'id']
+        indexes = [
+            models.Index(fields=['company', 'account', 'date'], name='journal_line_account_date_idx'),
+        ]
+        constraints = [
+            # Une ligne porte un montant positif, soit au débit, soit au crédit
+            models.CheckConstraint(
+                condition=Q(debit__gt=0, credit=0) | Q(debit=0, credit__gt=0),
+                name='journal_line_debit_xor_credit',
+            ),
+        ]
+        verbose_name = "Ligne d'écriture"
+        verbose_name_plural = "Lignes d'écriture"
+
+    def __str__(self):
+        return f"{self.account_id} D {self.debit} / C {self.credit}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Mémoriser le mouvement chargé pour corriger les soldes lors d'une modification
+        instance._loaded_movement = instance._movement()
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.date is None:
+            self.date = self.entry.date
+        closed_through = FiscalPeriod.objects.closed_through(self.company_id)
+        if closed_through and self.date <= closed_through:
+            raise ValidationError(f"La période est clôturée jusqu'au {closed_through:%d/%m/%Y}.")
+        if self.period_id is None or not (self.period.start_date <= self.date <= self.period.end_date):
+            self.period = FiscalPeriod.objects.for_date(self.date, self.company_id)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._apply_balance_deltas(getattr(self, '_loaded_movement', None), self._movement())
+        self._loaded_movement = self._movement()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self._apply_balance_deltas(getattr(self, '_loaded_movement', None), None)
+        return result
+
+    def _movement(self):
+        return (self.account_id, self.period_id, self.debit, self.credit)
+
+    def _apply_balance_deltas(self, old, new):
+        # Les saisies en masse passent par post_entries ; ici on corrige les soldes ligne par ligne
+        deltas = {}
+        for movement, sign in ((old, -1), (new, 1)):
+            if movement is None:
+                continue
+            account_id, period_id, debit, credit = movement
+            previous = deltas.get((account_id, period_id), (0, 0))
+            deltas[(account_id, period_id)] = (previous[0] + sign * debit, previous[1] + sign * credit)
+        AccountBalance.objects.apply_deltas(deltas, self.company_id)
@@ -0,0 +1,42 @@
+from django.db import models
+
+from core.models import TenantModel
+from .fiscal_period import FiscalPeriod
+
+
+class OpeningBalance(TenantModel):
+    """
+    À-nouveau d'un compte au début d'une période : totaux cumulés des débits et
+    crédits de toutes les périodes précédentes, écrits à la clôture de la période
+    précédente. Le solde à une date part du dernier à-nouveau au lieu de tout l'historique.
+    """
+    account = models.ForeignKey(
+        'accounts.Account',
+        on_delete=models.CASCADE,
+        related_name='opening_balances',
+        verbose_name="Compte"
+    )
+    period = models.ForeignKey(
+        FiscalPeriod,
+        on_delete=models.CASCADE,
+        related_name='opening_balances',
+        verbose_name="Période"
+    )
+    debit = models.DecimalField(max_digits=17, decimal_places=2, default=0, verbose_name="Total débit")
+    credit = models.DecimalField(max_digits=17, decimal_places=2, default=0, verbose_name="Total crédit")
+
+    class Meta:
+        app_label = 'transactions'
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'account', 'period'], name='opening_balance_unique_period'),
+        ]
+        verbose_name = "À-nouveau"
+        verbose_name_plural = "À-nouveaux"
+
+    def __str__(self):
+        return f"{self.account_id} {self.period_id} : {self.balance}"
+
+    @property
+    def balance(self):
+        """Solde d'ouverture (positif = débiteur, négatif = créditeur)"""
+        return self.debit - self.credit
@@ -0,0 +1,206 @@
+"""
+Soldes des comptes à partir des soldes matérialisés par période.
+
+Le solde à une date est le dernier à-nouveau (écrit à la clôture de la
+période précédente), plus les soldes des périodes suivantes (un
+enregistrement par mois), plus les mouvements de la période de la date
+jusqu'à cette date : le coût ne dépend plus de l'historique des lignes.
+
+get_balances() calcule la matrice des soldes de plusieurs comptes à
+plusieurs dates en deux requêtes (à-nouveaux et soldes par période, puis
+mouvements des mois des dates) ; les cumuls sont faits en mémoire.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from typing import NamedTuple, Tuple
+
+from django.db import transaction
+from django.db.models import CharField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models.account import Account
+from core.tenancy import get_company_id
+from ..ledger_versions import invalidate_ledger
+from ..models.account_balance import AccountBalance
+from ..models.archived_journal_line import ArchivedJournalLine
+from ..models.fiscal_period import FiscalPeriod
+from ..models.journal_line import JournalLine
+from ..models.opening_balance import OpeningBalance
+
+ZERO = Decimal('0.00')
+
+
+def get_account_balance(account, at_date):
+    """Solde d'un compte à une date incluse (positif = débiteur, négatif = créditeur)"""
+    period_start = at_date.replace(day=1)
+
+    # La société en tête des filtres : les index (société, compte, ...) servent toutes les sous-requêtes
+    def opening(account_ref):
+        return OpeningBalance.objects.filter(
+            company_id=account.company_id, account=account_ref, period__start_date__lte=period_start
+        ).order_by('-period__start_date')
+
+    last_opening = opening(OuterRef('pk'))
+    # Dans la sous-requête des soldes, OuterRef désigne le solde : le compte y est `account`
+    since = Coalesce(Subquery(opening(OuterRef('account')).values('period__start_date')[:1]), Value(date.min))
+    previous = AccountBalance.objects.filter(
+        company_id=account.company_id, account=OuterRef('pk'),
+        period__start_date__gte=since, period__start_date__lt=period_start,
+    ).values('account')
+
+    def total(queryset, field):
+        return Subquery(queryset.annotate(total=Sum(field)).values('total')[:1])
+
+    # Une requête pour l'à-nouveau, les soldes des périodes suivantes et l'état de la période de la date
+    snapshot = Account._base_manager.filter(pk=account.pk).values(
+        opening_debit=Subquery(last_opening.values('debit')[:1]),
+        opening_credit=Subquery(last_opening.values('credit')[:1]),
+        previous_debit=total(previous, 'debit'),
+        previous_credit=total(previous, 'credit'),
+        closed=Subquery(FiscalPeriod.objects.filter(
+            company_id=account.company_id, start_date=period_start
+        ).values('is_closed')[:1]),
+    ).get()
+    # Les lignes d'une période clôturée sont archivées
+    lines = ArchivedJournalLine if snapshot['closed'] else JournalLine
+    current = lines.objects.filter(
+        company_id=account.company_id, account=account, date__gte=period_start, date__lte=at_date
+    ).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+    return (
+        (snapshot['opening_debit'] or ZERO) - (snapshot['opening_credit'] or ZERO)
+        + (snapshot['previous_debit'] or ZERO) - (snapshot['previous_credit'] or ZERO)
+        + (current['debit'] or ZERO) - (current['credit'] or ZERO)
+    )
+
+
+class BalanceMatrix(NamedTuple):
+    """Soldes en colonnes : une colonne par date, alignée sur les comptes"""
+    accounts: Tuple[str, ...]
+    dates: Tuple[date, ...]
+    columns: Tuple[Tuple[Decimal, ...], ...]
+
+    def as_json(self):
+        """Structure sérialisable en JSON (listes, sans dictionnaire par cellule)"""
+        return {
+            'accounts': list(self.accounts),
+            'dates': [at_date.isoformat() for at_date in self.dates],
+            'balances': [list(column) for column in self.columns],
+        }
+
+
+def get_balances(accounts, dates, company=None):
+    """
+    Soldes de comptes (numéro complet et id chargés) aux dates incluses, pour
+    une société (par défaut, la société courante), en deux requêtes.
+    Même calcul que get_account_balance() pour chaque cellule.
+    """
+    company_id = get_company_id(company)
+    accounts = list(accounts)
+    dates = tuple(dates)
+    account_ids = [account.pk for account in accounts]
+    if not accounts or not dates:
+        return BalanceMatrix(tuple(account.full_number for account in accounts), dates, tuple(() for _ in dates))
+
+    # Dernière date demandée de chaque mois : les mouvements lus s'arrêtent là
+    months = {}
+    for at_date in dates:
+        month = at_date.replace(day=1)
+        months[month] = max(months.get(month, at_date), at_date)
+    last_month = max(months)
+
+    def snapshots(model, kind, **filters):
+        return model.objects.filter(
+            company_id=company_id, account_id__in=account_ids, **filters
+        ).annotate(kind=Value(kind, output_field=CharField())).values_list(
+            'kind', 'account_id', 'period__start_date', F('debit') - F('credit')
+        )
+
+    openings, previous = defaultdict(list), defaultdict(list)
+    rows = snapshots(OpeningBalance, 'O', period__start_date__lte=last_month).union(
+        snapshots(AccountBalance, 'B', period__start_date__lt=last_month), all=True
+    )
+    for kind, account_id, start_date, net in rows:
+        (openings if kind == 'O' else previous)[account_id].append((start_date, net))
+
+    # Les lignes des périodes clôturées sont archivées : les deux tables sont lues
+    window = Q()
+    for month, until in months.items():
+        window |= Q(date__gte=month, date__lte=until)
+
+    def movements(model):
+        return model.objects.filter(
+            window, company_id=company_id, account_id__in=account_ids
+        ).values('account_id', 'date').annotate(
+            net=Sum('debit') - Sum('credit')
+        ).values_list('account_id', 'date', 'net').order_by()
+
+    current = defaultdict(list)
+    for account_id, line_date, net in movements(JournalLine).union(movements(ArchivedJournalLine), all=True):
+        current[account_id].append((line_date, net))
+
+    openings, previous, current = _cumulate(openings), _cumulate(previous), _cumulate(current)
+    empty = ((), (ZERO,))
+    columns = []
+    for at_date in dates:
+        period_start = at_date.replace(day=1)
+        column = []
+        for account_id in account_ids:
+            keys, sums = openings.get(account_id, empty)
+            index = bisect_right(keys, period_start)
+            since, opening = (keys[index - 1], sums[index] - sums[index - 1]) if index else (date.min, ZERO)
+            column.append(
+                opening
+                + _sum_between(previous.get(account_id, empty), since, period_start)
+                + _sum_between(current.get(account_id, empty), period_start, at_date + timedelta(days=1))
+            )
+        columns.append(tuple(column))
+    return BalanceMatrix(tuple(account.full_number for account in accounts), dates, tuple(columns))
+
+
+def _cumulate(series):
+    """{compte: [(clé, montant)]} -> {compte: (clés triées, sommes cumulées)}"""
+    cumulated = {}
+    for account_id, items in series.items():
+        items.sort()
+        cumulated[account_id] = (
+            [key for key, _ in items], list(accumulate((amount for _, amount in items), initial=ZERO))
+        )
+    return cumulated
+
+
+def _sum_between(cumulated, low, high):
+    """Somme des montants dont la clé est dans [low, high["""
+    keys, sums = cumulated
+    return sums[bisect_left(keys, high)] - sums[bisect_left(keys, low)]
+
+
+def rebuild_balances(account_ids):
+    """
+    Recalcule depuis les lignes d'écriture les soldes par période ouverte des comptes donnés.
+    Retourne le nombre de soldes créés.
+    """
+    rows = JournalLine.objects.filter(account_id__in=account_ids).values(
+        'company_id', 'account_id', 'period_id', 'period__start_date'
+    ).annotate(total_debit=Sum('debit'), total_credit=Sum('credit')).order_by()
+    with transaction.atomic():
+        # Les soldes des périodes clôturées sont figés : leurs lignes sont archivées
+        stale = AccountBalance.objects.filter(account_id__in=account_ids, period__is_closed=False)
+        touched = set(stale.values_list('company_id', 'period__start_date'))
+        stale.delete()
+        balances = AccountBalance.objects.bulk_create([
+            AccountBalance(
+                company_id=row['company_id'],
+                account_id=row['account_id'],
+                period_id=row['period_id'],
+                debit=row['total_debit'],
+                credit=row['total_credit'],
+            )
+            for row in rows
+        ])
+        touched.update((row['company_id'], row['period__start_date']) for row in rows)
+        for company_id in {company_id for company_id, _ in touched}:
+            invalidate_ledger(company_id, [month for owner, month in touched if owner == company_id])
+    return len(balances)
@@ -0,0 +1,106 @@
+"""
+Clôture des périodes comptables.
+
+La clôture d'une période, dans l'ordre chronologique :
+- verrouille la période : plus aucune écriture n'y est acceptée ;
+- écrit les à-nouveaux (OpeningBalance) de la période suivante : totaux
+  cumulés de chaque compte, à partir des à-nouveaux et des soldes de la période ;
+- déplace ses lignes d'écriture dans ArchivedJournalLine.
+
+La table des lignes ne garde ainsi que les périodes ouvertes. Les soldes
+matérialisés (AccountBalance) des périodes clôturées sont conservés : les
+rapports les lisent comme avant, et le solde d'un compte part du dernier
+à-nouveau au lieu de cumuler tout l'historique.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+
+from core.tenancy import get_company_id
+from ..models.account_balance import AccountBalance
+from ..models.archived_journal_line import ArchivedJournalLine
+from ..models.fiscal_period import FiscalPeriod
+from ..models.journal_line import JournalLine
+from ..models.opening_balance import OpeningBalance
+
+BATCH_SIZE = 2000
+
+ZERO = Decimal('0.00')
+
+ARCHIVED_FIELDS = ('id', 'company', 'entry', 'account', 'period', 'date', 'label', 'debit', 'credit')
+
+
+def close_period(period):
+    """Clôture une période ; retourne la période suivante, qui porte les à-nouveaux"""
+    using = router.db_for_write(FiscalPeriod)
+    with transaction.atomic(using=using):
+        # Verrou : une seule clôture à la fois, et aucune écriture concurrente ne voit la période ouverte
+        period = FiscalPeriod._base_manager.using(using).select_for_update().get(pk=period.pk)
+        if period.is_closed:
+            raise ValidationError(f"La période {period} est déjà clôturée.")
+        previous = FiscalPeriod._base_manager.using(using).filter(
+            company_id=period.company_id, start_date__lt=period.start_date, is_closed=False
+        ).first()
+        if previous is not None:
+            raise ValidationError(f"La période {previous} doit être clôturée avant la période {period}.")
+
+        period.is_closed = True
+        period.save(update_fields=['is_closed'])
+        next_period = FiscalPeriod.objects.using(using).for_date(period.end_date + timedelta(days=1), period.company_id)
+        _write_opening_balances(period, next_period, using)
+        _archive_lines(period, using)
+    return next_period
+
+
+def close_periods(until, company=None):
+    """Clôture dans l'ordre les périodes ouvertes d'une société qui commencent au plus tard à la date donnée"""
+    periods = FiscalPeriod._base_manager.filter(
+        company_id=get_company_id(company), start_date__lte=until, is_closed=False
+    ).order_by('start_date')
+    closed = []
+    # Relu à chaque tour : la clôture crée la période suivante si elle n'existait pas
+    while (period := periods.first()) is not None:
+        close_period(period)
+        closed.append(period)
+    return closed
+
+
+def _write_opening_balances(period, next_period, using):
+    """À-nouveaux de la période suivante = à-nouveaux de la période + mouvements de la période"""
+    totals = {}
+    for model in (OpeningBalance, AccountBalance):
+        rows = model._base_manager.using(using).filter(period=period).values_list('account_id', 'debit', 'credit')
+        for account_id, debit, credit in rows.iterator(chunk_size=BATCH_SIZE):
+            previous_debit, previous_credit = totals.get(account_id, (ZERO, ZERO))
+            totals[account_id] = (previous_debit + debit, previous_credit + credit)
+    OpeningBalance._base_manager.using(using).filter(period=next_period).delete()
+    OpeningBalance._base_manager.using(using).bulk_create(
+        (
+            OpeningBalance(
+                company_id=period.company_id, account_id=account_id, period=next_period, debit=debit, credit=credit
+            )
+            for account_id, (debit, credit) in totals.items()
+            if debit or credit
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _archive_lines(period, using):
+    """Déplace les lignes de la période vers la table d'archive, en SQL ensembliste"""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(ArchivedJournalLine._meta.get_field(name).column) for name in ARCHIVED_FIELDS)
+    source_columns = ", ".join(quote(JournalLine._meta.get_field(name).column) for name in ARCHIVED_FIELDS)
+    lines = quote(JournalLine._meta.db_table)
+    period_column = quote(JournalLine._meta.get_field('period').column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(ArchivedJournalLine._meta.db_table)} ({columns})"
+            f" SELECT {source_columns} FROM {lines} WHERE {period_column} = %s",
+            [period.pk],
+        )
+        # Suppression directe : les soldes matérialisés de la période restent inchangés
+        cursor.execute(f"DELETE FROM {lines} WHERE {period_column} = %s", [period.pk])
@@ -0,0 +1,238 @@
+"""
+Import en continu de journaux (relevés bancaires, fichiers FEC ou CSV).
+
+Le fichier est lu ligne à ligne par des générateurs : lecture, regroupement
+des lignes en écritures, puis lots de taille fixe enregistrés par
+post_entries(). La mémoire reste bornée par la taille d'un lot, quelle que
+soit celle du fichier.
+
+Les comptes de la société sont chargés une seule fois dans un dictionnaire
+{numéro complet: (id, actif)} ; les numéros complétés par des zéros (FEC :
+40110000 pour 401100) y sont rapprochés sans requête.
+
+Chaque lot est enregistré dans sa propre transaction (un point de sauvegarde
+si l'import est lui-même dans une transaction) : les écritures refusées sont
+consignées dans le rapport sans interrompre l'import, et après une erreur
+inattendue, l'import reprend après la dernière ligne du dernier lot validé
+(ImportReport.last_line).
+"""
+import csv
+from datetime import datetime
+from itertools import groupby, islice
+from typing import List, NamedTuple
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from accounts.models.account import Account
+from core.tenancy import get_company_id
+from ..models.journal_entry import JournalEntry
+from .transaction_services import post_entries
+
+# Colonnes d'un fichier FEC (Fichier des Écritures Comptables)
+FEC_COLUMNS = {
+    'JournalCode': 'journal',
+    'EcritureNum': 'entry',
+    'EcritureDate': 'date',
+    'CompteNum': 'account',
+    'PieceRef': 'reference',
+    'EcritureLib': 'label',
+    'Debit': 'debit',
+    'Credit': 'credit',
+}
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y%m%d', '%d/%m/%Y')
+
+
+class JournalImportError(NamedTuple):
+    line: int
+    entry: str
+    message: str
+
+    def __str__(self):
+        return f"Ligne {self.line} (écriture {self.entry or '?'}) : {self.message}"
+
+
+class ImportReport(NamedTuple):
+    entries: int
+    lines: int
+    batches: int
+    # Dernière ligne du fichier enregistrée : point de reprise de l'import
+    last_line: int
+    errors: List[JournalImportError]
+    # Faux si un lot a échoué en base : l'import s'est arrêté après le dernier lot validé
+    complete: bool
+
+
+class ParsedEntry(NamedTuple):
+    first_line: int
+    last_line: int
+    key: str
+    data: dict
+
+
+def read_journal_file(path):
+    """
+    Itère sur les lignes (numéro de ligne, dictionnaire) d'un fichier FEC ou CSV.
+
+    Un fichier FEC est reconnu à ses colonnes (JournalCode, EcritureNum, ...) ;
+    un CSV porte les colonnes entry, date, journal, reference, label, account,
+    debit, credit. Les lignes d'une même écriture doivent se suivre.
+    """
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        sample = stream.read(4096)
+        stream.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=';,|\t')
+        reader = csv.DictReader(stream, dialect=dialect)
+        fec = 'EcritureNum' in (reader.fieldnames or ())
+        # La ligne 1 est l'en-tête
+        for line, row in enumerate(reader, start=2):
+            if fec:
+                row = {name: row.get(column) for column, name in FEC_COLUMNS.items()}
+                row['entry'] = f"{row['journal']}-{row['entry']}"
+            yield line, row
+
+
+def read_bank_statement(path, bank_account, counterpart_account):
+    """
+    Itère sur les lignes d'un relevé bancaire CSV (date, label, amount[, reference]),
+    chaque opération devenant une écriture à deux lignes : le compte de banque
+    et le compte de contrepartie (par défaut, un compte d'attente à lettrer).
+    Un montant positif est un encaissement (débit de la banque).
+    """
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        sample = stream.read(4096)
+        stream.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=';,\t')
+        for line, row in enumerate(csv.DictReader(stream, dialect=dialect), start=2):
+            amount = _clean_amount(row.get('amount'))
+            credit_side = amount.startswith('-')
+            amount = amount.lstrip('-')
+            common = {
+                'entry': str(line),
+                'journal': JournalEntry.BANQUE,
+                'date': row.get('date'),
+                'reference': row.get('reference') or '',
+                'label': row.get('label') or '',
+            }
+            bank, counterpart = ('credit', 'debit') if credit_side else ('debit', 'credit')
+            yield line, {**common, 'account': bank_account, bank: amount}
+            yield line, {**common, 'account': counterpart_account, counterpart: amount}
+
+
+def import_journal(rows, batch_size=None, resume_after=0, company=None):
+    """
+    Importe des écritures d'une société (par défaut, la société courante) à
+    partir de lignes (numéro de ligne, dictionnaire), par lots de batch_size
+    écritures (settings.JOURNAL_IMPORT_BATCH_SIZE par défaut).
+
+    Les écritures invalides (compte inconnu, déséquilibre, période
+    clôturée, ...) sont écartées et signalées dans le rapport. Les écritures
+    qui se terminent au plus tard à la ligne resume_after sont ignorées :
+    elles ont été enregistrées par un import précédent.
+    """
+    company_id = get_company_id(company)
+    batch_size = batch_size or settings.JOURNAL_IMPORT_BATCH_SIZE
+    accounts = {
+        full_number: (pk, is_active)
+        for full_number, pk, is_active in Account.objects.filter(company_id=company_id).order_by().values_list(
+            'full_number', 'pk', 'is_active'
+        ).iterator(chunk_size=5000)
+    }
+
+    errors = []
+    entries = lines = batches = 0
+    last_line = resume_after
+    parsed_entries = _parse_entries(rows, accounts, errors, resume_after)
+    while batch := list(islice(parsed_entries, batch_size)):
+        try:
+            posted_entries, posted_lines = _post_batch(batch, accounts, company_id, errors)
+        except DatabaseError as exc:
+            # Le lot est annulé ; les précédents restent enregistrés
+            errors.append(JournalImportError(batch[0].first_line, batch[0].key, f"lot interrompu : {exc}"))
+            return ImportReport(entries, lines, batches, last_line, sorted(errors), False)
+        entries += posted_entries
+        lines += posted_lines
+        batches += 1
+        last_line = batch[-1].last_line
+    return ImportReport(entries, lines, batches, last_line, sorted(errors), True)
+
+
+def _parse_entries(rows, accounts, errors, resume_after):
+    """Regroupe les lignes consécutives d'une même écriture ; les lignes illisibles sont signalées"""
+    for key, group in groupby(rows, key=lambda item: str(item[1].get('entry') or '').strip()):
+        group = list(group)
+        first_line, last_line = group[0][0], group[-1][0]
+        if last_line <= resume_after:
+            continue
+        data = group[0][1]
+        try:
+            entry = {
+                'date': _parse_date(data.get('date')),
+                'journal': _parse_journal(data.get('journal')),
+                'reference': _parse_text(data.get('reference'), 'reference', "la référence"),
+                'label': _parse_text(data.get('label'), 'label', "le libellé"),
+                'lines': [
+                    {
+                        'account': _match_account(str(row.get('account') or '').strip(), accounts),
+                        'label': str(row.get('label') or '').strip(),
+                        'debit': _clean_amount(row.get('debit')),
+                        'credit': _clean_amount(row.get('credit')),
+                    }
+                    for _, row in group
+                ],
+            }
+        except ValueError as exc:
+            errors.append(JournalImportError(first_line, key, str(exc)))
+            continue
+        yield ParsedEntry(first_line, last_line, key, entry)
+
+
+def _post_batch(batch, accounts, company_id, errors):
+    """Enregistre un lot dans sa propre transaction ; retourne (écritures, lignes) enregistrées"""
+    rejected = []
+    posted = post_entries([parsed.data for parsed in batch], company_id, accounts=accounts, errors=rejected)
+    for index, message in rejected:
+        errors.append(JournalImportError(batch[index - 1].first_line, batch[index - 1].key, message))
+    rejected_indexes = {index for index, _ in rejected}
+    lines = sum(
+        len(parsed.data['lines']) for index, parsed in enumerate(batch, start=1) if index not in rejected_indexes
+    )
+    return len(posted), lines
+
+
+def _match_account(number, accounts):
+    """Numéro du plan correspondant, en retirant au besoin les zéros de complément (40110000 -> 401100)"""
+    candidate = number
+    while candidate not in accounts and len(candidate) > 2 and candidate.endswith('0'):
+        candidate = candidate[:-1]
+    return candidate if candidate in accounts else number
+
+
+def _clean_amount(value):
+    """Montant au format du fichier (virgule décimale, espaces de milliers) -> "1234.56" """
+    return str(value or '').replace('\xa0', '').replace(' ', '').replace(',', '.')
+
+
+def _parse_journal(value):
+    journal = str(value or JournalEntry.OPERATIONS_DIVERSES).strip().upper()
+    if journal not in dict(JournalEntry.JOURNAL_CHOICES):
+        raise ValueError(f"journal « {journal} » inconnu.")
+    return journal
+
+
+def _parse_text(value, field, name):
+    value = str(value or '').strip()
+    if len(value) > JournalEntry._meta.get_field(field).max_length:
+        raise ValueError(f"{name} est trop long.")
+    return value
+
+
+def _parse_date(value):
+    value = str(value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    raise ValueError(f"date invalide « {value} ».")
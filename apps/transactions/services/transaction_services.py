@@ -1 +1,207 @@
- 
+"""
+Moteur d'écritures en partie double.
+
+post_entries() valide un lot complet d'écritures en mémoire puis l'enregistre
+en une seule transaction avec bulk_create : les comptes sont chargés une fois
+pour tout le lot (aucun Account.objects.get par ligne) et les soldes par
+(compte, période) sont incrémentés dans la même transaction.
+"""
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from accounts.models.account import Account
+from core.tenancy import get_company_id
+from ..models.account_balance import AccountBalance
+from ..models.fiscal_period import FiscalPeriod
+from ..models.journal_entry import JournalEntry
+from ..models.journal_line import JournalLine
+
+BATCH_SIZE = 2000
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+def post_entries(batch, company=None, accounts=None, errors=None):
+    """
+    Valide et enregistre un lot d'écritures d'une société (par défaut, la société courante).
+
+    Chaque écriture est un dictionnaire :
+        {'date': date, 'journal': 'OD', 'reference': '...', 'label': '...',
+         'lines': [{'account': '401100', 'debit': '150.00', 'label': '...'},
+                   {'account': '521000', 'credit': '150.00'}]}
+    Le compte d'une ligne est donné par son numéro complet, son id ou une instance.
+
+    Lève ValidationError (avec les erreurs de tout le lot) si une écriture est
+    invalide ou tombe dans une période clôturée : rien n'est alors enregistré. Retourne les écritures créées.
+
+    accounts : comptes déjà chargés {numéro complet ou id: (id, actif)}, sinon lus pour le lot.
+    errors : si une liste est fournie, les écritures refusées y sont ajoutées
+    (rang dans le lot, message) et écartées ; les autres sont enregistrées.
+    """
+    batch = list(batch)
+    company_id = get_company_id(company)
+    if accounts is None:
+        accounts = _load_accounts(batch, company_id)
+
+    rejected = []
+    indexes = []
+    entries = []
+    lines_per_entry = []
+    for index, data in enumerate(batch, start=1):
+        try:
+            entry, lines = _build_entry(data, accounts, company_id)
+        except ValidationError as exc:
+            rejected.extend((index, message) for message in exc.messages)
+            continue
+        indexes.append(index)
+        entries.append(entry)
+        lines_per_entry.append(lines)
+
+    if rejected and errors is None:
+        raise ValidationError([f"Écriture {index} : {message}" for index, message in rejected])
+
+    with transaction.atomic():
+        # Vérifié avant for_dates : une période ouverte ne doit pas être créée avant une période clôturée
+        closed_through = FiscalPeriod.objects.closed_through(company_id)
+        closed = [
+            (index, f"la période est clôturée jusqu'au {closed_through:%d/%m/%Y}.")
+            for index, entry in zip(indexes, entries)
+            if closed_through and entry.date <= closed_through
+        ]
+        if closed and errors is None:
+            raise ValidationError([f"Écriture {index} : {message}" for index, message in closed])
+        if errors is not None:
+            errors.extend(sorted(rejected + closed))
+            if closed:
+                kept = [
+                    (entry, lines) for entry, lines in zip(entries, lines_per_entry)
+                    if entry.date > closed_through
+                ]
+                entries = [entry for entry, _ in kept]
+                lines_per_entry = [lines for _, lines in kept]
+        periods = FiscalPeriod.objects.for_dates({entry.date for entry in entries}, company_id)
+        JournalEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+        all_lines = []
+        deltas = {}
+        for entry, lines in zip(entries, lines_per_entry):
+            period_id = periods[entry.date.replace(day=1)].pk
+            for line in lines:
+                line.entry_id = entry.pk
+                line.period_id = period_id
+                key = (line.account_id, period_id)
+                debit, credit = deltas.get(key, (ZERO, ZERO))
+                deltas[key] = (debit + line.debit, credit + line.credit)
+            all_lines.extend(lines)
+        JournalLine.objects.bulk_create(all_lines, batch_size=BATCH_SIZE)
+        AccountBalance.objects.apply_deltas(deltas, company_id)
+
+    return entries
+
+
+def post_entry(data, company=None):
+    """Enregistre une seule écriture (voir post_entries)"""
+    return post_entries([data], company)[0]
+
+
+def _load_accounts(batch, company_id):
+    """Charge en une requête par type de clé les comptes de la société référencés par le lot"""
+    numbers = set()
+    ids = set()
+    for data in batch:
+        for line in data.get('lines', ()):
+            key = line.get('account')
+            if isinstance(key, Account):
+                ids.add(key.pk)
+            elif isinstance(key, int):
+                ids.add(key)
+            elif key is not None:
+                numbers.add(str(key))
+
+    accounts = {}
+    company_accounts = Account.objects.filter(company_id=company_id).order_by()
+    if numbers:
+        rows = company_accounts.filter(full_number__in=numbers).values_list(
+            'pk', 'full_number', 'is_active'
+        )
+        for pk, full_number, is_active in rows:
+            accounts[full_number] = (pk, is_active)
+    if ids:
+        for pk, is_active in company_accounts.filter(pk__in=ids).values_list('pk', 'is_active'):
+            accounts[pk] = (pk, is_active)
+    return accounts
+
+
+def _build_entry(data, accounts, company_id):
+    date = data.get('date')
+    if isinstance(date, str):
+        try:
+            date = parse_date(date)
+        except ValueError:
+            date = None
+    if not date:
+        raise ValidationError("la date est obligatoire.")
+
+    raw_lines = data.get('lines') or ()
+    if len(raw_lines) < 2:
+        raise ValidationError("une écriture doit comporter au moins deux lignes.")
+
+    entry = JournalEntry(
+        company_id=company_id,
+        journal=data.get('journal', JournalEntry.OPERATIONS_DIVERSES),
+        date=date,
+        reference=data.get('reference', ''),
+        label=data.get('label', ''),
+    )
+
+    lines = []
+    total_debit = ZERO
+    total_credit = ZERO
+    for position, line in enumerate(raw_lines, start=1):
+        key = line.get('account')
+        if isinstance(key, Account):
+            key = key.pk
+        elif not isinstance(key, int) and key is not None:
+            key = str(key)
+        account = accounts.get(key)
+        if account is None:
+            raise ValidationError(f"ligne {position} : compte {key} inconnu.")
+        account_id, is_active = account
+        if not is_active:
+            raise ValidationError(f"ligne {position} : le compte {key} est inactif.")
+
+        debit = _to_amount(line.get('debit'), position)
+        credit = _to_amount(line.get('credit'), position)
+        if debit < 0 or credit < 0:
+            raise ValidationError(f"ligne {position} : les montants doivent être positifs.")
+        if (debit > 0) == (credit > 0):
+            raise ValidationError(f"ligne {position} : un montant doit être saisi soit au débit, soit au crédit.")
+
+        total_debit += debit
+        total_credit += credit
+        lines.append(JournalLine(
+            company_id=company_id,
+            account_id=account_id,
+            date=date,
+            label=line.get('label') or entry.label,
+            debit=debit,
+            credit=credit,
+        ))
+
+    if total_debit != total_credit:
+        raise ValidationError(
+            f"l'écriture n'est pas équilibrée : débit {total_debit} ≠ crédit {total_credit}."
+        )
+    return entry, lines
+
+
+def _to_amount(value, position):
+    if value in (None, ''):
+        return ZERO
+    try:
+        return Decimal(str(value)).quantize(CENT)
+    except InvalidOperation:
+        raise ValidationError(f"ligne {position} : montant invalide « {value} ».")
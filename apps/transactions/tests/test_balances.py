@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from ..models.account_balance import AccountBalance
+from ..models.journal_entry import JournalEntry
+from ..models.journal_line import JournalLine
+from ..services.balance_services import get_account_balance, get_balances
+from ..services.closing_services import close_periods
+from ..services.transaction_services import post_entries
+
+
+class AccountBalanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=41
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7), number=70
+        )
+        cls.customer = Account.objects.create(
+            account_group=customers, number="1100", name="Clients", account_type=account_type
+        )
+        cls.sales = Account.objects.create(
+            account_group=sales, number="1000", name="Ventes", account_type=account_type
+        )
+
+    def sale(self, day, amount):
+        return {
+            'date': day,
+            'label': "Facture",
+            'lines': [
+                {'account': '411100', 'debit': amount},
+                {'account': '701000', 'credit': amount},
+            ],
+        }
+
+    def test_posting_updates_period_balances(self):
+        post_entries([self.sale(date(2025, 1, 10), '100'), self.sale(date(2025, 1, 20), '50')])
+        post_entries([self.sale(date(2025, 2, 5), '30')])
+
+        balances = AccountBalance.objects.filter(account=self.customer).order_by('period__start_date')
+        self.assertEqual(
+            [(b.period.start_date, b.debit, b.credit) for b in balances],
+            [(date(2025, 1, 1), Decimal('150.00'), Decimal('0.00')),
+             (date(2025, 2, 1), Decimal('30.00'), Decimal('0.00'))],
+        )
+
+    def test_balance_at_date_uses_snapshots_and_open_period_delta(self):
+        post_entries([
+            self.sale(date(2025, 1, 10), '100'),
+            self.sale(date(2025, 2, 5), '30'),
+            self.sale(date(2025, 2, 25), '20'),
+        ])
+        self.assertEqual(get_account_balance(self.customer, date(2024, 12, 31)), Decimal('0'))
+        self.assertEqual(get_account_balance(self.customer, date(2025, 2, 10)), Decimal('130.00'))
+        self.assertEqual(get_account_balance(self.sales, date(2025, 2, 28)), Decimal('-150.00'))
+        with self.assertNumQueries(2):
+            get_account_balance(self.customer, date(2025, 2, 28))
+
+    def test_single_line_changes_adjust_balances(self):
+        entry = post_entries([self.sale(date(2025, 1, 10), '100')])[0]
+        line = JournalLine.objects.get(entry=entry, account=self.customer)
+        line.debit = Decimal('80')
+        line.date = date(2025, 3, 1)
+        line.save()
+        self.assertEqual(get_account_balance(self.customer, date(2025, 1, 31)), Decimal('0'))
+        self.assertEqual(get_account_balance(self.customer, date(2025, 3, 31)), Decimal('80.00'))
+
+        line.delete()
+        self.assertEqual(get_account_balance(self.customer, date(2025, 3, 31)), Decimal('0'))
+
+    def test_deleting_entries_adjusts_balances(self):
+        first, second, third = post_entries([
+            self.sale(date(2025, 1, 10), '100'),
+            self.sale(date(2025, 1, 20), '50'),
+            self.sale(date(2025, 2, 5), '30'),
+        ])
+        first.delete()
+        self.assertEqual(get_account_balance(self.customer, date(2025, 1, 31)), Decimal('50.00'))
+
+        JournalEntry.objects.filter(pk__in=[second.pk, third.pk]).delete()
+        self.assertEqual(get_account_balance(self.customer, date(2025, 2, 28)), Decimal('0'))
+        self.assertEqual(get_account_balance(self.sales, date(2025, 2, 28)), Decimal('0'))
+        self.assertFalse(AccountBalance.objects.exclude(debit=0, credit=0).exists())
+
+    def test_rebuild_balances_command(self):
+        post_entries([self.sale(date(2025, 1, 10), '100'), self.sale(date(2025, 2, 5), '30')])
+        expected = sorted(AccountBalance.objects.values_list('account_id', 'period_id', 'debit', 'credit'))
+        AccountBalance.objects.update(debit=0, credit=0)
+
+        call_command('rebuild_balances', chunk_size=1, stdout=StringIO())
+        self.assertEqual(
+            sorted(AccountBalance.objects.values_list('account_id', 'period_id', 'debit', 'credit')),
+            expected,
+        )
+
+    def test_balance_matrix_matches_single_balances(self):
+        post_entries([
+            self.sale(date(2025, 1, 10), '100'),
+            self.sale(date(2025, 2, 5), '30'),
+            self.sale(date(2025, 2, 25), '20'),
+            self.sale(date(2025, 3, 3), '5'),
+        ])
+        # Janvier clôturé : ses lignes sont archivées et février porte les à-nouveaux
+        close_periods(date(2025, 1, 1))
+        dates = [date(2024, 12, 31), date(2025, 1, 15), date(2025, 2, 10), date(2025, 2, 28), date(2025, 3, 31)]
+        accounts = [self.customer, self.sales]
+
+        with self.assertNumQueries(2):
+            matrix = get_balances(accounts, dates)
+        self.assertEqual(matrix.accounts, ('411100', '701000'))
+        self.assertEqual(
+            matrix.columns,
+            tuple(tuple(get_account_balance(account, at_date) for account in accounts) for at_date in dates),
+        )
+        self.assertEqual(matrix.as_json()['balances'][2], [Decimal('130.00'), Decimal('-130.00')])
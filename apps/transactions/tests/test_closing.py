@@ -0,0 +1,116 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from reporting.services.ledger_services import ledger_rows
+from ..models.archived_journal_line import ArchivedJournalLine
+from ..models.fiscal_period import FiscalPeriod
+from ..models.journal_line import JournalLine
+from ..models.opening_balance import OpeningBalance
+from ..services.balance_services import get_account_balance
+from ..services.closing_services import close_period, close_periods
+from ..services.transaction_services import post_entries
+
+
+class PeriodClosingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=41
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7), number=70
+        )
+        cls.customer = Account.objects.create(
+            account_group=customers, number="1100", name="Clients", account_type=account_type
+        )
+        cls.sales = Account.objects.create(
+            account_group=sales, number="1000", name="Ventes", account_type=account_type
+        )
+
+    def setUp(self):
+        post_entries([
+            self.sale(date(2025, 1, 10), '100'),
+            self.sale(date(2025, 2, 5), '30'),
+            self.sale(date(2025, 3, 15), '20'),
+        ])
+
+    def sale(self, day, amount):
+        return {
+            'date': day,
+            'label': "Facture",
+            'lines': [
+                {'account': '411100', 'debit': amount},
+                {'account': '701000', 'credit': amount},
+            ],
+        }
+
+    def period(self, start_date):
+        return FiscalPeriod.objects.get(start_date=start_date)
+
+    def test_closing_archives_lines_and_writes_openings(self):
+        next_period = close_period(self.period(date(2025, 1, 1)))
+        close_period(next_period)
+
+        self.assertTrue(self.period(date(2025, 2, 1)).is_closed)
+        self.assertEqual(ArchivedJournalLine.objects.count(), 4)
+        self.assertEqual(set(JournalLine.objects.values_list('date', flat=True)), {date(2025, 3, 15)})
+        opening = OpeningBalance.objects.get(account=self.customer, period__start_date=date(2025, 3, 1))
+        self.assertEqual((opening.debit, opening.credit), (Decimal('130.00'), Decimal('0.00')))
+
+    def test_balances_are_unchanged_after_closing(self):
+        days = [date(2025, 1, 20), date(2025, 2, 28), date(2025, 3, 31)]
+        expected = [get_account_balance(account, day) for account in (self.customer, self.sales) for day in days]
+        expected_ledger = list(ledger_rows(date(2025, 1, 1), date(2025, 3, 31)))
+
+        close_periods(date(2025, 2, 1))
+        self.assertEqual(
+            [get_account_balance(account, day) for account in (self.customer, self.sales) for day in days],
+            expected,
+        )
+        self.assertEqual(list(ledger_rows(date(2025, 1, 1), date(2025, 3, 31))), expected_ledger)
+        for day in days:
+            with self.assertNumQueries(2):
+                get_account_balance(self.customer, day)
+
+    def test_posting_into_closed_period_is_rejected(self):
+        close_period(self.period(date(2025, 1, 1)))
+        with self.assertRaises(ValidationError):
+            post_entries([self.sale(date(2025, 1, 31), '10')])
+        line = JournalLine.objects.get(account=self.customer, date=date(2025, 2, 5))
+        line.date = date(2025, 1, 31)
+        with self.assertRaises(ValidationError):
+            line.save()
+
+    def test_posting_before_first_period_after_closing_is_rejected(self):
+        close_period(self.period(date(2025, 1, 1)))
+        # Décembre 2024 n'a pas de période : l'à-nouveau de février ne l'inclurait pas
+        with self.assertRaises(ValidationError):
+            post_entries([self.sale(date(2024, 12, 15), '7')])
+        self.assertFalse(FiscalPeriod.objects.filter(start_date=date(2024, 12, 1)).exists())
+        self.assertEqual(get_account_balance(self.customer, date(2025, 2, 28)), Decimal('130.00'))
+
+    def test_periods_close_in_order(self):
+        with self.assertRaises(ValidationError):
+            close_period(self.period(date(2025, 2, 1)))
+        close_period(self.period(date(2025, 1, 1)))
+        with self.assertRaises(ValidationError):
+            close_period(self.period(date(2025, 1, 1)))
+
+    def test_close_periods_command(self):
+        out = StringIO()
+        call_command('close_periods', '2025-02', stdout=out)
+        self.assertIn("2 période(s) clôturée(s)", out.getvalue())
+        self.assertEqual(
+            list(FiscalPeriod.objects.filter(is_closed=False).values_list('start_date', flat=True)),
+            [date(2025, 3, 1)],
+        )
@@ -0,0 +1,125 @@
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from ..models.journal_entry import JournalEntry
+from ..services import journal_import_services
+from ..services.balance_services import get_account_balance
+from ..services.journal_import_services import import_journal, read_journal_file
+
+FEC_HEADER = "JournalCode|JournalLib|EcritureNum|EcritureDate|CompteNum|CompteLib|PieceRef|EcritureLib|Debit|Credit\n"
+
+
+class JournalImportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        customers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=41
+        )
+        banks = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=5), number=52
+        )
+        sales = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=7), number=70
+        )
+        cls.customer = Account.objects.create(
+            account_group=customers, number="1100", name="Clients", account_type=account_type
+        )
+        cls.bank = Account.objects.create(account_group=banks, number="1000", name="Banque", account_type=account_type)
+        Account.objects.create(account_group=sales, number="1000", name="Ventes", account_type=account_type)
+        Account.objects.create(account_group=customers, number="1000", name="Attente", account_type=account_type)
+
+    def write(self, directory, name, content):
+        path = os.path.join(directory, name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write(content)
+        return path
+
+    def sales(self, count, start=1):
+        """Lignes (numéro, dictionnaire) de `count` ventes de 10, deux lignes par écriture"""
+        for number in range(start, start + count):
+            for offset, (account, side) in enumerate((('411100', 'debit'), ('701000', 'credit'))):
+                yield number * 2 + offset, {
+                    'entry': str(number), 'date': '2025-01-15', 'journal': 'VE', 'label': f"Facture {number}",
+                    'account': account, side: '10',
+                }
+
+    def test_fec_file_is_imported_with_errors_reported(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, 'journal.txt', FEC_HEADER + (
+                "VE|Ventes|1|20250110|41110000|Clients|F1|Facture 1|1 200,50|0,00\n"
+                "VE|Ventes|1|20250110|70100000|Ventes|F1|Facture 1|0,00|1 200,50\n"
+                # Écriture déséquilibrée
+                "VE|Ventes|2|20250111|41110000|Clients|F2|Facture 2|100,00|0,00\n"
+                "VE|Ventes|2|20250111|70100000|Ventes|F2|Facture 2|0,00|90,00\n"
+                # Compte inconnu
+                "VE|Ventes|3|20250112|41190000|Clients|F3|Facture 3|5,00|0,00\n"
+                "VE|Ventes|3|20250112|70100000|Ventes|F3|Facture 3|0,00|5,00\n"
+                # Date illisible
+                "VE|Ventes|4|2025-13-01|41110000|Clients|F4|Facture 4|5,00|0,00\n"
+                "VE|Ventes|4|2025-13-01|70100000|Ventes|F4|Facture 4|0,00|5,00\n"
+            ))
+            report = import_journal(read_journal_file(path))
+
+        self.assertEqual((report.entries, report.lines, report.batches, report.last_line), (1, 2, 1, 7))
+        self.assertTrue(report.complete)
+        self.assertEqual([(error.line, error.entry) for error in report.errors], [(4, 'VE-2'), (6, 'VE-3'), (8, 'VE-4')])
+        entry = JournalEntry.objects.get()
+        self.assertEqual((entry.journal, entry.reference, entry.date), ('VE', 'F1', date(2025, 1, 10)))
+        self.assertEqual(get_account_balance(self.customer, date(2025, 1, 31)), Decimal('1200.50'))
+
+    def test_entries_are_posted_in_batches_and_resumed(self):
+        report = import_journal(self.sales(5), batch_size=2)
+        self.assertEqual((report.entries, report.batches, report.last_line), (5, 3, 11))
+
+        # Reprise après la 2e écriture : seules les suivantes sont enregistrées
+        report = import_journal(self.sales(5), batch_size=2, resume_after=5)
+        self.assertEqual((report.entries, report.batches), (3, 2))
+        self.assertEqual(JournalEntry.objects.count(), 8)
+
+    def test_failed_batch_stops_import_after_last_committed_batch(self):
+        post_entries = journal_import_services.post_entries
+        calls = []
+
+        def failing(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise DatabaseError("connexion perdue")
+            return post_entries(*args, **kwargs)
+
+        with mock.patch.object(journal_import_services, 'post_entries', failing):
+            report = import_journal(self.sales(5), batch_size=2)
+        self.assertFalse(report.complete)
+        self.assertEqual((report.entries, report.last_line), (2, 5))
+        self.assertEqual(JournalEntry.objects.count(), 2)
+
+        report = import_journal(self.sales(5), batch_size=2, resume_after=report.last_line)
+        self.assertEqual(JournalEntry.objects.count(), 5)
+
+    def test_command_imports_bank_statement(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write(directory, 'releve.csv', (
+                "date;label;amount;reference\n"
+                "05/01/2025;Virement client;150,00;V1\n"
+                "06/01/2025;Frais bancaires;-12,50;\n"
+                "07/01/2025;Sans montant;;\n"
+            ))
+            out, err = StringIO(), StringIO()
+            call_command(
+                'import_journal', path, bank_account='521000', counterpart_account='411000', stdout=out, stderr=err
+            )
+        self.assertIn("2 écriture(s) (4 ligne(s))", out.getvalue())
+        self.assertIn("Ligne 4", err.getvalue())
+        self.assertEqual(get_account_balance(self.bank, date(2025, 1, 31)), Decimal('137.50'))
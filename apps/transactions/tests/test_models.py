@@ -1 +1,48 @@
- 
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from ..models.journal_entry import JournalEntry
+from ..models.journal_line import JournalLine
+
+
+class JournalEntryModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_class = AccountClass.objects.create(number=5)
+        group = AccountGroup.objects.create(account_class=account_class, number=52)
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        cls.account = Account.objects.create(
+            account_group=group, number="1000", name="Banque", account_type=account_type
+        )
+        cls.entry = JournalEntry.objects.create(date=date(2025, 1, 15), label="Virement")
+
+    def test_line_copies_entry_date(self):
+        line = JournalLine.objects.create(entry=self.entry, account=self.account, debit=Decimal('10'))
+        self.assertEqual(line.date, date(2025, 1, 15))
+
+        self.entry.date = date(2025, 1, 20)
+        self.entry.save()
+        line.refresh_from_db()
+        self.assertEqual(line.date, date(2025, 1, 20))
+
+    def test_clean_rejects_unbalanced_entry(self):
+        JournalLine.objects.create(entry=self.entry, account=self.account, debit=Decimal('10'))
+        with self.assertRaises(ValidationError):
+            self.entry.clean()
+
+        JournalLine.objects.create(entry=self.entry, account=self.account, credit=Decimal('10'))
+        self.entry.clean()
+
+    def test_line_requires_debit_or_credit(self):
+        with self.assertRaises(IntegrityError):
+            JournalLine.objects.create(
+                entry=self.entry, account=self.account, debit=Decimal('10'), credit=Decimal('10')
+            )
@@ -0,0 +1,84 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from ..models.journal_entry import JournalEntry
+from ..models.journal_line import JournalLine
+from ..services.transaction_services import post_entries
+
+
+class PostEntriesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        account_type = AccountType.objects.create(code=AccountType.AC)
+        suppliers = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=4), number=40
+        )
+        banks = AccountGroup.objects.create(
+            account_class=AccountClass.objects.create(number=5), number=52
+        )
+        cls.supplier = Account.objects.create(
+            account_group=suppliers, number="1100", name="Fournisseurs", account_type=account_type
+        )
+        cls.bank = Account.objects.create(
+            account_group=banks, number="1000", name="Banque", account_type=account_type
+        )
+
+    def entry(self, amount='150.00', **kwargs):
+        data = {
+            'date': date(2025, 3, 10),
+            'journal': JournalEntry.BANQUE,
+            'label': "Règlement fournisseur",
+            'lines': [
+                {'account': '401100', 'debit': amount},
+                {'account': self.bank, 'credit': amount},
+            ],
+        }
+        data.update(kwargs)
+        return data
+
+    def test_posts_batch_with_constant_queries(self):
+        batch = [self.entry() for _ in range(50)]
+        for data in batch:
+            data['lines'][1]['account'] = '521000'
+        # Comptes, savepoint, date de clôture, périodes (lecture, création, relecture),
+        # écritures, lignes, soldes, release : indépendant de la taille du lot
+        with self.assertNumQueries(10):
+            entries = post_entries(batch)
+        self.assertEqual(len(entries), 50)
+        self.assertTrue(all(entry.pk for entry in entries))
+        self.assertEqual(JournalLine.objects.count(), 100)
+        self.assertEqual(
+            JournalLine.objects.filter(account=self.supplier).values_list('debit', flat=True).first(),
+            Decimal('150.00'),
+        )
+
+    def test_unbalanced_entry_rejects_whole_batch(self):
+        unbalanced = self.entry()
+        unbalanced['lines'][1]['credit'] = '100.00'
+        with self.assertRaises(ValidationError) as context:
+            post_entries([self.entry(), unbalanced])
+        self.assertIn("Écriture 2", context.exception.messages[0])
+        self.assertFalse(JournalEntry.objects.exists())
+
+    def test_rejects_unknown_and_inactive_accounts(self):
+        unknown = self.entry()
+        unknown['lines'][0]['account'] = '999999'
+        with self.assertRaises(ValidationError):
+            post_entries([unknown])
+
+        Account.objects.filter(pk=self.bank.pk).update(is_active=False)
+        with self.assertRaises(ValidationError):
+            post_entries([self.entry()])
+
+    def test_rejects_line_with_both_sides(self):
+        invalid = self.entry()
+        invalid['lines'][0]['credit'] = '150.00'
+        with self.assertRaises(ValidationError):
+            post_entries([invalid])
@@ -1 +1,6 @@
- 
+import os
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'compta_project.settings.base')
+
+application = get_asgi_application()
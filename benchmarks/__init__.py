@@ -0,0 +1,13 @@
+"""
+Benchmarks des chemins critiques.
+
+Ils ne sont pas collectés par la suite de tests normale (motif bench_*.py) ;
+pour les lancer sur la base de test :
+
+    python manage.py test benchmarks -p "bench_*.py"
+
+Les données sont produites par benchmarks.generator (plan OHADA complet,
+N comptes, M lignes). Avec BENCH_RESULTS=resultats.json, les mesures et
+leurs seuils sont écrits en JSON ; deux relevés se comparent avec
+python -m benchmarks.results avant.json apres.json (voir benchmarks.results).
+"""
@@ -0,0 +1,38 @@
+import os
+import statistics
+import time
+
+from django.test import TransactionTestCase
+
+from accounts.services.search_services import search_accounts
+from .generator import create_chart
+from .results import record_result
+
+ACCOUNTS = int(os.environ.get('BENCH_ACCOUNT_SEARCH_ACCOUNTS', 100000))
+# Latence maximale au 95e centile (millisecondes)
+MAX_P95_MILLISECONDS = float(os.environ.get('BENCH_ACCOUNT_SEARCH_MAX_P95_MS', 30))
+REPEAT = 20
+
+QUERIES = ("4", "401", "52100", "fourn", "banque", "étrangers", "créances clients", "zzz", "41 client", "capital")
+
+
+class AccountSearchBenchmark(TransactionTestCase):
+    """Mesure la latence de search_accounts() sur un plan de ACCOUNTS comptes"""
+    # La société par défaut créée par migration est restaurée après le vidage de la base de chaque mesure
+    serialized_rollback = True
+
+    def setUp(self):
+        create_chart(ACCOUNTS)
+
+    def test_search_latency(self):
+        timings = []
+        for _ in range(REPEAT):
+            for query in QUERIES:
+                started = time.perf_counter()
+                search_accounts(query)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"\nsearch_accounts : {ACCOUNTS} comptes, p95 {p95:.1f} ms, max {max(timings):.1f} ms")
+        record_result('search_accounts_p95', p95, 'ms', MAX_P95_MILLISECONDS, accounts=ACCOUNTS)
+        self.assertLessEqual(p95, MAX_P95_MILLISECONDS)
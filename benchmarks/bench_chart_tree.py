@@ -0,0 +1,38 @@
+import os
+import statistics
+import time
+
+from django.test import TransactionTestCase
+
+from accounts.services.chart_services import get_chart_tree, invalidate_chart_tree
+from .generator import create_chart
+from .results import record_result
+
+ACCOUNTS = int(os.environ.get('BENCH_CHART_TREE_ACCOUNTS', 20000))
+# Durée maximale de construction de l'arbre du plan comptable (millisecondes)
+MAX_MILLISECONDS = float(os.environ.get('BENCH_CHART_TREE_MAX_MS', 1000))
+REPEAT = 5
+
+
+class ChartTreeBenchmark(TransactionTestCase):
+    """Mesure le chargement de l'arbre du plan comptable (80 groupes, ACCOUNTS comptes)"""
+    # La société par défaut créée par migration est restaurée après le vidage de la base de chaque mesure
+    serialized_rollback = True
+
+    def setUp(self):
+        create_chart(ACCOUNTS)
+
+    def test_chart_tree_loading(self):
+        timings = []
+        for _ in range(REPEAT):
+            invalidate_chart_tree()
+            started = time.perf_counter()
+            tree = get_chart_tree()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        elapsed = statistics.median(timings)
+        print(f"\nget_chart_tree : {ACCOUNTS} comptes en {elapsed:.0f} ms (médiane, arbre reconstruit)")
+        record_result('chart_tree', elapsed, 'ms', MAX_MILLISECONDS, accounts=ACCOUNTS)
+        self.assertEqual(len(tree.accounts_by_id), ACCOUNTS)
+        self.assertEqual(sum(len(account_class.groups) for account_class in tree.classes), 80)
+        self.assertLessEqual(elapsed, MAX_MILLISECONDS)
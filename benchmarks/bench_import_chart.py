@@ -0,0 +1,48 @@
+import os
+import time
+
+from django.test import TransactionTestCase
+
+from accounts.models.account import Account
+from accounts.models.account_type import AccountType
+from accounts.services.chart_import_services import import_chart
+from .results import record_result
+
+ACCOUNTS = int(os.environ.get('BENCH_IMPORT_CHART_ACCOUNTS', 20000))
+# Durée maximale de l'import (secondes)
+MAX_SECONDS = float(os.environ.get('BENCH_IMPORT_CHART_MAX_SECONDS', 5))
+
+
+class ChartImportBenchmark(TransactionTestCase):
+    """Mesure l'import de ACCOUNTS comptes répartis sur les 80 groupes OHADA"""
+    # La société par défaut créée par migration est restaurée après le vidage de la base de chaque mesure
+    serialized_rollback = True
+
+    def setUp(self):
+        for code, _ in AccountType.CODE_CHOICES:
+            AccountType.objects.create(code=code)
+
+    def build_rows(self):
+        groups = list(range(10, 90))
+        return enumerate(
+            (
+                {
+                    'full_number': f"{groups[i % len(groups)]}{i // len(groups):06d}",
+                    'name': f"Compte {i}",
+                    'account_type': AccountType.AC,
+                }
+                for i in range(ACCOUNTS)
+            ),
+            start=2,
+        )
+
+    def test_import_chart(self):
+        started = time.perf_counter()
+        report = import_chart(self.build_rows())
+        elapsed = time.perf_counter() - started
+
+        print(f"\nimport_chart : {ACCOUNTS} comptes en {elapsed:.2f} s ({ACCOUNTS / elapsed:.0f} comptes/s)")
+        record_result('import_chart', elapsed, 's', MAX_SECONDS, accounts=ACCOUNTS)
+        self.assertEqual(report.errors, [])
+        self.assertEqual(Account.objects.count(), ACCOUNTS)
+        self.assertLessEqual(elapsed, MAX_SECONDS)
@@ -0,0 +1,39 @@
+import os
+import time
+
+from django.test import TransactionTestCase
+
+from transactions.models.journal_line import JournalLine
+from transactions.services.transaction_services import post_entries
+from .generator import build_entries, create_chart
+from .results import record_result
+
+# Débit minimal exigé du service de saisie (lignes par seconde)
+MIN_LINES_PER_SECOND = int(os.environ.get('BENCH_MIN_LINES_PER_SECOND', 10000))
+LINES = int(os.environ.get('BENCH_POSTING_LINES', 20000))
+LINES_PER_ENTRY = 4
+ACCOUNTS = 100
+
+
+class PostingThroughputBenchmark(TransactionTestCase):
+    """Mesure le débit de post_entries() sur un lot d'écritures synthétiques"""
+    # La société par défaut créée par migration est restaurée après le vidage de la base de chaque mesure
+    serialized_rollback = True
+
+    def setUp(self):
+        self.numbers = [account.full_number for account in create_chart(ACCOUNTS)]
+
+    def test_posting_throughput(self):
+        batch = build_entries(self.numbers, LINES, LINES_PER_ENTRY)
+
+        started = time.perf_counter()
+        post_entries(batch)
+        elapsed = time.perf_counter() - started
+
+        lines_per_second = LINES / elapsed
+        print(f"\npost_entries : {LINES} lignes en {elapsed:.3f} s ({lines_per_second:,.0f} lignes/s)")
+        record_result(
+            'post_entries', lines_per_second, 'lignes/s', MIN_LINES_PER_SECOND, higher_is_better=True, lines=LINES
+        )
+        self.assertEqual(JournalLine.objects.count(), LINES)
+        self.assertGreaterEqual(lines_per_second, MIN_LINES_PER_SECOND)
@@ -0,0 +1,35 @@
+import os
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.test import TransactionTestCase
+
+from reporting.services.report_services import trial_balance
+from .generator import create_balances, create_chart, create_periods
+from .results import record_result
+
+ACCOUNTS = int(os.environ.get('BENCH_TRIAL_BALANCE_ACCOUNTS', 50000))
+PERIODS = 12
+# Temps maximal de calcul de la balance générale (millisecondes)
+MAX_MILLISECONDS = float(os.environ.get('BENCH_TRIAL_BALANCE_MAX_MS', 500))
+
+
+class TrialBalanceBenchmark(TransactionTestCase):
+    """Mesure le calcul de la balance générale sur ACCOUNTS comptes × 12 périodes"""
+    # La société par défaut créée par migration est restaurée après le vidage de la base de chaque mesure
+    serialized_rollback = True
+
+    def setUp(self):
+        create_balances(create_chart(ACCOUNTS), create_periods(PERIODS))
+
+    def test_trial_balance(self):
+        started = time.perf_counter()
+        result = trial_balance(date(2025, 1, 1), date(2025, 12, 31))
+        elapsed = (time.perf_counter() - started) * 1000
+
+        print(f"\ntrial_balance : {ACCOUNTS} comptes × {PERIODS} périodes en {elapsed:.0f} ms")
+        record_result('trial_balance', elapsed, 'ms', MAX_MILLISECONDS, accounts=ACCOUNTS, periods=PERIODS)
+        self.assertEqual(len(result.accounts), ACCOUNTS)
+        self.assertEqual(result.total_debit, Decimal('10.00') * ACCOUNTS * PERIODS)
+        self.assertLessEqual(elapsed, MAX_MILLISECONDS)
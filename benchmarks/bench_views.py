@@ -0,0 +1,73 @@
+import os
+import statistics
+import time
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from transactions.services.transaction_services import post_entries
+from .generator import build_entries, create_chart
+from .results import record_result
+
+ACCOUNTS = int(os.environ.get('BENCH_VIEWS_ACCOUNTS', 20000))
+LINES = int(os.environ.get('BENCH_VIEWS_LINES', 20000))
+# Temps de réponse maximal au 95e centile (millisecondes) des pages et des listes de l'administration
+MAX_P95_MILLISECONDS = float(os.environ.get('BENCH_VIEWS_MAX_P95_MS', 100))
+ADMIN_MAX_P95_MILLISECONDS = float(os.environ.get('BENCH_ADMIN_MAX_P95_MS', 300))
+REPEAT = 20
+
+
+class ViewsBenchmark(TransactionTestCase):
+    """Mesure le rendu des pages du plan comptable et des listes de l'administration"""
+    # Plusieurs mesures par classe : la société par défaut créée par migration est restaurée avant chacune
+    serialized_rollback = True
+
+    def setUp(self):
+        accounts = create_chart(ACCOUNTS)
+        post_entries(build_entries([account.full_number for account in accounts[:200]], LINES))
+        self.account = accounts[0]
+        user = get_user_model().objects.create_superuser('bench', 'bench@example.com', 'secret')
+        self.client.force_login(user)
+
+    def measure(self, name, url, limit=MAX_P95_MILLISECONDS):
+        # Premier appel non mesuré : l'arbre du plan en mémoire est construit une fois
+        # par processus (voir bench_chart_tree), les mesures portent sur le régime établi
+        self.assertEqual(self.client.get(url).status_code, 200)
+        timings = []
+        for _ in range(REPEAT):
+            started = time.perf_counter()
+            response = self.client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(response.status_code, 200)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(f"\n{name} : p95 {p95:.1f} ms, max {max(timings):.1f} ms")
+        record_result(name, p95, 'ms', limit, accounts=ACCOUNTS, lines=LINES)
+        self.assertLessEqual(p95, limit)
+
+    def test_account_list(self):
+        self.measure('view_account_list', reverse('account_list'))
+
+    def test_account_tree_accounts(self):
+        self.measure(
+            'view_account_tree_accounts', reverse('account_tree_accounts', args=[self.account.account_group_id])
+        )
+
+    def measure_changelist(self, name, model_path):
+        self.measure(name, reverse(f'admin:{model_path}_changelist'), ADMIN_MAX_P95_MILLISECONDS)
+
+    def test_account_changelist(self):
+        self.measure_changelist('admin_account_changelist', 'accounts_account')
+
+    def test_account_group_changelist(self):
+        self.measure_changelist('admin_account_group_changelist', 'accounts_accountgroup')
+
+    def test_journal_entry_changelist(self):
+        self.measure_changelist('admin_journal_entry_changelist', 'transactions_journalentry')
+
+    def test_trial_balance_view(self):
+        self.measure(
+            'view_trial_balance',
+            f"{reverse('trial_balance')}?date_from={date(2025, 1, 1)}&date_to={date(2025, 12, 31)}",
+        )
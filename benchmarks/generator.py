@@ -0,0 +1,97 @@
+"""
+Données synthétiques OHADA pour les benchmarks : les 8 classes, tous les
+groupes de AccountGroup.NOMS_GROUPES, N comptes répartis sur les groupes,
+des soldes par période et des lots d'écritures équilibrées.
+
+Les insertions passent par bulk_create : la préparation d'un benchmark ne
+doit pas dominer sa durée.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from accounts.models.account import Account
+from accounts.models.account_class import AccountClass
+from accounts.models.account_group import AccountGroup
+from accounts.models.account_type import AccountType
+from accounts.rules import group_rule
+from transactions.models.account_balance import AccountBalance
+from transactions.models.fiscal_period import FiscalPeriod
+
+WORDS = (
+    "Fournisseurs", "Clients", "Banque", "Caisse", "Créances", "Dettes", "Étrangers", "Locaux",
+    "Groupe", "Capital", "Réserves", "Emprunts", "Matériel", "Ventes", "Achats", "Salaires",
+)
+
+
+def account_name(i):
+    """Intitulé varié et reproductible (ex: "Banque clients 18")"""
+    return f"{WORDS[i % len(WORDS)]} {WORDS[(i // len(WORDS)) % len(WORDS)].lower()} {i}"
+
+
+def create_chart(accounts):
+    """
+    Crée le plan comptable OHADA complet et `accounts` comptes (6 chiffres
+    après le groupe) répartis à tour de rôle sur les 80 groupes.
+    Retourne les comptes créés.
+    """
+    # bulk_create renseigne les noms, descriptions, positions au bilan et numéros complets
+    for code, _ in AccountType.CODE_CHOICES:
+        AccountType.objects.create(code=code)
+    AccountClass.objects.bulk_create([AccountClass(number=number) for number in AccountClass.NOMS_CLASSES])
+    groups = AccountGroup.objects.bulk_create([
+        AccountGroup(account_class_id=number // 10, number=number) for number in sorted(AccountGroup.NOMS_GROUPES)
+    ])
+    rows = []
+    for i in range(accounts):
+        group = groups[i % len(groups)]
+        rows.append(Account(
+            account_group=group,
+            number=f"{i // len(groups):06d}",
+            name=account_name(i),
+            account_type_id=group_rule(group.number).account_type,
+        ))
+    return Account.objects.bulk_create(rows, batch_size=5000)
+
+
+def create_periods(months=12, year=2025):
+    """Crée les périodes mensuelles d'une année"""
+    return FiscalPeriod.objects.bulk_create([
+        FiscalPeriod(
+            start_date=date(year, month, 1),
+            end_date=date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1),
+        )
+        for month in range(1, months + 1)
+    ])
+
+
+def create_balances(accounts, periods, debit=Decimal('10.00'), credit=Decimal('5.00')):
+    """Crée un solde matérialisé par compte et par période"""
+    AccountBalance.objects.bulk_create(
+        (
+            AccountBalance(account=account, period=period, debit=debit, credit=credit)
+            for account in accounts
+            for period in periods
+        ),
+        batch_size=5000,
+    )
+
+
+def build_entries(numbers, lines, lines_per_entry=4, start=date(2025, 1, 1), amount=Decimal('125.50')):
+    """
+    Lot d'écritures équilibrées pour post_entries() : `lines` lignes au total,
+    sur les comptes `numbers` (numéros complets) et les jours d'une année.
+    """
+    half = lines_per_entry // 2
+    batch = []
+    for i in range(lines // lines_per_entry):
+        accounts = [numbers[(i + k) % len(numbers)] for k in range(lines_per_entry)]
+        batch.append({
+            'date': start + timedelta(days=i % 365),
+            'label': f"Écriture {i}",
+            'lines': [
+                {'account': number, 'debit': amount} for number in accounts[:half]
+            ] + [
+                {'account': number, 'credit': amount} for number in accounts[half:]
+            ],
+        })
+    return batch
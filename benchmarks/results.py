@@ -0,0 +1,102 @@
+"""
+Résultats des benchmarks au format JSON, comparables d'un commit à l'autre.
+
+Avec BENCH_RESULTS=chemin.json, chaque benchmark ajoute son résultat au
+fichier (les modules peuvent être lancés séparément), avec le commit courant
+et le seuil de régression appliqué. Pour comparer deux relevés :
+
+    python -m benchmarks.results avant.json apres.json [--tolerance 10]
+
+Le code de sortie est 1 si une mesure s'est dégradée de plus de la
+tolérance (en %) ou dépasse son seuil.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+RESULTS_ENV = 'BENCH_RESULTS'
+
+
+def record_result(name, value, unit, limit, higher_is_better=False, **parameters):
+    """
+    Enregistre une mesure (si BENCH_RESULTS est défini) et la retourne.
+    `limit` est le seuil de régression : un maximum, ou un minimum si higher_is_better.
+    """
+    result = {
+        'value': round(value, 3),
+        'unit': unit,
+        'limit': limit,
+        'higher_is_better': higher_is_better,
+        'passed': value >= limit if higher_is_better else value <= limit,
+        'parameters': parameters,
+    }
+    path = os.environ.get(RESULTS_ENV)
+    if path:
+        results = load_results(path) if os.path.exists(path) else {}
+        results.update(commit=_current_commit(), recorded_at=datetime.now(timezone.utc).isoformat())
+        results.setdefault('results', {})[name] = result
+        with open(path, 'w', encoding='utf-8') as output:
+            json.dump(results, output, indent=2, ensure_ascii=False, sort_keys=True)
+    return result
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as source:
+        return json.load(source)
+
+
+def compare(baseline, current, tolerance=10.0):
+    """
+    Compare deux relevés ; retourne les lignes (nom, avant, après, écart en %, statut).
+    L'écart est positif quand la mesure s'améliore.
+    """
+    rows = []
+    before = baseline.get('results', {})
+    for name, result in sorted(current.get('results', {}).items()):
+        previous = before.get(name)
+        change = None
+        status = "ok" if result['passed'] else "seuil dépassé"
+        if previous and previous['value']:
+            if result['higher_is_better']:
+                gain = result['value'] - previous['value']
+            else:
+                gain = previous['value'] - result['value']
+            change = gain / previous['value'] * 100
+            if change < -tolerance:
+                status = "régression"
+        rows.append((name, previous and previous['value'], result['value'], change, status))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare deux relevés de benchmarks")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--tolerance', type=float, default=10.0, help="Dégradation tolérée en %% (défaut : 10)")
+    args = parser.parse_args(argv)
+    baseline, current = load_results(args.baseline), load_results(args.current)
+    print(f"{baseline.get('commit') or '?'} -> {current.get('commit') or '?'}")
+    failed = False
+    for name, before, after, change, status in compare(baseline, current, args.tolerance):
+        before = '-' if before is None else f"{before:,.1f}"
+        change = '' if change is None else f"{change:+.1f} %"
+        print(f"{name:<32} {before:>12} {after:>12,.1f} {change:>9}  {status}")
+        failed = failed or status != "ok"
+    return 1 if failed else 0
+
+
+def _current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    sys.exit(main())
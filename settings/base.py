@@ -31,11 +31,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.TenantMiddleware',
+    'core.middleware.PrimaryPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -59,6 +62,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'compta_project.wsgi.application'
+ASGI_APPLICATION = 'compta_project.asgi.application'
 
 DATABASES = {
     'default': {
@@ -78,3 +82,41 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Les pages des données comptables exigent une connexion
+LOGIN_URL = 'login'
+LOGIN_REDIRECT_URL = 'home'
+LOGOUT_REDIRECT_URL = 'login'
+
+# Société des données créées hors contexte de requête (voir core.tenancy)
+DEFAULT_COMPANY_ID = 1
+
+# Alias de la réplique en lecture des rapports, s'il est déclaré dans DATABASES (voir core.routers)
+REPORTING_DATABASE_ALIAS = 'reporting'
+# Durée pendant laquelle un client qui vient d'écrire lit sur la base principale (secondes)
+REPORTING_PIN_SECONDS = 15
+
+# Génération des rapports en arrière-plan (voir reporting.services.job_services)
+# Nombre de threads du processus web qui exécutent les travaux ; 0 : seule la commande run_report_worker les exécute
+REPORT_WORKERS = 2
+# Durée (s) au-delà de laquelle un travail en cours est considéré comme abandonné par son travailleur
+REPORT_JOB_TIMEOUT = 15 * 60
+# Répertoire des rapports générés
+REPORT_CACHE_DIR = os.path.join(BASE_DIR, 'var', 'reports')
+# Rapports gardés en mémoire par processus, en plus du cache Django (voir reporting.services.cache_services)
+REPORT_RESULT_CACHE_SIZE = 256
+
+# Écritures enregistrées par lot (et par transaction) lors d'un import de journal (voir transactions.services.journal_import_services)
+JOURNAL_IMPORT_BATCH_SIZE = 500
+
+# Profilage des requêtes (voir core.profiling) : fraction des requêtes profilées (0 : désactivé, 1 : toutes)
+PROFILING_SAMPLE_RATE = 0.05
+# Requêtes gardées par nom d'URL pour les statistiques
+PROFILING_WINDOW = 500
+# Nombre maximal de requêtes SQL par nom d'URL ; au-delà, la requête est journalisée en avertissement
+PROFILING_SQL_BUDGETS = {
+    'account_list': 10,
+    'account_detail': 10,
+    'trial_balance': 5,
+    'account_balances': 3,
+}
@@ -0,0 +1,109 @@
+"""
+Lecture de la configuration depuis les variables d'environnement (profil production).
+"""
+import os
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from django.core.exceptions import ImproperlyConfigured
+
+POSTGRES_SCHEMES = {'postgres', 'postgresql', 'pgsql'}
+
+REDIS_SCHEMES = {'redis', 'rediss', 'unix'}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on', 'oui'}
+
+
+def env(name, default=None, required=False):
+    """Valeur d'une variable d'environnement (ImproperlyConfigured si obligatoire et absente)"""
+    value = os.environ.get(name)
+    if value in (None, ''):
+        if required:
+            raise ImproperlyConfigured(f"La variable d'environnement {name} est obligatoire.")
+        return default
+    return value
+
+
+def env_bool(name, default=False):
+    value = env(name)
+    return default if value is None else value.strip().lower() in TRUE_VALUES
+
+
+def env_int(name, default):
+    value = env(name)
+    try:
+        return default if value is None else int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"La variable d'environnement {name} doit être un entier.")
+
+
+def env_list(name, default=()):
+    value = env(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def database_config(url, conn_max_age=60, health_checks=True, pool=False, pool_min_size=2, pool_max_size=10):
+    """
+    Configuration Django d'une base décrite par une URL :
+    postgres://utilisateur:mot_de_passe@hôte:5432/base?sslmode=require
+    ou sqlite:////chemin/absolu/base.sqlite3.
+
+    Les connexions sont persistantes (conn_max_age secondes, vérifiées avant
+    réutilisation si health_checks) ; avec pool, PostgreSQL utilise le pool de
+    connexions de psycopg 3 à la place (les deux modes sont exclusifs).
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme == 'sqlite':
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': unquote(parts.path[1:] if parts.path.startswith('//') else parts.path.lstrip('/')) or ':memory:',
+        }
+    if scheme not in POSTGRES_SCHEMES:
+        raise ImproperlyConfigured(f"Base de données non prise en charge : {scheme}://")
+
+    options = dict(parse_qsl(parts.query))
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': unquote(parts.path.lstrip('/')),
+        'USER': unquote(parts.username or ''),
+        'PASSWORD': unquote(parts.password or ''),
+        'HOST': unquote(parts.hostname or ''),
+        'PORT': str(parts.port or ''),
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': health_checks,
+        'OPTIONS': options,
+    }
+    if pool:
+        options['pool'] = {'min_size': pool_min_size, 'max_size': pool_max_size}
+        config['CONN_MAX_AGE'] = 0
+    return config
+
+
+def cache_config(url):
+    """
+    Configuration Django d'un cache partagé entre processus, décrit par une URL :
+    redis://hôte:6379/0 (ou rediss://), memcached://hôte1:11211,hôte2:11211
+    ou db://nom_de_table (DatabaseCache : python manage.py createcachetable).
+
+    Le cache en mémoire locale est refusé : les versions du plan comptable et du
+    grand livre, ainsi que le cache des rapports, doivent être vus de tous les processus.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme in REDIS_SCHEMES:
+        return {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': url}
+    if scheme == 'memcached':
+        return {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': [location.strip() for location in parts.netloc.split(',') if location.strip()],
+        }
+    if scheme == 'db':
+        table = parts.netloc or parts.path.lstrip('/')
+        if not table:
+            raise ImproperlyConfigured("CACHE_URL : nom de table manquant (db://nom_de_table).")
+        return {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': table}
+    raise ImproperlyConfigured(
+        f"Cache non partagé ou non pris en charge : {scheme}:// (redis://, memcached:// ou db://)"
+    )
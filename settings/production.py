@@ -1 +1,49 @@
- 
+"""
+Profil de production : toute la configuration vient de l'environnement.
+
+    DJANGO_SECRET_KEY, DJANGO_ALLOWED_HOSTS (séparés par des virgules)
+    DATABASE_URL                 postgres://utilisateur:mot_de_passe@hôte:5432/base
+    REPORTING_DATABASE_URL       réplique en lecture pour les rapports (facultative)
+    DB_CONN_MAX_AGE              durée de vie des connexions persistantes (défaut : 60 s)
+    DB_POOL                      pool de connexions psycopg 3 au lieu des connexions persistantes
+    DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE
+    CACHE_URL                    cache partagé entre processus (obligatoire) :
+                                 redis://hôte:6379/0, memcached://hôte:11211 ou db://table
+"""
+from .base import *  # noqa: F401,F403
+from .env import cache_config, database_config, env, env_bool, env_int, env_list
+
+DEBUG = False
+
+SECRET_KEY = env('DJANGO_SECRET_KEY', required=True)
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS')
+
+_database_options = {
+    'conn_max_age': env_int('DB_CONN_MAX_AGE', 60),
+    'health_checks': env_bool('DB_CONN_HEALTH_CHECKS', True),
+    'pool': env_bool('DB_POOL'),
+    'pool_min_size': env_int('DB_POOL_MIN_SIZE', 2),
+    'pool_max_size': env_int('DB_POOL_MAX_SIZE', 10),
+}
+
+DATABASES = {
+    'default': database_config(env('DATABASE_URL', required=True), **_database_options),
+}
+
+if env('REPORTING_DATABASE_URL'):
+    # Les lectures des rapports vont à la réplique (voir core.routers)
+    DATABASES[REPORTING_DATABASE_ALIAS] = {  # noqa: F405
+        **database_config(env('REPORTING_DATABASE_URL'), **_database_options),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['core.routers.ReportingRouter']
+
+# Versions du plan comptable et du grand livre, cache des rapports : partagés par tous les processus
+CACHES = {
+    'default': cache_config(env('CACHE_URL', required=True)),
+}
+
+SESSION_COOKIE_SECURE = env_bool('DJANGO_SECURE_COOKIES', True)
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
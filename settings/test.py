@@ -0,0 +1,19 @@
+"""
+Paramètres des tests : python manage.py test --settings=compta_project.settings.test
+
+Deux bases SQLite tiennent lieu de base principale et de réplique des rapports.
+Le routeur n'est pas activé ici : seuls les tests du routage l'activent
+(voir core.tests.test_routers), les autres lisent tout sur la base principale.
+"""
+from .base import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',  # noqa: F405
+    },
+    REPORTING_DATABASE_ALIAS: {  # noqa: F405
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db_reporting.sqlite3',  # noqa: F405
+    },
+}
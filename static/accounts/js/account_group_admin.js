@@ -12,25 +12,21 @@ document.addEventListener('DOMContentLoaded', function() {
     function updateNumberOptions(classId) {
         if (!classId) return;
         
-        console.log('Mise à jour des options pour la classe:', classId);
-        
-        // Faire un appel AJAX pour récupérer les options
-        fetch(`/admin/accounts/accountgroup/get_group_options/${classId}/`)
-            .then(response => response.json())
-            .then(data => {
+        // Options calculées à partir du référentiel OHADA (aucun appel serveur)
+        const selected = numberField.value;
+        OhadaReference.getGroupOptions(classId)
+            .then(options => {
                 // Vider les options actuelles
                 numberField.innerHTML = '<option value="">---------</option>';
                 
                 // Ajouter les nouvelles options
-                if (data.options) {
-                    data.options.forEach(option => {
-                        const opt = document.createElement('option');
-                        opt.value = option.value;
-                        opt.textContent = option.label;
-                        numberField.appendChild(opt);
-                    });
-                    console.log('Options mises à jour:', data.options.length, 'options');
-                }
+                options.forEach(option => {
+                    const opt = document.createElement('option');
+                    opt.value = option.value;
+                    opt.textContent = option.label;
+                    opt.selected = option.value === selected;
+                    numberField.appendChild(opt);
+                });
             })
             .catch(error => console.error('Erreur:', error));
     }
@@ -86,15 +82,11 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
         
-        console.log('Mise à jour de la prévisualisation pour le numéro:', number);
-        
-        // Appeler l'API pour récupérer les informations
-        fetch(`/admin/accounts/accountgroup/get_group_info/${number}/`)
-            .then(response => response.json())
-            .then(data => {
-                nameDiv.textContent = data.name || '';
-                descDiv.textContent = data.description || '';
-                console.log('Prévisualisation mise à jour avec:', data.name);
+        // Lire les informations dans le référentiel OHADA (aucun appel serveur)
+        OhadaReference.getGroup(number)
+            .then(group => {
+                nameDiv.textContent = group ? group.name : '';
+                descDiv.textContent = group ? group.description : '';
             })
             .catch(error => console.error('Erreur:', error));
     }
@@ -1,80 +1,124 @@
 document.addEventListener('DOMContentLoaded', function() {
-    // Gestion des expansions/réductions des classes et groupes
-    document.querySelectorAll('.class-header').forEach(function(header) {
-        header.addEventListener('click', function() {
-            const classId = this.getAttribute('data-class-id');
-            const groupsContainer = document.getElementById(`class-${classId}-groups`);
-            const expandIcon = this.querySelector('.expand-icon');
-            
-            if (groupsContainer.style.display === 'none') {
-                groupsContainer.style.display = 'block';
-                expandIcon.textContent = '-';
-            } else {
-                groupsContainer.style.display = 'none';
-                expandIcon.textContent = '+';
-            }
-        });
-    });
-    
-    document.querySelectorAll('.group-header').forEach(function(header) {
-        header.addEventListener('click', function() {
-            const groupId = this.getAttribute('data-group-id');
-            const accountsContainer = document.getElementById(`group-${groupId}-accounts`);
-            const expandIcon = this.querySelector('.expand-icon');
-            
-            if (accountsContainer.style.display === 'none') {
-                accountsContainer.style.display = 'block';
-                expandIcon.textContent = '-';
-            } else {
-                accountsContainer.style.display = 'none';
-                expandIcon.textContent = '+';
+    // Arbre du plan comptable : les groupes d'une classe et les comptes d'un groupe
+    // sont chargés depuis le serveur à la première ouverture (fragments HTML)
+    function loadFragment(url, container, append) {
+        return fetch(url)
+            .then(response => response.text())
+            .then(html => {
+                if (append) {
+                    container.insertAdjacentHTML('beforeend', html);
+                } else {
+                    container.innerHTML = html;
+                }
+                container.dataset.loaded = 'true';
+            })
+            .catch(error => console.error('Erreur:', error));
+    }
+
+    function toggle(header, container) {
+        const expandIcon = header.querySelector('.expand-icon');
+
+        if (container.style.display === 'none') {
+            container.style.display = 'block';
+            expandIcon.textContent = '-';
+            if (!container.dataset.loaded) {
+                loadFragment(header.dataset.url, container, false);
             }
-        });
+        } else {
+            container.style.display = 'none';
+            expandIcon.textContent = '+';
+        }
+    }
+
+    // Délégation d'événements : les en-têtes de groupe sont ajoutés après le chargement
+    document.querySelector('.account-tree').addEventListener('click', function(event) {
+        const classHeader = event.target.closest('.class-header');
+        if (classHeader) {
+            toggle(classHeader, document.getElementById(`class-${classHeader.dataset.classId}-groups`));
+            return;
+        }
+
+        const groupHeader = event.target.closest('.group-header');
+        if (groupHeader) {
+            toggle(groupHeader, document.getElementById(`group-${groupHeader.dataset.groupId}-accounts`));
+            return;
+        }
+
+        // « Afficher plus » : la page suivante reprend après le dernier compte affiché
+        const loadMore = event.target.closest('.load-more');
+        if (loadMore) {
+            const container = loadMore.parentElement;
+            loadMore.remove();
+            loadFragment(loadMore.dataset.url, container, true);
+        }
     });
     
-    // Fonction de recherche
+    // Recherche côté serveur : seuls les comptes correspondants sont transmis
     const searchInput = document.getElementById('account-search');
-    searchInput.addEventListener('input', function() {
-        const searchTerm = this.value.toLowerCase();
-        
-        // Masquer tous les conteneurs d'abord
-        document.querySelectorAll('.account-groups, .accounts').forEach(function(container) {
-            container.style.display = 'none';
+    const resultsContainer = document.getElementById('account-search-results');
+    const tree = document.querySelector('.account-tree');
+    let searchTimer = null;
+    let searchController = null;
+
+    function renderResults(data, append) {
+        if (!append) resultsContainer.innerHTML = '';
+        resultsContainer.querySelectorAll('.search-more').forEach(button => button.remove());
+
+        data.results.forEach(function(account) {
+            const link = document.createElement('a');
+            link.href = account.url;
+            link.className = 'list-group-item list-group-item-action' + (account.is_active ? '' : ' text-muted');
+            link.textContent = `${account.full_number} - ${account.name}`;
+            resultsContainer.appendChild(link);
         });
-        
-        document.querySelectorAll('.expand-icon').forEach(function(icon) {
-            icon.textContent = '+';
-        });
-        
-        if (searchTerm.length > 0) {
-            // Recherche dans les comptes
-            document.querySelectorAll('.account-item').forEach(function(item) {
-                const accountText = item.textContent.toLowerCase();
-                
-                if (accountText.includes(searchTerm)) {
-                    // Montrer ce compte et ses parents
-                    item.style.display = 'block';
-                    const accountsContainer = item.closest('.accounts');
-                    accountsContainer.style.display = 'block';
-                    
-                    const groupHeader = accountsContainer.previousElementSibling;
-                    groupHeader.querySelector('.expand-icon').textContent = '-';
-                    
-                    const groupContainer = groupHeader.closest('.account-group');
-                    const groupsContainer = groupContainer.closest('.account-groups');
-                    groupsContainer.style.display = 'block';
-                    
-                    const classHeader = groupsContainer.previousElementSibling;
-                    classHeader.querySelector('.expand-icon').textContent = '-';
-                } else {
-                    item.style.display = 'none';
-                }
-            });
-        } else {
-            // Réinitialiser l'affichage
-            document.querySelectorAll('.account-item').forEach(function(item) {
-                item.style.display = 'block';
+
+        if (!append && data.results.length === 0) {
+            const empty = document.createElement('div');
+            empty.className = 'list-group-item';
+            empty.textContent = 'Aucun compte trouvé';
+            resultsContainer.appendChild(empty);
+        }
+
+        if (data.has_next) {
+            const more = document.createElement('button');
+            more.type = 'button';
+            more.className = 'list-group-item list-group-item-action text-center search-more';
+            more.textContent = 'Plus de résultats';
+            more.addEventListener('click', () => search(data.query, data.page + 1));
+            resultsContainer.appendChild(more);
+        }
+    }
+
+    function search(query, page) {
+        if (searchController) searchController.abort();
+        searchController = new AbortController();
+
+        const url = `${searchInput.dataset.searchUrl}?q=${encodeURIComponent(query)}&page=${page}`;
+        fetch(url, {signal: searchController.signal})
+            .then(response => response.json())
+            .then(data => renderResults(data, page > 1))
+            .catch(error => {
+                if (error.name !== 'AbortError') console.error('Erreur:', error);
             });
+    }
+
+    searchInput.addEventListener('input', function() {
+        const query = this.value.trim();
+        clearTimeout(searchTimer);
+
+        if (!query) {
+            if (searchController) searchController.abort();
+            resultsContainer.style.display = 'none';
+            resultsContainer.innerHTML = '';
+            tree.style.display = 'block';
+            return;
         }
+
+        // Attendre une courte pause dans la saisie avant d'interroger le serveur
+        searchTimer = setTimeout(function() {
+            resultsContainer.style.display = 'block';
+            tree.style.display = 'none';
+            search(query, 1);
+        }, 200);
     });
-});
\ No newline at end of file
+});
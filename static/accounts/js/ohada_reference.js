@@ -0,0 +1,43 @@
+// Référentiel OHADA (classes et groupes) chargé une seule fois par session.
+// L'URL versionnée est fournie par l'attribut data-url de la balise <script> :
+// une nouvelle version du référentiel change l'URL et invalide le cache.
+window.OhadaReference = (function() {
+    const url = document.currentScript && document.currentScript.dataset.url;
+    let pending = null;
+
+    function load() {
+        if (pending) return pending;
+
+        const cached = url && sessionStorage.getItem(url);
+        if (cached) {
+            pending = Promise.resolve(JSON.parse(cached));
+            return pending;
+        }
+
+        pending = fetch(url)
+            .then(response => response.json())
+            .then(data => {
+                try {
+                    sessionStorage.setItem(url, JSON.stringify(data));
+                } catch (error) {
+                    // Stockage indisponible : le cache HTTP suffit
+                }
+                return data;
+            });
+        return pending;
+    }
+
+    return {
+        load: load,
+        // Informations d'une classe (nom, description, position)
+        getClass: number => load().then(data => data.classes[number] || null),
+        // Informations d'un groupe (nom, description, classe)
+        getGroup: number => load().then(data => data.groups[number] || null),
+        // Options {value, label} des groupes d'une classe
+        getGroupOptions: classNumber => load().then(data =>
+            Object.keys(data.groups)
+                .filter(number => data.groups[number].class === Number(classNumber))
+                .map(number => ({value: number, label: `${number} - ${data.groups[number].name}`}))
+        ),
+    };
+})();
@@ -1,10 +1,17 @@
 from django.contrib import admin
+from django.contrib.auth import views as auth_views
 from django.urls import path, include
 from django.views.generic import TemplateView  # Pour une page simple
+from core.views import company_select
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('accounts.urls')),
+    path('reporting/', include('reporting.urls')),
+    path('profilage/', include('core.urls')),
+    path('societe/', company_select, name='company_select'),
+    path('connexion/', auth_views.LoginView.as_view(), name='login'),
+    path('deconnexion/', auth_views.LogoutView.as_view(), name='logout'),
     # Autres URLs de votre projet
     path('', TemplateView.as_view(template_name='home.html'), name='home'),
 ]